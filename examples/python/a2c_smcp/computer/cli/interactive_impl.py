@@ -13,17 +13,18 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Callable
 from contextlib import AbstractContextManager
 from pathlib import Path
 from typing import Any, Protocol
 
-from prompt_toolkit import PromptSession
 from pydantic import TypeAdapter
 from rich.table import Table
 
 from a2c_smcp.computer.cli.utils import console, parse_kv_pairs, print_mcp_config, print_status, print_tools
 from a2c_smcp.computer.computer import Computer
 from a2c_smcp.computer.mcp_clients.model import MCPServerInput as MCPServerInputModel
+from a2c_smcp.computer.types import SupportsPromptAsync
 from a2c_smcp.smcp import MCPServerConfig as SMCPServerConfigDict
 from a2c_smcp.smcp import MCPServerInput as SMCPServerInputDict
 from a2c_smcp.smcp import ToolCallReq as SMCPToolCallReq
@@ -37,21 +38,18 @@ class PatchStdoutCtx(Protocol):
     def __call__(self, *, raw: bool = False) -> ContextManager: ...
 
 
-class _Session(Protocol):
-    async def prompt_async(self, *_: str, **__: Any) -> str: ...
-
-
 async def interactive_loop(
     comp: Computer,
     *,
-    session_factory: type[PromptSession],
+    session_factory: Callable[[], SupportsPromptAsync],
     patch_stdout_ctx: PatchStdoutCtx,
     smcp_client_cls: type[Any],
     init_client: Any | None = None,
 ) -> None:
     """
-    中文: 交互循环的可注入实现；从 main.py 传入 PromptSession 工厂、patch_stdout 上下文与 SMCP 客户端类。
-    English: DI-friendly interactive loop; main.py passes PromptSession factory, patch_stdout ctx and SMCP client class.
+    中文: 交互循环的可注入实现；从 main.py 传入会话工厂（PromptSession 或 --batch 会话）、patch_stdout 上下文与 SMCP 客户端类。
+    English: DI-friendly interactive loop; main.py passes a session factory (PromptSession or the --batch session),
+        patch_stdout ctx and SMCP client class.
     """
     session = session_factory()
     smcp_client = init_client
@@ -116,6 +114,7 @@ async def interactive_loop(
             help_table.add_row("socket leave", "离开房间 / leave office")
             help_table.add_row("notify update", "触发配置更新通知 / emit config updated notification")
             help_table.add_row("render <json|@file>", "测试渲染（占位符解析） / test rendering (placeholders)")
+            help_table.add_row("echo <text>", "原样输出文本，可用作脚本同步标记 / print text verbatim, usable as a sync marker")
             help_table.add_row("quit | exit", "退出 / quit")
 
             console.print(help_table)
@@ -129,6 +128,12 @@ async def interactive_loop(
             if cmd in {"quit", "exit"}:
                 break
 
+            elif cmd == "echo":
+                # 中文: 原样输出参数文本。命令串行执行，因此该输出出现即代表此前命令的输出已全部结束，便于脚本/测试同步。
+                # English: Print the argument verbatim. Commands run serially, so once this output appears all previous
+                #   command output has been flushed, which lets scripts/tests synchronize on it.
+                console.print(raw.split(" ", 1)[1] if len(parts) >= 2 else "", markup=False, highlight=False)
+
             elif cmd == "status":
                 print_status(comp)
 
@@ -14,7 +14,9 @@ from __future__ import annotations
 
 import asyncio
 import json
+import sys
 from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
 from pathlib import Path
 from typing import Any
 
@@ -135,6 +137,49 @@ async def _interactive_loop(comp: Computer, init_client: SMCPComputerClient | No
     )
 
 
+class _BatchSession:
+    """
+    中文: `--batch` 模式的会话：绕过 prompt_toolkit，逐行读取 stdin；提示符与读入的命令原样写回 stdout，输出不含任何 ANSI 控制序列。
+    English: Session for `--batch` mode: bypasses prompt_toolkit and reads stdin line by line; the prompt and the command
+        read are written back to stdout verbatim, so output carries no ANSI control sequences.
+    """
+
+    async def prompt_async(self, message: str = "", *, is_password: bool = False, **_: Any) -> str:
+        sys.stdout.write(message)
+        sys.stdout.flush()
+        line = await asyncio.to_thread(sys.stdin.readline)
+        if not line:
+            raise EOFError
+        line = line.rstrip("\r\n")
+        # 回写命令，使输出与终端回显一致（命令输出总是另起一行）；密码输入不回写，仅换行
+        # echo the command back, like a terminal would; password input is never echoed, only the newline
+        sys.stdout.write("\n" if is_password else line + "\n")
+        sys.stdout.flush()
+        return line
+
+
+def _no_patch_stdout(*, raw: bool = False) -> AbstractContextManager[None]:
+    """
+    中文: `--batch` 模式下无需 patch_stdout。
+    English: No stdout patching is needed in `--batch` mode.
+    """
+    return nullcontext()
+
+
+async def _batch_loop(comp: Computer, init_client: SMCPComputerClient | None = None) -> None:
+    """
+    中文: 非交互（管道）模式的循环：复用 interactive_impl 的命令实现，仅替换会话与 stdout 补丁。
+    English: Non-interactive (pipe) loop: reuses interactive_impl's commands, swapping only the session and stdout patch.
+    """
+    await _interactive_loop_impl(
+        comp,
+        session_factory=_BatchSession,
+        patch_stdout_ctx=_no_patch_stdout,
+        smcp_client_cls=SMCPComputerClient,
+        init_client=init_client,
+    )
+
+
 def _run_impl(
     *,
     auto_connect: bool,
@@ -146,6 +191,7 @@ def _run_impl(
     computer_factory: str | None,
     config: str | None,
     inputs: str | None,
+    batch: bool = False,
 ) -> None:
     """
     纯实现函数：不要在此处使用 Typer 的 Option 默认值，避免 OptionInfo 泄露到运行时。
@@ -227,7 +273,8 @@ def _run_impl(
                 except Exception as e:  # pragma: no cover
                     console.print(f"[red]加载 Servers 失败 / Failed to load servers: {e}[/red]")
 
-            await _interactive_loop(comp, init_client=init_client)
+            loop_fn = _batch_loop if batch else _interactive_loop
+            await loop_fn(comp, init_client=init_client)
 
     asyncio.run(_amain())
 
@@ -265,6 +312,11 @@ def run(
         "-i",
         help="在启动时从文件加载 Inputs 定义（支持 @file 语法或直接文件路径） / Load Inputs from file at startup",
     ),
+    batch: bool = typer.Option(
+        False,
+        "--batch",
+        help="非交互模式：不使用 prompt_toolkit，逐行读取 stdin，适合管道与脚本 / Non-interactive mode reading stdin line by line",
+    ),
 ) -> None:
     """
     中文: 启动计算机并进入持续运行模式。后续将支持从配置文件加载 servers 与 inputs。
@@ -280,6 +332,7 @@ def run(
         computer_factory=computer_factory,
         config=config,
         inputs=inputs,
+        batch=batch,
     )
 
 
@@ -36,7 +36,6 @@ from typing import TYPE_CHECKING, Any, Optional
 from mcp import Tool, types
 from mcp.shared.session import RequestResponder
 from mcp.types import CallToolResult, ResourceListChangedNotification, ResourceUpdatedNotification, TextContent, ToolListChangedNotification
-from prompt_toolkit import PromptSession
 from pydantic import BaseModel, TypeAdapter
 
 from a2c_smcp.computer.base import BaseComputer
@@ -45,7 +44,7 @@ from a2c_smcp.computer.inputs.render import ConfigRender
 from a2c_smcp.computer.inputs.resolver import InputNotFoundError, InputResolver
 from a2c_smcp.computer.mcp_clients.manager import MCPServerManager
 from a2c_smcp.computer.mcp_clients.model import MCPServerConfig, MCPServerInput
-from a2c_smcp.computer.types import ToolCallRecord
+from a2c_smcp.computer.types import SupportsPromptAsync, ToolCallRecord
 from a2c_smcp.smcp import Desktop, SMCPTool
 from a2c_smcp.types import AttributeValue
 from a2c_smcp.utils.logger import logger
@@ -56,7 +55,7 @@ if TYPE_CHECKING:
     from a2c_smcp.computer.socketio.client import SMCPComputerClient
 
 
-class Computer(BaseComputer[PromptSession]):
+class Computer(BaseComputer[SupportsPromptAsync]):
     def __init__(
         self,
         name: str,
@@ -133,7 +132,7 @@ class Computer(BaseComputer[PromptSession]):
         """
         self._socketio_client_ref = weakref.ref(client) if client is not None else None
 
-    async def boot_up(self, *, session: PromptSession | None = None) -> None:
+    async def boot_up(self, *, session: SupportsPromptAsync | None = None) -> None:
         """
         启动计算机，初始化 MCP 服务器管理器。
         Boot up the computer and initialize the MCP server manager.
@@ -265,7 +264,7 @@ class Computer(BaseComputer[PromptSession]):
         self,
         server: MCPServerConfig | dict[str, Any],
         *,
-        session: PromptSession | None = None,
+        session: SupportsPromptAsync | None = None,
     ) -> MCPServerConfig:
         """
         动态渲染并校验单个 MCP 服务器配置，支持原始字典或模型实例。
@@ -278,7 +277,7 @@ class Computer(BaseComputer[PromptSession]):
         Args:
           - server (MCPServerConfig | dict[str, Any]): 待处理的配置，可以是 Pydantic 模型或原始字典。| The config to process, can be
                 a Pydantic model or a raw dict.
-          - session (PromptSession | None, optional): 若渲染过程中需要交互式输入解析，使用的 Prompt 会话；可为空表示静默解析。 |
+          - session (SupportsPromptAsync | None, optional): 若渲染过程中需要交互式输入解析，使用的 Prompt 会话；可为空表示静默解析。 |
                 Prompt session used for interactive resolving during rendering; can be None for silent resolving.
 
         Returns:
@@ -325,13 +324,18 @@ class Computer(BaseComputer[PromptSession]):
             logger.error(f"动态渲染/校验MCP配置失败: {name} - {e}")
             raise e
 
-    async def aadd_or_aupdate_server(self, server: MCPServerConfig | dict[str, Any], *, session: PromptSession | None = None) -> None:
+    async def aadd_or_aupdate_server(
+        self,
+        server: MCPServerConfig | dict[str, Any],
+        *,
+        session: SupportsPromptAsync | None = None,
+    ) -> None:
         """
         动态添加或更新某个MCP Server配置（支持 inputs 占位符解析）。
         Add or update a MCP Server config dynamically (supports inputs placeholder resolving).
 
         Args:
-            session (PromptSession | None): Computer管理Session
+            session (SupportsPromptAsync | None): Computer管理Session
             server (MCPServerConfig | dict[str, Any]): 待添加/更新的配置，可为模型或原始字典。
         """
         # 确保 manager 已初始化
@@ -345,7 +349,7 @@ class Computer(BaseComputer[PromptSession]):
         validated = await self._arender_and_validate_server(server, session=session)
         await self.mcp_manager.aadd_or_aupdate_server(validated)
 
-    async def aremove_server(self, server_name: str, *, session: PromptSession | None = None) -> None:
+    async def aremove_server(self, server_name: str, *, session: SupportsPromptAsync | None = None) -> None:
         """
         动态移除某个MCP Server配置。
         Remove a MCP Server config dynamically.
@@ -359,7 +363,7 @@ class Computer(BaseComputer[PromptSession]):
             return
         await self.mcp_manager.aremove_server(server_name)
 
-    def update_inputs(self, inputs: set[MCPServerInput], *, session: PromptSession | None = None) -> None:
+    def update_inputs(self, inputs: set[MCPServerInput], *, session: SupportsPromptAsync | None = None) -> None:
         """
         更新 inputs 定义，并清空解析缓存。
         Update inputs definition and clear resolver cache.
@@ -375,7 +379,7 @@ class Computer(BaseComputer[PromptSession]):
         # 清理缓存，确保后续渲染使用最新 inputs
         self._input_resolver.clear_cache()
 
-    def add_or_update_input(self, input_cfg: MCPServerInput, *, session: PromptSession | None = None) -> None:
+    def add_or_update_input(self, input_cfg: MCPServerInput, *, session: SupportsPromptAsync | None = None) -> None:
         """
         按 id 动态新增或更新单个 input。
         Add or update a single input by id dynamically.
@@ -397,7 +401,7 @@ class Computer(BaseComputer[PromptSession]):
         self._input_resolver = InputResolver(self._inputs, session=sess)
         self._input_resolver.clear_cache(input_cfg.id)
 
-    def remove_input(self, input_id: str, *, session: PromptSession | None = None) -> bool:
+    def remove_input(self, input_id: str, *, session: SupportsPromptAsync | None = None) -> bool:
         """
         按 id 移除单个 input，返回是否删除成功。
         Remove a single input by id. Returns whether deletion happened.
@@ -421,7 +425,7 @@ class Computer(BaseComputer[PromptSession]):
         self._input_resolver.clear_cache(input_id)
         return removed
 
-    def get_input(self, input_id: str, *, session: PromptSession | None = None) -> MCPServerInput | None:
+    def get_input(self, input_id: str, *, session: SupportsPromptAsync | None = None) -> MCPServerInput | None:
         """
         获取指定 id 的 input 定义（只读）。
         Get input definition by id (read-only).
@@ -433,7 +437,7 @@ class Computer(BaseComputer[PromptSession]):
                 return existed
         return None
 
-    def list_inputs(self, *, session: PromptSession | None = None) -> tuple[MCPServerInput, ...]:
+    def list_inputs(self, *, session: SupportsPromptAsync | None = None) -> tuple[MCPServerInput, ...]:
         """
         列出当前全部 inputs（不可变）。
         List all current inputs (immutable).
@@ -443,42 +447,42 @@ class Computer(BaseComputer[PromptSession]):
     # ------------------------
     # 当前 inputs 值（缓存）增删改查 / CRUD for current input values (cache)
     # ------------------------
-    def get_input_value(self, input_id: str, *, session: PromptSession | None = None) -> Any | None:
+    def get_input_value(self, input_id: str, *, session: SupportsPromptAsync | None = None) -> Any | None:
         """
         中文: 获取指定 id 的当前已解析值（来自缓存）。若尚未解析，则返回 None。
         English: Get current resolved value for given id from cache. Returns None if not resolved yet.
         """
         return self._input_resolver.get_cached_value(input_id)
 
-    def set_input_value(self, input_id: str, value: Any, *, session: PromptSession | None = None) -> bool:
+    def set_input_value(self, input_id: str, value: Any, *, session: SupportsPromptAsync | None = None) -> bool:
         """
         中文: 设置指定 id 的当前值（写入缓存）。仅当该 id 在 inputs 定义中存在时生效，返回是否成功。
         English: Set current value for given id (write to cache). Only works if id exists in inputs; returns success.
         """
         return self._input_resolver.set_cached_value(input_id, value)
 
-    def remove_input_value(self, input_id: str, *, session: PromptSession | None = None) -> bool:
+    def remove_input_value(self, input_id: str, *, session: SupportsPromptAsync | None = None) -> bool:
         """
         中文: 删除指定 id 的当前缓存值，返回是否删除发生。
         English: Delete current cached value for given id. Returns whether deletion happened.
         """
         return self._input_resolver.delete_cached_value(input_id)
 
-    def list_input_values(self, *, session: PromptSession | None = None) -> dict[str, Any]:
+    def list_input_values(self, *, session: SupportsPromptAsync | None = None) -> dict[str, Any]:
         """
         中文: 列出所有已解析的 inputs 当前值（缓存快照）。若无则返回空字典。
         English: List all resolved input values (cache snapshot). Returns empty dict if none.
         """
         return self._input_resolver.list_cached_values()
 
-    def clear_input_values(self, input_id: str | None = None, *, session: PromptSession | None = None) -> None:
+    def clear_input_values(self, input_id: str | None = None, *, session: SupportsPromptAsync | None = None) -> None:
         """
         中文: 清空所有或指定 id 的输入值缓存。
         English: Clear all cached values or the specified id.
         """
         self._input_resolver.clear_cache(input_id)
 
-    async def shutdown(self, *, session: PromptSession | None = None) -> None:
+    async def shutdown(self, *, session: SupportsPromptAsync | None = None) -> None:
         """
         关闭计算机，关闭 MCP 服务器管理器。
         Shutdown the computer and close the MCP server manager.
@@ -20,6 +20,7 @@ from prompt_toolkit import PromptSession
 from prompt_toolkit.patch_stdout import patch_stdout
 from rich.table import Table
 
+from a2c_smcp.computer.types import SupportsPromptAsync
 from a2c_smcp.computer.utils import console as console_util
 
 
@@ -28,7 +29,7 @@ async def ainput_prompt(
     *,
     password: bool = False,
     default: str | None = None,
-    session: PromptSession | None = None,
+    session: SupportsPromptAsync | None = None,
 ) -> str:
     """
     中文: 提示用户输入字符串；当 password=True 时进行掩码输入。
@@ -64,7 +65,7 @@ async def ainput_pick(
     *,
     default_index: int | None = None,
     multi: bool = False,
-    session: PromptSession | None = None,
+    session: SupportsPromptAsync | None = None,
 ) -> None | list[str] | str | list[Any]:
     """
     中文: 让用户以序号选择一个或多个字符串。
@@ -15,8 +15,6 @@ from __future__ import annotations
 from collections.abc import Iterable
 from typing import Any
 
-from prompt_toolkit import PromptSession
-
 from a2c_smcp.computer.inputs.base import BaseInputResolver
 from a2c_smcp.computer.inputs.cli_io import ainput_pick, ainput_prompt, arun_command
 from a2c_smcp.computer.mcp_clients.model import (
@@ -25,6 +23,7 @@ from a2c_smcp.computer.mcp_clients.model import (
     MCPServerPickStringInput,
     MCPServerPromptStringInput,
 )
+from a2c_smcp.computer.types import SupportsPromptAsync
 from a2c_smcp.utils.logger import logger
 
 
@@ -32,20 +31,20 @@ class InputNotFoundError(KeyError):
     pass
 
 
-class InputResolver(BaseInputResolver[PromptSession]):
+class InputResolver(BaseInputResolver[SupportsPromptAsync]):
     """
     中文: 输入解析器，支持基于 id 的惰性解析与结果缓存。
     English: Input resolver with lazy per-id resolution and result cache.
     """
 
-    def __init__(self, inputs: Iterable[MCPServerInput], session: PromptSession | None = None) -> None:
+    def __init__(self, inputs: Iterable[MCPServerInput], session: SupportsPromptAsync | None = None) -> None:
         """
-        中文: CLI 特化的输入解析器，支持可选的 PromptSession 注入。
-        English: CLI-specialized input resolver with optional PromptSession injection.
+        中文: CLI 特化的输入解析器，支持可选的交互会话（如 PromptSession）注入。
+        English: CLI-specialized input resolver with optional interactive session (e.g. PromptSession) injection.
         """
         super().__init__(inputs, session=session)
 
-    async def aresolve_by_id(self, input_id: str, *, session: PromptSession | None = None) -> Any:
+    async def aresolve_by_id(self, input_id: str, *, session: SupportsPromptAsync | None = None) -> Any:
         if input_id in self._cache:
             return self._cache[input_id]
         cfg = self._inputs.get(input_id)
@@ -69,12 +68,17 @@ class InputResolver(BaseInputResolver[PromptSession]):
         self._cache[input_id] = value
         return value
 
-    async def _aresolve_prompt(self, cfg: MCPServerPromptStringInput, *, session: PromptSession | None = None) -> str:
+    async def _aresolve_prompt(
+        self,
+        cfg: MCPServerPromptStringInput,
+        *,
+        session: SupportsPromptAsync | None = None,
+    ) -> str:
         msg = cfg.description or f"请输入 {cfg.id} / Please input {cfg.id}"
         pwd = bool(cfg.password)
         return await ainput_prompt(msg, password=pwd, default=cfg.default, session=session)
 
-    async def _aresolve_pick(self, cfg: MCPServerPickStringInput, *, session: PromptSession | None = None) -> str:
+    async def _aresolve_pick(self, cfg: MCPServerPickStringInput, *, session: SupportsPromptAsync | None = None) -> str:
         msg = cfg.description or f"请选择 {cfg.id} / Please pick {cfg.id}"
         options = cfg.options or []
         default_index = None
@@ -13,9 +13,18 @@ Computer module type definitions
 - Provide types shared between Computer and Desktop organizing strategy.
 """
 
-from typing import TypedDict
+from typing import Protocol, TypedDict
 
-__all__ = ["ToolCallRecord"]
+__all__ = ["SupportsPromptAsync", "ToolCallRecord"]
+
+
+class SupportsPromptAsync(Protocol):
+    """
+    交互输入会话协议：prompt_toolkit 的 PromptSession 与 CLI --batch 会话均满足
+    Interactive input session protocol, satisfied by prompt_toolkit's PromptSession and the CLI --batch session
+    """
+
+    async def prompt_async(self, message: str = ..., *, is_password: bool = ...) -> str: ...
 
 
 class ToolCallRecord(TypedDict):
@@ -12,137 +12,32 @@ English: Common fixtures for e2e Agent tests. Boots a real Socket.IO HTTP server
 from __future__ import annotations
 
 import contextlib
-import multiprocessing
 import socket
 import time
 from collections.abc import Iterator
-from multiprocessing.synchronize import Event
 from typing import Any
 
 import pytest
+import pytest_asyncio
 import socketio
 from socketio import Namespace, Server, WSGIApp
-from werkzeug.serving import make_server
 
-from a2c_smcp.server import SyncSMCPNamespace
-from a2c_smcp.server.sync_auth import SyncAuthenticationProvider
 from a2c_smcp.smcp import GET_DESKTOP_EVENT, GET_TOOLS_EVENT, SMCP_NAMESPACE, TOOL_CALL_EVENT
+from tests.e2e.utils import run_http_server
 
 # ============================================================================
-# 中文: 本地同步服务器创建函数
-# English: Local sync server creation functions
+# 中文: 同步服务器端点；local_sync_server 由 tests/e2e/conftest.py 提供
+# English: Sync server endpoint; local_sync_server comes from tests/e2e/conftest.py
 # ============================================================================
 
 
-class _PassSyncAuth(SyncAuthenticationProvider):
-    """中文: 测试用的放行认证提供者 / English: Permissive auth provider for testing"""
-
-    def authenticate(self, sio: Server, environ: dict, auth: dict | None, headers: list) -> bool:  # type: ignore[override]
-        return True
-
-
-class LocalSyncSMCPNamespace(SyncSMCPNamespace):
-    """中文: 同步命名空间，继承自正式实现，仅替换认证 / English: Sync namespace with test auth"""
-
-    def __init__(self) -> None:
-        super().__init__(auth_provider=_PassSyncAuth())
-
-
-def create_local_sync_server() -> tuple[Server, Namespace, WSGIApp]:
-    """中文: 创建同步 Socket.IO Server 并注册本地命名空间 / English: Create sync Socket.IO Server with local namespace"""
-    sio = Server(
-        cors_allowed_origins="*",
-        ping_timeout=60,
-        ping_interval=25,
-        async_handlers=True,  # 如果想使用 call 方法，则必定需要将此参数设置为True / Required for call method
-        always_connect=True,
-    )
-    ns = LocalSyncSMCPNamespace()
-    sio.register_namespace(ns)
-    app = WSGIApp(sio, socketio_path="/socket.io")
-    return sio, ns, app
-
-
-# ============================================================================
-# 中文: 多进程服务器启动函数 / English: Multiprocess server startup
-# ============================================================================
-
-
-def _run_server_process(port: int, ready_event: Event) -> None:
-    """
-    中文: 在独立进程中运行服务器
-    English: Run server in a separate process
-    """
-    try:
-        sio, ns, wsgi_app = create_local_sync_server()
-        # 禁用监控任务避免关闭时出错 / Disable monitoring task to avoid shutdown errors
-        sio.eio.start_service_task = False
-
-        server = make_server("127.0.0.1", port, wsgi_app, threaded=True)
-
-        # 通知主进程服务器已准备好 / Notify main process that server is ready
-        ready_event.set()
-
-        # 运行服务器 / Run server
-        server.serve_forever()
-    except Exception as e:
-        print(f"服务器进程错误 / Server process error: {e}")
-        ready_event.set()  # 即使出错也要设置事件，避免主进程无限等待 / Set event even on error
-
-
-@contextlib.contextmanager
-def run_http_server() -> Iterator[tuple[str, int]]:
-    """
-    中文: 启动一个基于多进程的同步 Socket.IO Server（真实 HTTP 服务），返回 (host, port)。
-    English: Start a multiprocess sync Socket.IO server over real HTTP, return (host, port).
-    """
-    # 选取随机可用端口 / pick a free port
-    sock = socket.socket()
-    sock.bind(("127.0.0.1", 0))
-    host, port = sock.getsockname()
-    sock.close()
-
-    # 创建进程间通信事件 / Create inter-process communication event
-    ready_event = multiprocessing.Event()
-
-    # 启动服务器进程 / Start server process
-    server_process = multiprocessing.Process(
-        target=_run_server_process,
-        args=(port, ready_event),
-        daemon=True,
-    )
-    server_process.start()
-
-    # 等待服务器准备好 / Wait for server to be ready
-    if not ready_event.wait(timeout=10):
-        server_process.terminate()
-        server_process.join(timeout=2)
-        raise RuntimeError("服务器进程启动超时 / Server process startup timeout")
-
-    # 额外等待确保端口完全可用 / Extra wait to ensure port is fully available
-    time.sleep(0.3)
-
-    try:
-        yield host, port
-    finally:
-        # 终止服务器进程 / Terminate server process
-        if server_process.is_alive():
-            server_process.terminate()
-            server_process.join(timeout=3)
-
-        # 如果进程仍然存活，强制杀死 / Force kill if still alive
-        if server_process.is_alive():
-            server_process.kill()
-            server_process.join(timeout=1)
-
-
 @pytest.fixture(scope="session")
-def server_endpoint() -> Iterator[str]:
+def server_endpoint(local_sync_server: tuple[Server, Namespace, WSGIApp]) -> Iterator[str]:
     """
     中文: 提供形如 http://127.0.0.1:PORT 的服务端地址。
     English: Provide server endpoint like http://127.0.0.1:PORT
     """
-    with run_http_server() as (host, port):
+    with run_http_server(local_sync_server[2]) as (host, port):
         yield f"http://{host}:{port}"
 
 
@@ -274,44 +169,52 @@ def create_local_async_server() -> tuple[socketio.AsyncServer, socketio.AsyncNam
 
 
 @pytest.fixture
-def async_server_port() -> int:
+def async_server_socket() -> Iterator[socket.socket]:
     """
-    中文: 查找可用端口用于异步服务器。
-    English: Find an available TCP port for async server.
+    中文: 异步服务器使用的预绑定监听套接字，见 bind_listening_socket。
+    English: Pre-bound listening socket for the async server; see bind_listening_socket.
     """
-    sock = socket.socket()
-    sock.bind(("127.0.0.1", 0))
-    port = sock.getsockname()[1]
-    sock.close()
-    return port
+    from tests.integration_tests.computer.socketio.mock_uv_server import bind_listening_socket
+
+    sock = bind_listening_socket()
+    try:
+        yield sock
+    finally:
+        sock.close()
 
 
 @pytest.fixture
-async def async_socketio_server(async_server_port: int):
+def async_server_port(async_server_socket: socket.socket) -> int:
+    """
+    中文: 异步服务器监听的端口。
+    English: Port the async server listens on.
+    """
+    return async_server_socket.getsockname()[1]
+
+
+@pytest_asyncio.fixture
+async def async_socketio_server(async_server_socket: socket.socket, async_server_port: int):
     """
     中文: 启动基于 SMCPNamespace 的异步测试服务器，返回命名空间。
     English: Start async test server based on SMCPNamespace and return the namespace.
     """
     import time
 
-    from tests.integration_tests.computer.socketio.mock_uv_server import UvicornTestServer
+    from tests.integration_tests.computer.socketio.mock_uv_server import serve_asgi
 
     start = time.time()
     sio, ns, asgi_app = create_local_async_server()
 
-    server = UvicornTestServer(asgi_app, port=async_server_port)
-    await server.up()
-    print(f"\n[E2E] Async server started on port {async_server_port} in {time.time() - start:.2f}s")
-    try:
-        yield ns
-    finally:
-        shutdown_start = time.time()
-        # 强制快速关闭，不等待连接清理 / Force fast shutdown without waiting for connection cleanup
-        await server.down(force=True)
-        print(f"[E2E] Async server shutdown in {time.time() - shutdown_start:.2f}s")
+    async with serve_asgi(asgi_app, async_server_socket):
+        print(f"\n[E2E] Async server started on port {async_server_port} in {time.time() - start:.2f}s")
+        try:
+            yield ns
+        finally:
+            shutdown_start = time.time()
+    print(f"[E2E] Async server shutdown in {time.time() - shutdown_start:.2f}s")
 
 
-@pytest.fixture()
+@pytest_asyncio.fixture
 async def async_mock_computer_client(async_socketio_server, async_server_port: int):
     """
     中文: 已连接到异步 Server 的模拟 Computer 客户端。每个测试创建独立客户端，但复用服务器。
@@ -29,16 +29,24 @@ from a2c_smcp.smcp import (
 pytestmark = pytest.mark.e2e
 
 
-async def _wait_until(cond, timeout: float = 2.0, step: float = 0.01) -> bool:
+async def _wait_until(cond, timeout: float = 2.0, step: float = 0.005, max_step: float = 0.05) -> bool:
     """
-    中文: 简易异步等待辅助函数，直到条件满足或超时。
-    English: Simple async wait helper until condition met or timeout.
+    中文: 简易异步等待辅助函数，直到条件满足或超时。事件循环只取一次，循环内直接读 loop.time()。
+          首轮仅以 sleep(0) 让出一次事件循环（asyncio 对其有专门的快速路径），之后轮询间隔从 `step` 指数退避至
+          `max_step`（50ms 已足够 e2e 判定）：事件很快到达时延迟低，迟迟未到时也不会每 10ms 唤醒一次。
+    English: Simple async wait helper until condition met or timeout. The running loop is fetched once and its clock
+          read directly on each iteration. The first round only yields once via sleep(0) (which asyncio fast-paths),
+          then the poll interval backs off exponentially from `step` to `max_step` (50ms is plenty for e2e gating):
+          low latency when the event arrives quickly, no wakeup every 10ms when it is late.
     """
-    end = asyncio.get_event_loop().time() + timeout
-    while asyncio.get_event_loop().time() < end:
+    loop = asyncio.get_running_loop()
+    end = loop.time() + timeout
+    delay = 0.0
+    while loop.time() < end:
         if cond():
             return True
-        await asyncio.sleep(step)
+        await asyncio.sleep(delay)
+        delay = min(max(delay * 2, step), max_step)
     return cond()
 
 
@@ -29,16 +29,20 @@ from a2c_smcp.smcp import (
 pytestmark = pytest.mark.e2e
 
 
-def _wait_until(cond, timeout: float = 2.0, step: float = 0.01) -> bool:
+def _wait_until(cond, timeout: float = 2.0, step: float = 0.001, max_step: float = 0.02) -> bool:
     """
-    中文: 简易等待辅助函数，直到条件满足或超时。
-    English: Simple wait helper until condition met or timeout.
+    中文: 简易等待辅助函数，直到条件满足或超时。以单调时钟计算一次截止时间（不受系统时间跳变影响），
+          轮询间隔从 `step` 起指数退避至 `max_step`：事件很快到达时延迟低，迟迟未到时也不空转。
+    English: Simple wait helper until condition met or timeout. The deadline is computed once on the monotonic clock
+          (immune to wall-clock jumps), and the poll interval backs off exponentially from `step` to `max_step`:
+          low latency when the event arrives quickly, no busy spinning when it is late.
     """
-    end = time.time() + timeout
-    while time.time() < end:
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
         if cond():
             return True
         time.sleep(step)
+        step = min(step * 2, max_step)
     return cond()
 
 
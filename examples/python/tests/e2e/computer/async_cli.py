@@ -0,0 +1,128 @@
+"""
+文件名: async_cli.py
+作者: JQQ
+创建日期: 2025/10/16
+最后修改日期: 2025/10/16
+版权: 2023 JQQ. All rights reserved.
+依赖: asyncio
+描述:
+  中文: 基于 asyncio.subprocess 管道的 CLI 驱动器。与阻塞式 pexpect 轮询不同，多个 CLI 可在同一事件循环中并发读写，
+        适合在单个 xdist worker 内承载更多 e2e 测试。
+  English: CLI driver built on asyncio.subprocess pipes. Unlike blocking pexpect polling, several CLIs can be driven
+        concurrently from one event loop, letting a single xdist worker host more e2e tests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import codecs
+import re
+import uuid
+from collections.abc import Sequence
+
+from tests.e2e.computer.utils import PROMPT_RE
+
+# 单次读取的最大字节数 / Max bytes per read
+_READ_CHUNK = 65536
+
+
+class AsyncCli:
+    """
+    中文: 通过 stdin/stdout 管道驱动 CLI 进程；`expect` 在累积缓冲中查找目标，命中后消费至匹配末尾。
+    English: Drive the CLI process over stdin/stdout pipes; `expect` searches the accumulated buffer and consumes it
+        up to the end of the match.
+    """
+
+    def __init__(self, proc: asyncio.subprocess.Process) -> None:
+        self._proc = proc
+        self._buf = ""
+        # 增量解码，避免多字节字符被分块截断 / Incremental decoding so multi-byte chars split across reads survive
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    @classmethod
+    async def start(cls, args: Sequence[str], *, env: dict[str, str], cwd: str) -> AsyncCli:
+        """
+        中文: 启动 CLI 子进程（stderr 合并到 stdout）。
+        English: Start the CLI child process (stderr merged into stdout).
+        """
+        proc = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            env=env,
+            cwd=cwd,
+        )
+        return cls(proc)
+
+    @property
+    def returncode(self) -> int | None:
+        return self._proc.returncode
+
+    async def send(self, cmd: str) -> None:
+        """
+        中文: 发送一行命令。
+        English: Send one command line.
+        """
+        assert self._proc.stdin is not None
+        self._proc.stdin.write((cmd + "\n").encode("utf-8"))
+        await self._proc.stdin.drain()
+
+    async def expect(self, pattern: str | re.Pattern[str], timeout: float = 15.0) -> str:
+        """
+        中文: 等待 `pattern`（字符串按字面匹配）出现，返回其之前的输出并消费至匹配末尾；超时抛出 asyncio.TimeoutError。
+        English: Wait for `pattern` (strings match literally) and return the output before it, consuming up to the end
+            of the match; raises asyncio.TimeoutError on timeout.
+        """
+        assert self._proc.stdout is not None
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            if isinstance(pattern, str):
+                idx = self._buf.find(pattern)
+                span = (idx, idx + len(pattern)) if idx >= 0 else None
+            else:
+                m = pattern.search(self._buf)
+                span = m.span() if m else None
+            if span is not None:
+                before, self._buf = self._buf[: span[0]], self._buf[span[1] :]
+                return before
+            chunk = await asyncio.wait_for(self._proc.stdout.read(_READ_CHUNK), max(deadline - loop.time(), 0))
+            if not chunk:
+                raise EOFError(f"CLI 输出已结束 / CLI output closed. 缓冲 / buffer:\n{self._buf}")
+            self._buf += self._decoder.decode(chunk)
+
+    async def barrier(self, timeout: float = 15.0) -> str:
+        """
+        中文: 发送 `echo <唯一标记>` 并等待其打印，返回此前命令的全部原始输出；与 utils._echo_barrier 语义一致。
+        English: Send `echo <unique marker>` and wait for it to be printed, returning the raw output of earlier commands;
+            same semantics as utils._echo_barrier.
+        """
+        marker = f"__A2C_MARK_{uuid.uuid4().hex}__"
+        await self.send(f"echo {marker}")
+        out = await self.expect("\n" + marker, timeout)
+        await self.expect(PROMPT_RE, timeout)
+        return out
+
+    async def run(self, cmd: str, timeout: float = 15.0) -> str:
+        """
+        中文: 发送命令并经 echo 标记屏障返回其原始输出。
+        English: Send a command and return its raw output via the echo-marker barrier.
+        """
+        await self.send(cmd)
+        return await self.barrier(timeout)
+
+    async def close(self) -> None:
+        """
+        中文: 优雅退出；超时则强杀。
+        English: Exit gracefully; kill on timeout.
+        """
+        if self._proc.returncode is None:
+            try:
+                await self.send("exit")
+                await asyncio.wait_for(self._proc.wait(), 5)
+            except (asyncio.TimeoutError, ConnectionError):
+                pass
+        if self._proc.returncode is None:
+            self._proc.kill()
+            await self._proc.wait()
@@ -13,31 +13,41 @@
 from __future__ import annotations
 
 import os
+import re
 import shutil
 import signal
+import socket
+import subprocess
 import sys
-from collections.abc import Iterator
+from collections.abc import AsyncIterator, Iterator
 from contextlib import contextmanager
 
 import pytest
+import pytest_asyncio
 
-from tests.e2e.computer.utils import PROMPT_RE, expect_prompt_stable
+from tests.e2e.computer.async_cli import AsyncCli
+from tests.e2e.computer.utils import PROMPT_RE, assert_cli_output_contains, expect_prompt_stable
 
 pexpect = pytest.importorskip("pexpect", reason="e2e tests require pexpect; install with `pip install pexpect`.")
+PopenSpawn = pytest.importorskip("pexpect.popen_spawn").PopenSpawn
 
+# 项目根目录（本文件位于 tests/e2e/computer/conftest.py，向上三级即为项目根）
+# Project root (this file lives at tests/e2e/computer/conftest.py; go up three levels)
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
 
-@contextmanager
-def _spawn_cli(*extra_args: str, cwd: str | None = None) -> Iterator[pexpect.spawn]:
+
+def _cli_env() -> dict[str, str]:
     """
-    中文: 启动 CLI 交互进程，返回 pexpect child；确保在退出时清理。可通过 `cwd` 指定子进程工作目录，默认使用项目根目录。
-    English: Spawn the CLI interactive process and ensure cleanup on exit. You can specify child process working directory via `cwd`;
-        defaults to project root.
+    中文: 构建 CLI 子进程环境变量（无缓冲、UTF-8、降低 prompt_toolkit 控制序列噪音）。
+    English: Build the CLI child environment (unbuffered, UTF-8, fewer prompt_toolkit control sequences).
     """
-    print("spawn cli...")
     env = os.environ.copy()
     # 确保 Python 输出不被缓冲，便于 pexpect 捕获 / Unbuffered Python output for stable pexpect reads
     env["PYTHONUNBUFFERED"] = "1"
     env["PYTHONIOENCODING"] = "utf-8"
+    # 不写 .pyc 以加快启动；固定哈希种子使输出顺序稳定 / Skip .pyc writes for faster startup; fixed hash seed for stable output
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    env["PYTHONHASHSEED"] = "0"
     # 降低 prompt_toolkit 的控制序列噪音（如 CPR），提升匹配稳定性
     # Reduce prompt_toolkit control sequences to stabilize matching
     env["PROMPT_TOOLKIT_NO_CPR"] = "1"
@@ -57,6 +67,14 @@ def _spawn_cli(*extra_args: str, cwd: str | None = None) -> Iterator[pexpect.spa
     # 强制使用UTF-8编码 / Force UTF-8 encoding
     env["LC_ALL"] = "en_US.UTF-8"
     env["LANG"] = "en_US.UTF-8"
+    return env
+
+
+def _cli_args(*extra_args: str) -> list[str]:
+    """
+    中文: 构建 CLI 启动参数：优先使用已安装的 console script，否则回退到 python -c 调用 main()。
+    English: Build CLI argv: prefer the installed console script, fall back to python -c main().
+    """
     # 优先使用已安装的 console script；否则回退到 python -c 调用 main()
     # Prefer console script if available; fallback to python -c main()
     console_script = shutil.which("a2c-computer")
@@ -73,22 +91,45 @@ def _spawn_cli(*extra_args: str, cwd: str | None = None) -> Iterator[pexpect.spa
         ]
     if extra_args:
         args.extend(extra_args)
+    return args
 
-    # 计算与设置工作目录 / Compute and set working directory
-    # 默认将工作目录设置为项目根目录（本文件位于 tests/e2e/conftest.py，向上两级即为项目根）
-    # By default, set cwd to project root (this file lives at tests/e2e/conftest.py; go up two levels)
-    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
-    spawn_cwd = cwd or project_root
+
+@contextmanager
+def _spawn_cli(*extra_args: str, cwd: str | None = None) -> Iterator[pexpect.spawn]:
+    """
+    中文: 启动 CLI 交互进程，返回 pexpect child；确保在退出时清理。可通过 `cwd` 指定子进程工作目录，默认使用项目根目录。
+    English: Spawn the CLI interactive process and ensure cleanup on exit. You can specify child process working directory via `cwd`;
+        defaults to project root.
+    """
+    print("spawn cli...")
+    env = _cli_env()
+    args = _cli_args(*extra_args)
+
+    # 默认将工作目录设置为项目根目录 / By default, set cwd to project root
+    spawn_cwd = cwd or _PROJECT_ROOT
 
     print("a2c-computer starting...")
+    # 增大单次读取上限，长输出（如带 VRL 元数据的 tc 结果）所需的 read 次数大幅减少
+    # A larger maxread cuts the number of reads needed for long outputs such as tc results carrying VRL metadata
+    # 保留文本模式：pexpect 在读取时用增量解码器只解码一次，跨块截断的多字节字符也能正确拼接；下游正则与断言均基于 str
+    # Keep text mode: pexpect decodes once per read with an incremental decoder, so multi-byte chars split across reads
+    # are reassembled correctly; downstream patterns and assertions all work on str
+    child = pexpect.spawn(args[0], args[1:], env=env, encoding="utf-8", timeout=60, cwd=spawn_cwd, maxread=65536)
     # 保证每次发送前有一个时延保持稳定
-    child = pexpect.spawn(args[0], args[1:], env=env, encoding="utf-8", timeout=60, cwd=spawn_cwd)
-    # 控制窗口大小，减少 CPR 请求 / Set winsize to reduce CPR
     child.delaybeforesend = 0.1
+    # 每次读取后不再休眠 / Do not sleep after each read
+    child.delayafterread = None
+    # 控制窗口大小，减少 CPR 请求 / Set winsize to reduce CPR
     try:
         child.setwinsize(24, 120)
     except Exception:
         pass
+    # 关闭 PTY 回显：输入行由 prompt_toolkit 自行渲染，终端层回显只会重复同样的字节
+    # Disable PTY echo: prompt_toolkit renders the input line itself, so terminal-level echo only duplicates bytes
+    try:
+        child.setecho(False)
+    except Exception:
+        pass
     try:
         yield child
     finally:
@@ -106,6 +147,44 @@ def _spawn_cli(*extra_args: str, cwd: str | None = None) -> Iterator[pexpect.spa
                 pass
 
 
+def _wait_cli_ready(child: pexpect.spawn) -> None:
+    """
+    中文: 等待新启动的 CLI 打印横幅并停在 `a2c>` 提示符。
+    English: Wait for a freshly spawned CLI to print its banner and settle at the `a2c>` prompt.
+    """
+    print("a2c-computer started up")
+    # 以返回索引区分结果，超时不抛异常；横幅之后提示符随即出现 / Branch on the returned index, no exception on timeout
+    idx = child.expect(
+        [r"Enter interactive mode, type 'help' for commands", PROMPT_RE, pexpect.TIMEOUT, pexpect.EOF],
+        timeout=20,
+    )
+    if idx == 3:
+        raise RuntimeError(f"CLI 启动后即退出 / CLI exited during startup:\n{child.before}")
+    if idx != 1:
+        # 横幅已出现（或尚无输出）：仅需再等一次提示符，必要时以一次空回车触发刷新
+        # Banner seen (or nothing yet): wait for the prompt once more, poking with a single empty enter on timeout
+        if child.expect([PROMPT_RE, pexpect.TIMEOUT], timeout=10) == 1:
+            child.sendline("")
+            child.expect(PROMPT_RE, timeout=10)
+    expect_prompt_stable(child, max_wait=12.0)
+
+
+def _configured_servers(child: pexpect.spawn) -> set[str]:
+    """
+    中文: 解析 `mcp` 命令输出的 Servers 表格，返回当前已配置的 server 名称集合。
+    English: Parse the Servers table printed by `mcp` and return the names of configured servers.
+    """
+    out = assert_cli_output_contains(child, "mcp", "Servers:")
+    section = out.split("Servers:", 1)[1].split("Inputs:", 1)[0]
+    names: set[str] = set()
+    for line in section.splitlines():
+        # 表头、分隔线（含 ASCII 边框的 `|----|`）均跳过 / skip header and separator rows (incl. ASCII `|----|`)
+        cells = [c.strip() for c in re.split(r"[│|┃]", line)]
+        if len(cells) >= 3 and cells[1].strip("-=+ ") and cells[1] != "Name":
+            names.add(cells[1])
+    return names
+
+
 @pytest.fixture()
 def cli_proc() -> Iterator[pexpect.spawn]:
     """
@@ -113,26 +192,117 @@ def cli_proc() -> Iterator[pexpect.spawn]:
     English: Provide a CLI process ready at `a2c>` prompt.
     """
     with _spawn_cli() as child:
-        print("a2c-computer started up")
-        child.expect([r"Enter interactive mode, type 'help' for commands", PROMPT_RE])
-        # 若匹配到横幅，则继续等待提示符 / If banner matched, then wait for prompt
-        if (
-            child.match
-            and hasattr(child.match, "re")
-            and child.match.re
-            and getattr(child.match.re, "pattern", "").startswith("Enter interactive")
-        ):
-            pass  # fall through to wait prompt below
-        # 等待提示符，并在必要时发送空回车触发刷新 / Wait for prompt, poke with empty enter if needed
-        for _ in range(5):
-            try:
-                print("waiting for [a2c>]...")
-                expect_prompt_stable(child, quiet=0.5, max_wait=5.0)
-                break
-            except pexpect.TIMEOUT:
-                child.sendline("")
-        else:
-            child.expect(PROMPT_RE)
-        child.sendline("")
-        expect_prompt_stable(child, quiet=0.5, max_wait=12.0)
+        _wait_cli_ready(child)
         yield child
+
+
+@pytest.fixture(scope="session")
+def _session_cli_proc() -> Iterator[pexpect.spawn]:
+    """
+    中文: 整个测试会话共享的 CLI 进程，仅由 `shared_cli_proc` 使用。pytest-xdist 下每个 worker 各自运行一个会话，
+          因此每个 worker 拥有独立的 CLI 进程，使用它的测试可按默认 `load` 策略并行分发，无需分组。
+    English: CLI process shared by the whole test session; only consumed through `shared_cli_proc`. Under pytest-xdist
+        every worker runs its own session and therefore owns its own CLI process, so tests using it can be spread
+        with the default `load` scheduling and need no grouping.
+    """
+    with _spawn_cli() as child:
+        _wait_cli_ready(child)
+        yield child
+
+
+@pytest.fixture()
+def shared_cli_proc(_session_cli_proc: pexpect.spawn) -> Iterator[pexpect.spawn]:
+    """
+    中文: 复用会话级 CLI 进程，省去每个测试的解释器冷启动与 SMCP 导入；测试结束后移除其添加的全部 server，
+          并断言已回到空基线，防止状态泄漏到下一个测试（例如同名工具在多个 server 间产生歧义）。
+          仅适用于只增删 server 的测试；会修改 inputs、历史等其它状态的测试请继续使用 `cli_proc`。
+    English: Reuse the session-wide CLI process, skipping interpreter cold start and SMCP imports per test. After
+        each test every server it added is removed and the empty baseline is asserted, so no state leaks into the
+        next test (e.g. the same tool name becoming ambiguous across servers). Only for tests that merely add and
+        remove servers; tests touching inputs, history or other state should keep using `cli_proc`.
+    """
+    child = _session_cli_proc
+    yield child
+    for name in _configured_servers(child):
+        child.sendline(f"server rm {name}")
+        expect_prompt_stable(child, max_wait=15.0)
+    leaked = _configured_servers(child)
+    assert not leaked, f"server 清理后仍有残留 / servers left after cleanup: {leaked}"
+
+
+@pytest.fixture()
+def batch_cli_proc() -> Iterator[PopenSpawn]:
+    """
+    中文: 以 `--batch` 模式经 stdin/stdout 管道（无 PTY）启动 CLI，并等待在 `a2c>` 提示符。
+          不经过 prompt_toolkit 渲染，输出不含 ANSI 控制序列；适用于只需发命令、读文本的测试。交互特性测试请用 `cli_proc`。
+    English: Start the CLI in `--batch` mode over stdin/stdout pipes (no PTY) and wait at the `a2c>` prompt.
+        prompt_toolkit rendering is bypassed, so output carries no ANSI sequences; for tests that only send commands
+        and read text. Use `cli_proc` to exercise interactive features.
+    """
+    child = PopenSpawn(_cli_args("--batch"), env=_cli_env(), cwd=_PROJECT_ROOT, encoding="utf-8", timeout=60)
+    try:
+        child.expect(PROMPT_RE, timeout=20)
+        expect_prompt_stable(child, max_wait=12.0)
+        yield child
+    finally:
+        if child.proc.poll() is None:
+            try:
+                child.sendline("exit")
+                child.proc.wait(timeout=5)
+            except Exception:
+                child.proc.kill()
+                child.proc.wait()
+
+
+@pytest_asyncio.fixture
+async def async_cli_proc() -> AsyncIterator[AsyncCli]:
+    """
+    中文: 提供一个经 asyncio 管道驱动、已就绪在 `a2c>` 提示符的 CLI 进程（`--batch` 模式）；多个实例可在同一事件循环中并发运行。
+    English: Provide a CLI process (`--batch` mode) driven over asyncio pipes and ready at the `a2c>` prompt; several
+        instances can run concurrently on one event loop.
+    """
+    cli = await AsyncCli.start(_cli_args("--batch"), env=_cli_env(), cwd=_PROJECT_ROOT)
+    try:
+        await cli.expect(PROMPT_RE, timeout=20.0)
+        await cli.barrier(timeout=12.0)
+        yield cli
+    finally:
+        await cli.close()
+
+
+@pytest.fixture(scope="module")
+def shared_mcp_server() -> Iterator[str]:
+    """
+    中文: 在模块内共享一个以 streamable-http 方式运行的 direct_execution MCP Server 进程，返回其 URL。
+          监听套接字由本进程绑定端口 0 并 listen 后通过 fd 交给子进程：端口在子进程启动前就已确定且不会被抢占，
+          子进程就绪前到达的连接会在 backlog 中排队，因此无需轮询等待端口。
+    English: Share one direct_execution MCP server running over streamable-http per module and return its URL.
+             The listening socket is bound to port 0 and put into listen state here, then handed to the child by fd:
+             the port is fixed before the child starts and cannot be taken, and connections that arrive before the
+             child is ready queue in the backlog, so there is no need to poll the port.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        sock.listen(128)
+        port = sock.getsockname()[1]
+        proc = subprocess.Popen(
+            [
+                sys.executable,
+                "tests/integration_tests/computer/mcp_servers/direct_execution.py",
+                "--fd",
+                str(sock.fileno()),
+            ],
+            cwd=_PROJECT_ROOT,
+            pass_fds=(sock.fileno(),),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    try:
+        yield f"http://127.0.0.1:{port}/mcp"
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=3)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait(timeout=1)
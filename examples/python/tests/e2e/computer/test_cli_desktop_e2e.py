@@ -18,7 +18,7 @@ from typing import Any
 
 import pytest
 
-from tests.e2e.computer.utils import expect_prompt_stable, strip_ansi
+from tests.e2e.computer.utils import expect_prompt_stable
 
 pexpect = pytest.importorskip("pexpect", reason="e2e tests require pexpect; install with `pip install pexpect`.")
 
@@ -67,19 +67,18 @@ def test_desktop_order_respects_recent_tool_calls(cli_proc: pexpect.spawn, tmp_p
     )
 
     child.sendline(f"server add {json.dumps(cfg_a, ensure_ascii=False)}")
-    expect_prompt_stable(child, quiet=0.5, max_wait=15.0)
+    expect_prompt_stable(child, max_wait=15.0)
     child.sendline(f"server add {json.dumps(cfg_b, ensure_ascii=False)}")
-    expect_prompt_stable(child, quiet=0.5, max_wait=15.0)
+    expect_prompt_stable(child, max_wait=15.0)
 
     # 显式启动
     child.sendline("start all")
-    expect_prompt_stable(child, quiet=0.8, max_wait=20.0)
+    expect_prompt_stable(child, max_wait=20.0)
 
     # 等待 desktop 输出包含两侧窗口（A 与 B），避免后续顺序断言受初始化时序影响
     def _read_desktop_list() -> list[str] | None:
         child.sendline("desktop")
-        output0 = expect_prompt_stable(child, quiet=0.8, max_wait=20.0)
-        out0 = strip_ansi(output0)
+        out0 = expect_prompt_stable(child, max_wait=20.0)
         end0 = out0.rfind("]")
         if end0 == -1:
             return None
@@ -127,7 +126,7 @@ def test_desktop_order_respects_recent_tool_calls(cli_proc: pexpect.spawn, tmp_p
     tf = tmp_path / "toolcall_mark_b.json"
     tf.write_text(json.dumps(tool_req, ensure_ascii=False), encoding="utf-8")
     child.sendline(f"tc @{tf}")
-    expect_prompt_stable(child, quiet=0.6, max_wait=12.0)
+    expect_prompt_stable(child, max_wait=12.0)
 
     # 3) 执行 desktop 并解析输出 JSON
     # 再次获取 desktop 列表用于顺序断言
@@ -161,7 +160,7 @@ def test_desktop_order_respects_recent_tool_calls(cli_proc: pexpect.spawn, tmp_p
     tf_a = tmp_path / "toolcall_mark_a.json"
     tf_a.write_text(json.dumps(tool_req_a, ensure_ascii=False), encoding="utf-8")
     child.sendline(f"tc @{tf_a}")
-    expect_prompt_stable(child, quiet=0.6, max_wait=12.0)
+    expect_prompt_stable(child, max_wait=12.0)
 
     desktop_list = _read_desktop_list() or []
     assert any("example.desktop.subscribe.b" in u for u in desktop_list), f"no B windows after A: {desktop_list}"
@@ -186,7 +185,7 @@ def test_desktop_order_respects_recent_tool_calls(cli_proc: pexpect.spawn, tmp_p
     tf_b2 = tmp_path / "toolcall_mark_b_2.json"
     tf_b2.write_text(json.dumps(tool_req_b2, ensure_ascii=False), encoding="utf-8")
     child.sendline(f"tc @{tf_b2}")
-    expect_prompt_stable(child, quiet=0.6, max_wait=12.0)
+    expect_prompt_stable(child, max_wait=12.0)
 
     desktop_list = _read_desktop_list() or []
     assert any("example.desktop.subscribe.b" in u for u in desktop_list), f"no B windows after B2: {desktop_list}"
@@ -23,7 +23,7 @@ from pathlib import Path
 
 import pytest
 
-from tests.e2e.computer.utils import expect_prompt_stable, strip_ansi
+from tests.e2e.computer.utils import expect_prompt_stable
 
 pexpect = pytest.importorskip("pexpect", reason="e2e tests require pexpect; install with `pip install pexpect`.")
 
@@ -59,14 +59,14 @@ def test_history_after_tc(cli_proc: pexpect.spawn, tmp_path: Path) -> None:
 
     # 2) add + start
     child.sendline(f"server add @{cfg_path}")
-    expect_prompt_stable(child, quiet=0.6, max_wait=15.0)
+    expect_prompt_stable(child, max_wait=15.0)
     child.sendline("start e2e-hist")
-    expect_prompt_stable(child, quiet=0.6, max_wait=15.0)
+    expect_prompt_stable(child, max_wait=15.0)
 
     # 3) tools 确认一下 hello 可用
     child.sendline("tools")
-    tools_out = expect_prompt_stable(child, quiet=0.6, max_wait=12.0)
-    assert "hello" in strip_ansi(tools_out)
+    tools_out = expect_prompt_stable(child, max_wait=12.0)
+    assert "hello" in tools_out
 
     # 4) 通过 tc 触发一次调用（固定 req_id 以便断言）
     req_id = "req-e2e-history-1"
@@ -79,10 +79,9 @@ def test_history_after_tc(cli_proc: pexpect.spawn, tmp_path: Path) -> None:
         "timeout": 10,
     }
     child.sendline(f"tc {json.dumps(tc_payload, ensure_ascii=False)}")
-    expect_prompt_stable(child, quiet=0.8, max_wait=20.0)
+    expect_prompt_stable(child, max_wait=20.0)
 
     # 5) 读取 history 并断言包含 req_id
     child.sendline("history")
-    hist_out = expect_prompt_stable(child, quiet=0.6, max_wait=12.0)
-    hist_out = strip_ansi(hist_out)
+    hist_out = expect_prompt_stable(child, max_wait=12.0)
     assert req_id in hist_out, f"history does not contain req_id {req_id}. Output:\n{hist_out}"
@@ -39,13 +39,13 @@ def test_inputs_resolve_then_server_start(cli_proc: pexpect.spawn) -> None:
 
     # 1) 加载 inputs 定义 / load inputs definitions
     child.sendline("inputs load @tests/e2e/computer/configs/inputs_basic.json")
-    expect_prompt_stable(child, quiet=0.3, max_wait=10.0)
+    expect_prompt_stable(child, max_wait=10.0)
 
     # 2) 添加引用 ${input:SCRIPT} 的 server / add server that references ${input:SCRIPT}
     child.sendline("server add @tests/e2e/computer/configs/server_using_input.json")
     # 输入一个回车，表示使用默认值
     child.sendline("\n")
-    expect_prompt_stable(child, quiet=0.3, max_wait=10.0)
+    expect_prompt_stable(child, max_wait=10.0)
 
     # 3) 启动所有服务 / start all servers
     child.sendline("start all")
@@ -53,7 +53,7 @@ def test_inputs_resolve_then_server_start(cli_proc: pexpect.spawn) -> None:
     time.sleep(1.0)
     # 中文: 等待“稳定提示符”，保证启动完成且提示符后无残留日志 / wait for stable prompt to ensure no trailing logs
     # English: Wait for a stable prompt so there are no trailing logs after the prompt
-    expect_prompt_stable(child, quiet=0.5, max_wait=15.0)
+    expect_prompt_stable(child, max_wait=15.0)
 
     # 4) 轮询校验 status/tools / poll for status/tools
     def _assert_contains(cmd: str, needle: str, retries: int = 1, delay: float = 1.0) -> None:
@@ -68,7 +68,7 @@ def test_inputs_resolve_then_server_start(cli_proc: pexpect.spawn) -> None:
             child.sendline(cmd)
             # 给渲染/注册留一点时间 / allow a short time for render/registration
             time.sleep(delay)
-            out = expect_prompt_stable(child, quiet=0.5, max_wait=15.0)
+            out = expect_prompt_stable(child, max_wait=15.0)
             print(out)
             if needle in out:
                 return
@@ -36,7 +36,7 @@ def test_enter_does_nothing(cli_proc: pexpect.spawn) -> None:
 
     # 发送空回车并等待稳定提示符 / send empty Enter then wait for stable prompt
     child.sendline("")
-    output = expect_prompt_stable(child, quiet=0.3, max_wait=10.0)
+    output = expect_prompt_stable(child, max_wait=10.0)
 
     # 不应出现帮助标题 / should not contain help title
     assert "可用命令 / Commands" not in output
@@ -12,7 +12,6 @@
 from __future__ import annotations
 
 import os
-import re
 import shutil
 import signal
 import sys
@@ -21,21 +20,18 @@ from contextlib import contextmanager
 
 import pytest
 
-from tests.e2e.computer.utils import strip_ansi
+from tests.e2e.computer.utils import PROMPT_RE, output_contains, strip_ansi
 
 pexpect = pytest.importorskip("pexpect", reason="e2e tests require pexpect; install with `pip install pexpect`.")
 
 
-# ANSI-aware prompt matching and helper to strip ANSI sequences
-# 与 conftest/test_cli_interactive 保持一致，确保在包含控制序列/光标移动的终端下也能稳定匹配提示符
-ANSI = r"(?:\x1b\[[0-?]*[ -/]*[@-~])*"
-PROMPT_RE = re.compile(ANSI + r"a2c>" + ANSI)
-
-
 @contextmanager
 def _spawn_cli_with_args(*extra_args: str):
     env = os.environ.copy()
     env.setdefault("PYTHONUNBUFFERED", "1")
+    # 不写 .pyc 以加快启动；固定哈希种子使输出顺序稳定 / Skip .pyc writes for faster startup; fixed hash seed for stable output
+    env.setdefault("PYTHONDONTWRITEBYTECODE", "1")
+    env.setdefault("PYTHONHASHSEED", "0")
     env.setdefault("PROMPT_TOOLKIT_NO_CPR", "1")
     env.setdefault("PROMPT_TOOLKIT_DISABLE_BRACKETED_PASTE", "1")
     env.setdefault("TERM", "dumb")
@@ -55,11 +51,16 @@ def _spawn_cli_with_args(*extra_args: str):
     # 默认将工作目录设置为项目根目录（本文件位于 tests/e2e/conftest.py，向上两级即为项目根）
     # By default, set cwd to project root (this file lives at tests/e2e/conftest.py; go up two levels)
     project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
-    child = pexpect.spawn(args[0], args[1:], env=env, encoding="utf-8", timeout=25, cwd=project_root)
+    child = pexpect.spawn(args[0], args[1:], env=env, encoding="utf-8", timeout=25, cwd=project_root, maxread=65536)
+    child.delayafterread = None
     try:
         child.setwinsize(24, 120)
     except Exception:
         pass
+    try:
+        child.setecho(False)
+    except Exception:
+        pass
     try:
         yield child
     finally:
@@ -84,8 +85,7 @@ def _assert_tools(child: pexpect.spawn, name: str, retries: int = 10, delay: flo
     for _ in range(retries):
         child.sendline("tools")
         _wait_prompt(child)
-        out = strip_ansi((child.before or "").strip())
-        if name in out:
+        if output_contains(child.before or "", name):
             return
         time.sleep(delay)
     child.sendline("tools")
@@ -98,8 +98,7 @@ def _assert_status(child: pexpect.spawn, server: str, retries: int = 8, delay: f
     for _ in range(retries):
         child.sendline("status")
         _wait_prompt(child)
-        out = strip_ansi((child.before or "").strip())
-        if server in out:
+        if output_contains(child.before or "", server):
             return
         time.sleep(delay)
     child.sendline("status")
@@ -118,20 +117,10 @@ def test_run_with_config_param_loads_server() -> None:
     """
     cfg_arg = "--config=@tests/e2e/computer/configs/server_direct_execution.json"
     with _spawn_cli_with_args(cfg_arg) as child:
-        # 等横幅/提示符
-        try:
-            child.expect("Enter interactive mode, type 'help' for commands")
-        except Exception:
-            pass
-        # 可能需要轻推以出现提示符
-        for _ in range(5):
-            try:
-                _wait_prompt(child, timeout=5)
-                break
-            except pexpect.TIMEOUT:
-                child.sendline("")
-        else:
-            _wait_prompt(child, timeout=10)
+        # 等横幅（至多一次，不抛超时），再直接等待字面提示符；无需发送空行轻推
+        # Wait for the banner once (no raise on timeout), then the literal prompt; no empty-line nudging
+        child.expect(["Enter interactive mode, type 'help' for commands", pexpect.TIMEOUT], timeout=5)
+        child.expect_exact("a2c>", timeout=15)
 
         # 若 auto-connect 未马上激活，补打一遍 start all
         child.sendline("start all")
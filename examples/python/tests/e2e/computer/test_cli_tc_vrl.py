@@ -9,11 +9,17 @@
   - 端到端验证交互式 CLI 的 `tc` 命令配合 VRL 转换功能。
   - 通过配置 VRL 脚本，验证工具返回值被正确转换并存储在元数据中。
   - 验证 VRL 转换结果以 JSON 格式存储在 `a2c_vrl_transformed` 字段中。
+  - 各测试共享同一个 CLI 进程（shared_cli_proc），测试结束后自动移除其添加的 server。
+  - 各测试互不依赖，可用 `pytest -n <N>` 并行；xdist 的每个 worker 拥有各自的 CLI 进程。
+  - server 配置文件由会话级 fixture（vrl_cfg_paths）一次性写出。
 
 English:
   - E2E test for interactive CLI `tc` command with VRL transformation.
   - Verify tool return values are correctly transformed via VRL script.
   - Verify VRL transformation results are stored in `a2c_vrl_transformed` metadata field as JSON.
+  - Tests share one CLI process (shared_cli_proc); servers they add are removed after each test.
+  - Tests are independent and can run in parallel with `pytest -n <N>`; each xdist worker owns its own CLI process.
+  - Server config files are written once by a session fixture (vrl_cfg_paths).
 
 测试要点与断言:
   1) 配置 MCP Server 时带上 VRL 脚本
@@ -25,168 +31,138 @@ English:
 
 from __future__ import annotations
 
-import json
-import sys
 from pathlib import Path
 
 import pytest
 
-from tests.e2e.computer.utils import expect_prompt_stable, strip_ansi
+from tests.e2e.computer.utils import dumps_json, expect_prompt_stable, write_server_cfg
 
 pexpect = pytest.importorskip("pexpect", reason="e2e tests require pexpect; install with `pip install pexpect`.")
 
+# 中文: tc 命令模板，外层结构固定，仅替换各测试不同的字段；`params` 需传入已序列化的 JSON 文本
+# English: tc command template with a fixed outer shell, filling only per-test fields; `params` takes serialized JSON
+_TC_TMPL = (
+    'tc {{"agent": "{agent}", "req_id": "{req_id}", "computer": "ignored", "tool_name": "{tool_name}", '
+    '"params": {params}, "timeout": 10}}'
+)
+
+_DIRECT_EXECUTION = "tests/integration_tests/computer/mcp_servers/direct_execution.py"
+_RESOURCES_SUBSCRIBE = "tests/integration_tests/computer/mcp_servers/resources_subscribe_stdio_server.py"
+
+# 中文: 各测试使用的 server 配置：名称 -> (脚本, VRL 脚本, 开启 auto_apply 的工具)
+# English: Server configs used by the tests: name -> (script, VRL script, tool with auto_apply enabled)
+_VRL_SERVERS: dict[str, tuple[str, str, str]] = {
+    # 新增字段 transformed_by_vrl = true / Add a new field transformed_by_vrl = true
+    "e2e-tc-vrl-basic": (_DIRECT_EXECUTION, '.transformed_by_vrl = true\n.vrl_test_field = "e2e_test"', "hello"),
+    # 提取工具返回的文本内容并重新组织结构 / Extract text content and reorganize structure
+    "e2e-tc-vrl-mapping": (
+        _RESOURCES_SUBSCRIBE,
+        """
+.status = "success"
+.original_content = .content[0].text
+.metadata = {
+    "processed": true,
+    "processor": "vrl-e2e-test"
+}
+""",
+        "mark_a",
+    ),
+    # 无效的 VRL 脚本（语法错误）/ Invalid VRL script (syntax error)
+    "e2e-tc-vrl-invalid": (_DIRECT_EXECUTION, ".invalid syntax here @@@ this will fail", "hello"),
+    "e2e-tc-vrl-preserve": (_DIRECT_EXECUTION, '.vrl_marker = "transformed"\n.extra_field = 42', "hello"),
+}
+
+
+@pytest.fixture(scope="session")
+def vrl_cfg_paths(tmp_path_factory: pytest.TempPathFactory) -> dict[str, Path]:
+    """
+    中文: 会话开始时一次性写出全部 VRL server 配置文件，返回 名称 -> 路径；各测试直接取用，不再逐个测试写盘。
+    English: Write every VRL server config once at session start and return name -> path; tests pick theirs instead of
+             writing files per test.
+    """
+    cfg_dir = tmp_path_factory.mktemp("vrl_cfg")
+    return {
+        name: write_server_cfg(cfg_dir, name=name, script=script, vrl=vrl, auto_apply_tool=tool)
+        for name, (script, vrl, tool) in _VRL_SERVERS.items()
+    }
+
 
 @pytest.mark.e2e
-def test_tc_with_vrl_transformation_basic(cli_proc: pexpect.spawn, tmp_path: Path) -> None:
+def test_tc_with_vrl_transformation_basic(shared_cli_proc: pexpect.spawn, vrl_cfg_paths: dict[str, Path]) -> None:
     """
     中文: 验证配置 VRL 脚本后，tc 调用工具返回的元数据中包含 VRL 转换结果。
     English: Verify tc tool call returns VRL transformation result in metadata when VRL is configured.
     """
-    child = cli_proc
-
-    # 1) 配置 VRL 脚本：添加一个新字段 transformed_by_vrl = true
-    # Configure VRL script: add a new field transformed_by_vrl = true
-    vrl_script = '.transformed_by_vrl = true\n.vrl_test_field = "e2e_test"'
-
-    # 2) 写入 server 配置文件，包含 VRL 脚本
-    # Write server config file with VRL script
-    server_cfg = {
-        "name": "e2e-tc-vrl-basic",
-        "type": "stdio",
-        "disabled": False,
-        "forbidden_tools": [],
-        "tool_meta": {"hello": {"auto_apply": True}},
-        "vrl": vrl_script,  # 添加 VRL 配置 / Add VRL config
-        "server_parameters": {
-            "command": sys.executable,
-            "args": [
-                "tests/integration_tests/computer/mcp_servers/direct_execution.py",
-            ],
-            "env": None,
-            "cwd": None,
-            "encoding": "utf-8",
-            "encoding_error_handler": "strict",
-        },
-    }
-    cfg_path = tmp_path / "server_e2e_tc_vrl_basic.json"
-    cfg_path.write_text(json.dumps(server_cfg, ensure_ascii=False), encoding="utf-8")
+    child = shared_cli_proc
 
-    # 3) 添加配置并启动
-    # Add config and start server
-    child.sendline(f"server add @{cfg_path}")
-    expect_prompt_stable(child, quiet=0.6, max_wait=15.0)
-    child.sendline("start e2e-tc-vrl-basic")
-    expect_prompt_stable(child, quiet=0.6, max_wait=15.0)
+    # 1-2) 取会话级预先写好的配置文件（VRL：添加 transformed_by_vrl = true）
+    # Use the session-level config file (VRL: add transformed_by_vrl = true)
+    cfg_path = vrl_cfg_paths["e2e-tc-vrl-basic"]
 
-    # 4) 确认工具已可见
-    # Verify tool is visible
-    child.sendline("tools")
-    tools_out = expect_prompt_stable(child, quiet=0.6, max_wait=12.0)
-    assert "hello" in strip_ansi(tools_out)
+    # 3) 添加配置：CLI 默认 auto_connect，server add 返回前已启动客户端，无需再 start；工具是否可见由下方 tc 结果体现
+    # Add config: the CLI auto-connects by default, so server add has started the client and no start is needed;
+    # tool visibility is covered by the tc result below
+    child.sendline(f"server add @{cfg_path}")
+    expect_prompt_stable(child, max_wait=30.0)
 
-    # 5) 构造 tc 负载并调用
+    # 4) 构造 tc 负载并调用
     # Construct tc payload and call
-    tc_payload = {
-        "agent": "bot-e2e-vrl",
-        "req_id": "req-e2e-vrl-hello",
-        "computer": "ignored",
-        "tool_name": "hello",
-        "params": {"name": "VRL-Test"},
-        "timeout": 10,
-    }
-
-    child.sendline(f"tc {json.dumps(tc_payload, ensure_ascii=False)}")
-    out = expect_prompt_stable(child, quiet=0.8, max_wait=20.0)
-    out = strip_ansi(out)
+    tc_cmd = _TC_TMPL.format(
+        agent="bot-e2e-vrl",
+        req_id="req-e2e-vrl-hello",
+        tool_name="hello",
+        params=dumps_json({"name": "VRL-Test"}),
+    )
+    child.sendline(tc_cmd)
+    out = expect_prompt_stable(child, max_wait=20.0)
 
-    # 6) 断言包含工具调用结果
+    # 5) 断言包含工具调用结果
     # Assert tool call result is present
     assert "Hello, VRL-Test!" in out, f"unexpected tc output:\n{out}"
 
-    # 7) 断言包含 VRL 转换标识
+    # 6) 断言包含 VRL 转换标识
     # Assert VRL transformation marker is present
     assert "a2c_vrl_transformed" in out, f"VRL transformation marker not found in output:\n{out}"
 
-    # 8) 验证 VRL 转换后的字段存在
+    # 7) 验证 VRL 转换后的字段存在
     # Verify VRL transformed fields exist
     assert "transformed_by_vrl" in out or "vrl_test_field" in out, f"VRL transformed fields not found in output:\n{out}"
 
 
 @pytest.mark.e2e
-def test_tc_with_vrl_field_mapping(cli_proc: pexpect.spawn, tmp_path: Path) -> None:
+def test_tc_with_vrl_field_mapping(shared_cli_proc: pexpect.spawn, vrl_cfg_paths: dict[str, Path]) -> None:
     """
     中文: 验证 VRL 可以对工具返回值进行字段映射和数据转换。
     English: Verify VRL can perform field mapping and data transformation on tool return values.
     """
-    child = cli_proc
+    child = shared_cli_proc
 
-    # 1) 配置 VRL 脚本：提取工具返回的文本内容，并重新组织结构
-    # Configure VRL script: extract text content and reorganize structure
-    vrl_script = """
-.status = "success"
-.original_content = .content[0].text
-.metadata = {
-    "processed": true,
-    "processor": "vrl-e2e-test"
-}
-"""
-
-    # 2) 写入 server 配置文件
-    # Write server config file
-    server_cfg = {
-        "name": "e2e-tc-vrl-mapping",
-        "type": "stdio",
-        "disabled": False,
-        "forbidden_tools": [],
-        "tool_meta": {"mark_a": {"auto_apply": True}},
-        "vrl": vrl_script,
-        "server_parameters": {
-            "command": sys.executable,
-            "args": [
-                "tests/integration_tests/computer/mcp_servers/resources_subscribe_stdio_server.py",
-            ],
-            "env": None,
-            "cwd": None,
-            "encoding": "utf-8",
-            "encoding_error_handler": "strict",
-        },
-    }
-    cfg_path = tmp_path / "server_e2e_tc_vrl_mapping.json"
-    cfg_path.write_text(json.dumps(server_cfg, ensure_ascii=False), encoding="utf-8")
+    # 1-2) 取会话级预先写好的配置文件（VRL：提取文本内容并重新组织结构）
+    # Use the session-level config file (VRL: extract text content and reorganize structure)
+    cfg_path = vrl_cfg_paths["e2e-tc-vrl-mapping"]
 
-    # 3) 添加配置并启动
-    # Add config and start server
+    # 3) 添加配置：CLI 默认 auto_connect，server add 返回前已启动客户端，无需再 start；工具是否可见由下方 tc 结果体现
+    # Add config: the CLI auto-connects by default, so server add has started the client and no start is needed;
+    # tool visibility is covered by the tc result below
     child.sendline(f"server add @{cfg_path}")
-    expect_prompt_stable(child, quiet=0.6, max_wait=15.0)
-    child.sendline("start e2e-tc-vrl-mapping")
-    expect_prompt_stable(child, quiet=0.6, max_wait=15.0)
+    expect_prompt_stable(child, max_wait=30.0)
 
-    # 4) 确认工具已可见
-    # Verify tool is visible
-    child.sendline("tools")
-    tools_out = expect_prompt_stable(child, quiet=0.6, max_wait=12.0)
-    assert "mark_a" in strip_ansi(tools_out)
-
-    # 5) 构造 tc 负载并调用
+    # 4) 构造 tc 负载并调用
     # Construct tc payload and call
-    tc_payload = {
-        "agent": "bot-e2e-vrl-map",
-        "req_id": "req-e2e-vrl-map",
-        "computer": "ignored",
-        "tool_name": "mark_a",
-        "params": {},
-        "timeout": 10,
-    }
-
-    child.sendline(f"tc {json.dumps(tc_payload, ensure_ascii=False)}")
-    out = expect_prompt_stable(child, quiet=0.8, max_wait=20.0)
-    out = strip_ansi(out)
+    tc_cmd = _TC_TMPL.format(
+        agent="bot-e2e-vrl-map",
+        req_id="req-e2e-vrl-map",
+        tool_name="mark_a",
+        params=dumps_json({}),
+    )
+    child.sendline(tc_cmd)
+    out = expect_prompt_stable(child, max_wait=20.0)
 
-    # 6) 断言包含工具调用结果
+    # 5) 断言包含工具调用结果
     # Assert tool call result is present
     assert "ok:mark_a" in out, f"unexpected tc output:\n{out}"
 
-    # 7) 断言包含 VRL 转换标识和转换后的字段
+    # 6) 断言包含 VRL 转换标识和转换后的字段
     # Assert VRL transformation marker and transformed fields are present
     assert "a2c_vrl_transformed" in out, f"VRL transformation marker not found in output:\n{out}"
     # VRL转换结果在meta中是JSON字符串，可能被转义，所以检查转义后的形式
@@ -198,45 +174,21 @@ def test_tc_with_vrl_field_mapping(cli_proc: pexpect.spawn, tmp_path: Path) -> N
 
 
 @pytest.mark.e2e
-def test_tc_with_invalid_vrl_syntax_rejected(cli_proc: pexpect.spawn, tmp_path: Path) -> None:
+def test_tc_with_invalid_vrl_syntax_rejected(shared_cli_proc: pexpect.spawn, vrl_cfg_paths: dict[str, Path]) -> None:
     """
     中文: 验证配置了无效 VRL 语法的服务器会在添加时被拒绝。
     English: Verify server with invalid VRL syntax is rejected during configuration.
     """
-    child = cli_proc
-
-    # 1) 配置无效的 VRL 脚本（语法错误）
-    # Configure invalid VRL script (syntax error)
-    invalid_vrl_script = ".invalid syntax here @@@ this will fail"
-
-    # 2) 写入 server 配置文件
-    # Write server config file
-    server_cfg = {
-        "name": "e2e-tc-vrl-invalid",
-        "type": "stdio",
-        "disabled": False,
-        "forbidden_tools": [],
-        "tool_meta": {"hello": {"auto_apply": True}},
-        "vrl": invalid_vrl_script,  # 无效的 VRL 脚本 / Invalid VRL script
-        "server_parameters": {
-            "command": sys.executable,
-            "args": [
-                "tests/integration_tests/computer/mcp_servers/direct_execution.py",
-            ],
-            "env": None,
-            "cwd": None,
-            "encoding": "utf-8",
-            "encoding_error_handler": "strict",
-        },
-    }
-    cfg_path = tmp_path / "server_e2e_tc_vrl_invalid.json"
-    cfg_path.write_text(json.dumps(server_cfg, ensure_ascii=False), encoding="utf-8")
+    child = shared_cli_proc
+
+    # 1-2) 取会话级预先写好的配置文件（VRL 语法错误）
+    # Use the session-level config file (VRL with a syntax error)
+    cfg_path = vrl_cfg_paths["e2e-tc-vrl-invalid"]
 
     # 3) 尝试添加配置，应该失败
     # Try to add config, should fail
     child.sendline(f"server add @{cfg_path}")
-    out = expect_prompt_stable(child, quiet=0.6, max_wait=15.0)
-    out = strip_ansi(out)
+    out = expect_prompt_stable(child, max_wait=15.0)
 
     # 4) 断言包含错误信息
     # Assert error message is present
@@ -246,62 +198,33 @@ def test_tc_with_invalid_vrl_syntax_rejected(cli_proc: pexpect.spawn, tmp_path:
 
 
 @pytest.mark.e2e
-def test_tc_vrl_transformation_preserves_original_content(cli_proc: pexpect.spawn, tmp_path: Path) -> None:
+def test_tc_vrl_transformation_preserves_original_content(
+    shared_cli_proc: pexpect.spawn, vrl_cfg_paths: dict[str, Path]
+) -> None:
     """
     中文: 验证 VRL 转换不影响原始工具返回内容，转换结果仅存储在元数据中。
     English: Verify VRL transformation doesn't affect original tool return content,
               transformation result is only stored in metadata.
     """
-    child = cli_proc
-
-    # 1) 配置 VRL 脚本
-    # Configure VRL script
-    vrl_script = '.vrl_marker = "transformed"\n.extra_field = 42'
-
-    # 2) 写入 server 配置文件
-    # Write server config file
-    server_cfg = {
-        "name": "e2e-tc-vrl-preserve",
-        "type": "stdio",
-        "disabled": False,
-        "forbidden_tools": [],
-        "tool_meta": {"hello": {"auto_apply": True}},
-        "vrl": vrl_script,
-        "server_parameters": {
-            "command": sys.executable,
-            "args": [
-                "tests/integration_tests/computer/mcp_servers/direct_execution.py",
-            ],
-            "env": None,
-            "cwd": None,
-            "encoding": "utf-8",
-            "encoding_error_handler": "strict",
-        },
-    }
-    cfg_path = tmp_path / "server_e2e_tc_vrl_preserve.json"
-    cfg_path.write_text(json.dumps(server_cfg, ensure_ascii=False), encoding="utf-8")
+    child = shared_cli_proc
+
+    # 1-2) 取会话级预先写好的配置文件 / Use the session-level config file
+    cfg_path = vrl_cfg_paths["e2e-tc-vrl-preserve"]
 
-    # 3) 添加配置并启动
-    # Add config and start server
+    # 3) 添加配置（auto_connect 下即已启动）/ Add config (already started under auto_connect)
     child.sendline(f"server add @{cfg_path}")
-    expect_prompt_stable(child, quiet=0.6, max_wait=15.0)
-    child.sendline("start e2e-tc-vrl-preserve")
-    expect_prompt_stable(child, quiet=0.6, max_wait=15.0)
+    expect_prompt_stable(child, max_wait=30.0)
 
     # 4) 构造 tc 负载并调用
     # Construct tc payload and call
-    tc_payload = {
-        "agent": "bot-e2e-vrl-preserve",
-        "req_id": "req-e2e-vrl-preserve",
-        "computer": "ignored",
-        "tool_name": "hello",
-        "params": {"name": "Preserve-Test"},
-        "timeout": 10,
-    }
-
-    child.sendline(f"tc {json.dumps(tc_payload, ensure_ascii=False)}")
-    out = expect_prompt_stable(child, quiet=0.8, max_wait=20.0)
-    out = strip_ansi(out)
+    tc_cmd = _TC_TMPL.format(
+        agent="bot-e2e-vrl-preserve",
+        req_id="req-e2e-vrl-preserve",
+        tool_name="hello",
+        params=dumps_json({"name": "Preserve-Test"}),
+    )
+    child.sendline(tc_cmd)
+    out = expect_prompt_stable(child, max_wait=20.0)
 
     # 5) 断言原始内容仍然存在
     # Assert original content is still present
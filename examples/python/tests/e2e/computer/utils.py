@@ -6,57 +6,141 @@
 # @Software: PyCharm
 from __future__ import annotations
 
+import json
 import re
-import time
+import sys
+import uuid
+from pathlib import Path
+from typing import Any
 
 import pexpect
 
+# 中文: 优先使用 orjson 序列化测试负载（输出即 UTF-8 字节，不转义非 ASCII）；未安装时回退到标准库 json，
+#       回退路径使用紧凑分隔符且不转义非 ASCII，两条路径写出相同的字节
+# English: Prefer orjson for test payloads (UTF-8 bytes, non-ASCII kept as-is); fall back to stdlib json when absent.
+#          The fallback uses compact separators and keeps non-ASCII, so both paths write the same bytes
+try:
+    import orjson
+
+    def dumps_bytes(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+except ImportError:
+
+    def dumps_bytes(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_json(obj: Any) -> str:
+    """
+    中文: 将对象序列化为单行 JSON 文本，用于拼接 CLI 命令（如 `tc {json}`）。
+    English: Serialize an object to single-line JSON text for CLI commands such as `tc {json}`.
+    """
+    return dumps_bytes(obj).decode("utf-8")
+
+
 # 中文: ANSI 控制序列匹配与去除工具，避免 prompt_toolkit 的控制序列影响断言
 # English: ANSI control-sequence helpers to avoid prompt_toolkit artifacts breaking assertions
 
 
 ANSI = r"(?:\x1b\[[0-?]*[ -/]*[@-~])*"
-PROMPT_RE = re.compile(ANSI + r"a2c>" + ANSI)
+# 提示符前的控制序列计入匹配；其后的控制序列留给下一段输出，由 strip_ansi 处理，避免两侧都挂无界星号
+# Escapes before the prompt join the match; trailing ones fall into the next output and are stripped there,
+# so only one unbounded star surrounds the literal
+PROMPT_RE = re.compile(ANSI + r"a2c>")
+# 仅匹配单个控制序列：外层不带 `*`，不会在每个字符位置产生空匹配 / One escape only: no outer `*`, so no empty match at every position
+_ANSI_ONE = re.compile(r"\x1b\[[0-?]*[ -/]*[@-~]")
 
 
 def strip_ansi(s: str) -> str:
-    return re.sub(ANSI, "", s)
-
-
-def expect_prompt_stable(child: pexpect.spawn, *, quiet: float = 0.3, max_wait: float = 10.0) -> str | None:
-    """
-    中文: 等待直到捕获到“最后一个稳定的 a2c> 提示符”，即提示符出现后在 quiet 秒内没有任何新增输出。
-          返回：该稳定提示符之前的输出（已去除 ANSI），供断言使用。
-    English: Wait until we catch the "last stable a2c> prompt" – i.e., after the prompt appears, no new output arrives
-             within the quiet window. Returns the output before that stable prompt (ANSI stripped) for assertions.
-    """
-    deadline = time.time() + max_wait
-    last_out: str
-    err: bool = False
-    while True:
-        remaining = max(0.05, deadline - time.time())
-        try:
-            # 等待下一次提示符 / wait for the next prompt
-            child.expect(PROMPT_RE, timeout=remaining)
-        except TimeoutError as e:
-            print(f"timeout: {remaining}. ")
-            err = True
-            raise e
-        finally:
-            last_out = strip_ansi((child.before or "").strip())
-            if err:
-                print(f"output: {last_out}")
-        # 在 quiet 窗口内观察是否还有新输出 / observe if any new output arrives within the quiet window
-        try:
-            # read_nonblocking 会消费数据；若有数据说明提示符后仍有输出，继续等待下一次提示符
-            # read_nonblocking consumes data; if any is received, more output is coming after the prompt – keep waiting
-            chunk = child.read_nonblocking(size=4096, timeout=quiet)
-            if chunk:
-                # 若 quiet 内有输出，则不是稳定提示符，继续下一轮 / not stable yet, continue
-                continue
-        except Exception:  # 包含 pexpect.TIMEOUT
-            # 超时表示 quiet 窗口内没有任何新输出，认为稳定 / timeout => stable prompt
-            return last_out or ""
-        # 若时间已用尽，返回当前捕获 / deadline reached, return current capture
-        if time.time() >= deadline:
-            return last_out or ""
+    return _ANSI_ONE.sub("", s)
+
+
+def output_contains(out: str, needle: str) -> bool:
+    """
+    中文: 先在原始输出中查找 needle，仅在未命中时才去除 ANSI 后再查找，常见路径可省去一次正则扫描。
+    English: Look for needle in the raw output first and only strip ANSI on a miss, saving a regex pass in the common path.
+    """
+    return needle in out or needle in strip_ansi(out)
+
+
+def _echo_barrier(child: pexpect.spawn, timeout: float) -> str:
+    """
+    中文: 发送 `echo <唯一标记>` 并等待 CLI 打印该标记；CLI 串行执行命令，因此标记出现即说明此前命令的输出已全部结束。
+          返回标记之前的原始输出，并消费标记之后的提示符。
+    English: Send `echo <unique marker>` and wait for the CLI to print it; commands run serially, so the marker means all
+             output of earlier commands is complete. Returns the raw output before the marker and consumes the next prompt.
+    """
+    marker = f"__A2C_MARK_{uuid.uuid4().hex}__"
+    child.sendline(f"echo {marker}")
+    # 打印出的标记位于行首，而终端回显的标记前面是 "echo "，据此区分二者
+    # The printed marker starts a line while the echoed input is prefixed by "echo ", which tells them apart
+    child.expect_exact("\n" + marker, timeout=timeout)
+    out = child.before or ""
+    # 消费 echo 之后的提示符，保证后续交互从干净的提示符开始 / consume the prompt after echo for a clean next step
+    child.expect(PROMPT_RE, timeout=timeout)
+    return out
+
+
+def expect_prompt_stable(child: pexpect.spawn, *, max_wait: float = 10.0) -> str:
+    """
+    中文: 通过 echo 标记屏障等待上一条命令的输出全部结束，返回其输出（已去除 ANSI），供断言使用。
+          屏障本身保证输出完整，无需静默等待。返回文本不含打印出的标记，但末尾可能带有 CLI 渲染的 `echo <标记>` 输入行。
+          可先连续发送多条命令再调用一次，屏障会等待其全部输出，返回值为这些输出的合并文本。
+    English: Wait for the previous command's output to complete via an echo-marker barrier and return it (ANSI stripped)
+             for assertions. The barrier itself guarantees complete output with no idle wait. The returned text
+             excludes the printed marker but may end with the CLI's rendering of the `echo <marker>` input line.
+             Several commands may be sent before a single call; the barrier waits for all of them and returns their
+             combined output.
+    """
+    return strip_ansi(_echo_barrier(child, max_wait).strip())
+
+
+def assert_cli_output_contains(child: pexpect.spawn, cmd: str, needle: str, *, marker_timeout: float = 15.0) -> str:
+    """
+    中文: 发送 `cmd` 后经 echo 标记屏障等待其输出结束，断言输出包含 `needle`。返回输出（仅在原始文本未命中时去除 ANSI）。
+    English: Send `cmd`, wait for its output via the echo-marker barrier, and assert it contains `needle`.
+             Returns the output (ANSI stripped only when the raw text misses).
+    """
+    child.sendline(cmd)
+    out = _echo_barrier(child, marker_timeout)
+    if needle in out:
+        return out
+    out = strip_ansi(out)
+    assert needle in out, f"`{cmd}` 未包含 {needle}. 输出:\n{out}"
+    return out
+
+
+def write_server_cfg(
+    tmp_path: Path,
+    *,
+    name: str,
+    script: str,
+    vrl: str | None = None,
+    auto_apply_tool: str | None = None,
+) -> Path:
+    """
+    中文: 写入 stdio server 配置文件并返回路径，供 `server add @file` 使用。`auto_apply_tool` 指定需要开启 auto_apply 的工具名。
+    English: Write a stdio server config file for `server add @file` and return its path. `auto_apply_tool` names the tool
+             that gets auto_apply enabled.
+    """
+    cfg: dict[str, Any] = {
+        "name": name,
+        "type": "stdio",
+        "disabled": False,
+        "forbidden_tools": [],
+        "tool_meta": {auto_apply_tool: {"auto_apply": True}} if auto_apply_tool else {},
+        "server_parameters": {
+            "command": sys.executable,  # 使用当前 Python 解释器 / Use current Python interpreter
+            "args": [script],
+            "env": None,
+            "cwd": None,
+            "encoding": "utf-8",
+            "encoding_error_handler": "strict",
+        },
+    }
+    if vrl is not None:
+        cfg["vrl"] = vrl
+    cfg_path = tmp_path / f"server_{name}.json"
+    cfg_path.write_bytes(dumps_bytes(cfg))
+    return cfg_path
@@ -11,24 +11,23 @@ English: Root-level E2E test fixtures providing infrastructure for Computer-Agen
 
 from __future__ import annotations
 
-import contextlib
+import asyncio
 import json
-import multiprocessing
 import socket
 import sys
 import time
 from collections.abc import Iterator
-from multiprocessing.synchronize import Event
 from pathlib import Path
 from typing import Any
 
 import pytest
+import pytest_asyncio
 import socketio
 from socketio import Namespace, Server, WSGIApp
-from werkzeug.serving import make_server
 
 from a2c_smcp.server import SyncSMCPNamespace
 from a2c_smcp.server.sync_auth import SyncAuthenticationProvider
+from tests.e2e.utils import run_http_server
 
 # ============================================================================
 # 中文: 测试用认证提供者 / English: Test authentication provider
@@ -58,6 +57,8 @@ def create_local_sync_server() -> tuple[Server, Namespace, WSGIApp]:
         async_handlers=True,  # 如果想使用 call 方法，则必定需要将此参数设置为True / Required for call method
         always_connect=True,
     )
+    # 禁用监控任务，避免线程内关闭服务器时后台任务出错 / Disable monitoring task to avoid errors on in-thread shutdown
+    sio.eio.start_service_task = False
     ns = LocalSyncSMCPNamespace()
     sio.register_namespace(ns)
     app = WSGIApp(sio, socketio_path="/socket.io")
@@ -65,85 +66,28 @@ def create_local_sync_server() -> tuple[Server, Namespace, WSGIApp]:
 
 
 # ============================================================================
-# 中文: 多进程服务器启动函数 / English: Multiprocess server startup
+# 中文: 线程内服务器启动函数 / English: In-thread server startup
 # ============================================================================
 
 
-def _run_server_process(port: int, ready_event: Event) -> None:
+@pytest.fixture(scope="session")
+def local_sync_server() -> tuple[Server, Namespace, WSGIApp]:
     """
-    中文: 在独立进程中运行服务器
-    English: Run server in a separate process
+    中文: 每个会话只构建一次同步 Socket.IO Server / 命名空间 / WSGIApp，供本目录及 server/、agent/ 子目录的端点 fixture
+          复用；各测试以互不相同的办公室 ID 隔离。
+    English: Build the sync Socket.IO server, namespace and WSGIApp once per session for the endpoint fixtures here and
+          in the server/ and agent/ subdirectories to reuse; tests are isolated by distinct office IDs.
     """
-    try:
-        sio, ns, wsgi_app = create_local_sync_server()
-        # 禁用监控任务避免关闭时出错 / Disable monitoring task to avoid shutdown errors
-        sio.eio.start_service_task = False
-
-        server = make_server("127.0.0.1", port, wsgi_app, threaded=True)
-
-        # 通知主进程服务器已准备好 / Notify main process that server is ready
-        ready_event.set()
-
-        # 运行服务器 / Run server
-        server.serve_forever()
-    except Exception as e:
-        print(f"服务器进程错误 / Server process error: {e}")
-        ready_event.set()  # 即使出错也要设置事件，避免主进程无限等待 / Set event even on error
-
-
-@contextlib.contextmanager
-def run_http_server() -> Iterator[tuple[str, int]]:
-    """
-    中文: 启动一个基于多进程的同步 Socket.IO Server（真实 HTTP 服务），返回 (host, port)。
-    English: Start a multiprocess sync Socket.IO server over real HTTP, return (host, port).
-    """
-    # 选取随机可用端口 / pick a free port
-    sock = socket.socket()
-    sock.bind(("127.0.0.1", 0))
-    host, port = sock.getsockname()
-    sock.close()
-
-    # 创建进程间通信事件 / Create inter-process communication event
-    ready_event = multiprocessing.Event()
-
-    # 启动服务器进程 / Start server process
-    server_process = multiprocessing.Process(
-        target=_run_server_process,
-        args=(port, ready_event),
-        daemon=True,
-    )
-    server_process.start()
-
-    # 等待服务器准备好 / Wait for server to be ready
-    if not ready_event.wait(timeout=10):
-        server_process.terminate()
-        server_process.join(timeout=2)
-        raise RuntimeError("服务器进程启动超时 / Server process startup timeout")
-
-    # 额外等待确保端口完全可用 / Extra wait to ensure port is fully available
-    time.sleep(0.3)
-
-    try:
-        yield host, port
-    finally:
-        # 终止服务器进程 / Terminate server process
-        if server_process.is_alive():
-            server_process.terminate()
-            server_process.join(timeout=3)
-
-        # 如果进程仍然存活，强制杀死 / Force kill if still alive
-        if server_process.is_alive():
-            server_process.kill()
-            server_process.join(timeout=1)
+    return create_local_sync_server()
 
 
 @pytest.fixture(scope="session")
-def integration_server_endpoint() -> Iterator[str]:
+def integration_server_endpoint(local_sync_server: tuple[Server, Namespace, WSGIApp]) -> Iterator[str]:
     """
     中文: 提供形如 http://127.0.0.1:PORT 的服务端地址，用于集成测试。
     English: Provide server endpoint like http://127.0.0.1:PORT for integration tests.
     """
-    with run_http_server() as (host, port):
+    with run_http_server(local_sync_server[2]) as (host, port):
         yield f"http://{host}:{port}"
 
 
@@ -204,6 +148,22 @@ def mcp_server_config_path(tmp_path: Path) -> Path:
 # ============================================================================
 
 
+@pytest.fixture(scope="session")
+def event_loop_policy() -> asyncio.AbstractEventLoopPolicy:
+    """
+    中文: 覆盖 pytest-asyncio 的事件循环策略：已安装 uvloop 时使用其基于 libuv 的事件循环（Uvicorn 在该循环内服务，
+          每个 Socket.IO 帧都经由它调度）；未安装或平台不支持（如 Windows）时回退到标准 asyncio 策略。
+    English: Override pytest-asyncio's event loop policy: use uvloop's libuv-based loop when installed (Uvicorn serves
+          inside that loop and every Socket.IO frame is dispatched by it); fall back to the stock asyncio policy when
+          uvloop is missing or unsupported (e.g. Windows).
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
+
+
 def create_local_async_server() -> tuple[socketio.AsyncServer, socketio.AsyncNamespace, Any]:
     """
     中文: 创建本地异步 SMCP 服务器，用于测试。
@@ -240,41 +200,53 @@ def create_local_async_server() -> tuple[socketio.AsyncServer, socketio.AsyncNam
     return sio, ns, app
 
 
-@pytest.fixture
-def async_integration_server_port() -> int:
+@pytest.fixture(scope="session")
+def async_integration_server_socket() -> Iterator[socket.socket]:
     """
-    中文: 查找可用端口用于异步集成服务器。
-    English: Find an available TCP port for async integration server.
+    中文: 异步集成服务器使用的预绑定监听套接字，见 bind_listening_socket。
+    English: Pre-bound listening socket for the async integration server; see bind_listening_socket.
     """
-    sock = socket.socket()
-    sock.bind(("127.0.0.1", 0))
-    port = sock.getsockname()[1]
-    sock.close()
-    return port
+    from tests.integration_tests.computer.socketio.mock_uv_server import bind_listening_socket
 
+    sock = bind_listening_socket()
+    try:
+        yield sock
+    finally:
+        sock.close()
 
-@pytest.fixture
-async def async_integration_socketio_server(async_integration_server_port: int):
+
+@pytest.fixture(scope="session")
+def async_integration_server_port(async_integration_server_socket: socket.socket) -> int:
     """
-    中文: 启动基于 SMCPNamespace 的异步集成测试服务器，返回命名空间。
-    English: Start async integration test server based on SMCPNamespace and return the namespace.
+    中文: 异步集成服务器监听的端口。
+    English: Port the async integration server listens on.
     """
-    from tests.integration_tests.computer.socketio.mock_uv_server import UvicornTestServer
+    return async_integration_server_socket.getsockname()[1]
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def async_integration_socketio_server(async_integration_server_socket: socket.socket):
+    """
+    中文: 启动基于 SMCPNamespace 的异步集成测试服务器，返回命名空间。整个会话共享一个 Uvicorn 实例与一个事件循环，
+          各模块的 Computer / Agent 夹具跨测试复用同一连接；使用它的测试与夹具须使用 loop_scope="session"，
+          且各模块须使用互不冲突的 Computer 名称与办公室 ID。
+    English: Start async integration test server based on SMCPNamespace and return the namespace. One Uvicorn instance
+          and one event loop are shared by the whole session, so each module's Computer / Agent fixtures keep one
+          connection across tests; tests and fixtures using it must use loop_scope="session", and modules must use
+          distinct Computer names and office IDs.
+    """
+    from tests.integration_tests.computer.socketio.mock_uv_server import serve_asgi
 
     setup_start = time.time()
     sio, ns, asgi_app = create_local_async_server()
     print(f"[E2E Fixture] Server creation took {time.time() - setup_start:.2f}s")
 
     server_start = time.time()
-    server = UvicornTestServer(asgi_app, port=async_integration_server_port)
-    await server.up()
-    print(f"[E2E Fixture] Server startup took {time.time() - server_start:.2f}s")
-
-    try:
-        yield ns
-    finally:
-        shutdown_start = time.time()
-        print(f"[E2E Fixture] Starting shutdown Server {shutdown_start}")
-        # 强制快速关闭，不等待连接清理 / Force fast shutdown without waiting for connection cleanup
-        await server.down(force=True)
-        print(f"[E2E Fixture] Server shutdown took {time.time() - shutdown_start:.2f}s")
+    async with serve_asgi(asgi_app, async_integration_server_socket):
+        print(f"[E2E Fixture] Server startup took {time.time() - server_start:.2f}s")
+        try:
+            yield ns
+        finally:
+            shutdown_start = time.time()
+            print(f"[E2E Fixture] Starting shutdown Server {shutdown_start}")
+    print(f"[E2E Fixture] Server shutdown took {time.time() - shutdown_start:.2f}s")
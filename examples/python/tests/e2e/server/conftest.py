@@ -11,145 +11,36 @@ English: Common fixtures for e2e Server tests. Boots a real Socket.IO HTTP serve
 
 from __future__ import annotations
 
+import asyncio
 import contextlib
-import multiprocessing
 import socket
-import time
-from collections.abc import Iterator
-from multiprocessing.synchronize import Event
+from collections.abc import AsyncIterator, Iterator
 from typing import Any
 
 import pytest
+import pytest_asyncio
 import socketio
 from socketio import Namespace, Server, WSGIApp
-from werkzeug.serving import make_server
 
-from a2c_smcp.server import SyncSMCPNamespace
-from a2c_smcp.server.sync_auth import SyncAuthenticationProvider
+from a2c_smcp.server import SMCPNamespace
+from a2c_smcp.server.auth import AuthenticationProvider
 from a2c_smcp.smcp import SMCP_NAMESPACE
+from tests.e2e.utils import run_http_server
+from tests.integration_tests.computer.socketio.mock_uv_server import bind_listening_socket, serve_asgi
 
 # ============================================================================
-# 中文: 本地同步服务器创建函数（从 _local_sync_server.py 复制而来）
-# English: Local sync server creation functions (copied from _local_sync_server.py)
+# 中文: 同步服务器端点；local_sync_server 由 tests/e2e/conftest.py 提供
+# English: Sync server endpoint; local_sync_server comes from tests/e2e/conftest.py
 # ============================================================================
 
 
-class _PassSyncAuth(SyncAuthenticationProvider):
-    """中文: 测试用的放行认证提供者 / English: Permissive auth provider for testing"""
-
-    def authenticate(self, sio: Server, environ: dict, auth: dict | None, headers: list) -> bool:  # type: ignore[override]
-        return True
-
-
-class LocalSyncSMCPNamespace(SyncSMCPNamespace):
-    """中文: 同步命名空间，继承自正式实现，仅替换认证 / English: Sync namespace with test auth"""
-
-    def __init__(self) -> None:
-        super().__init__(auth_provider=_PassSyncAuth())
-        # 可选：记录操作 / Optional: record operations
-        self.client_operations_record: dict[str, tuple[str, Any]] = {}
-
-    def on_connect(self, sid: str, environ: dict, auth: dict | None = None) -> bool:  # type: ignore[override]
-        ok = super().on_connect(sid, environ, auth)
-        self.client_operations_record[sid] = ("connect", None)
-        return ok
-
-
-def create_local_sync_server() -> tuple[Server, Namespace, WSGIApp]:
-    """中文: 创建同步 Socket.IO Server 并注册本地命名空间 / English: Create sync Socket.IO Server with local namespace"""
-    sio = Server(
-        cors_allowed_origins="*",
-        ping_timeout=60,
-        ping_interval=25,
-        async_handlers=True,  # 如果想使用 call 方法，则必定需要将此参数设置为True / Required for call method
-        always_connect=True,
-    )
-    ns = LocalSyncSMCPNamespace()
-    sio.register_namespace(ns)
-    app = WSGIApp(sio, socketio_path="/socket.io")
-    return sio, ns, app
-
-
-# ============================================================================
-# 中文: 多进程服务器启动函数 / English: Multiprocess server startup
-# ============================================================================
-
-
-def _run_server_process(port: int, ready_event: Event) -> None:
-    """
-    中文: 在独立进程中运行服务器
-    English: Run server in a separate process
-    """
-    try:
-        sio, ns, wsgi_app = create_local_sync_server()
-        # 禁用监控任务避免关闭时出错 / Disable monitoring task to avoid shutdown errors
-        sio.eio.start_service_task = False
-
-        server = make_server("127.0.0.1", port, wsgi_app, threaded=True)
-
-        # 通知主进程服务器已准备好 / Notify main process that server is ready
-        ready_event.set()
-
-        # 运行服务器 / Run server
-        server.serve_forever()
-    except Exception as e:
-        print(f"服务器进程错误 / Server process error: {e}")
-        ready_event.set()  # 即使出错也要设置事件，避免主进程无限等待 / Set event even on error
-
-
-@contextlib.contextmanager
-def run_http_server() -> Iterator[tuple[str, int]]:
-    """
-    中文: 启动一个基于多进程的同步 Socket.IO Server（真实 HTTP 服务），返回 (host, port)。
-    English: Start a multiprocess sync Socket.IO server over real HTTP, return (host, port).
-    """
-    # 选取随机可用端口 / pick a free port
-    sock = socket.socket()
-    sock.bind(("127.0.0.1", 0))
-    host, port = sock.getsockname()
-    sock.close()
-
-    # 创建进程间通信事件 / Create inter-process communication event
-    ready_event = multiprocessing.Event()
-
-    # 启动服务器进程 / Start server process
-    server_process = multiprocessing.Process(
-        target=_run_server_process,
-        args=(port, ready_event),
-        daemon=True,
-    )
-    server_process.start()
-
-    # 等待服务器准备好 / Wait for server to be ready
-    if not ready_event.wait(timeout=10):
-        server_process.terminate()
-        server_process.join(timeout=2)
-        raise RuntimeError("服务器进程启动超时 / Server process startup timeout")
-
-    # 额外等待确保端口完全可用 / Extra wait to ensure port is fully available
-    time.sleep(0.3)
-
-    try:
-        yield host, port
-    finally:
-        # 终止服务器进程 / Terminate server process
-        if server_process.is_alive():
-            server_process.terminate()
-            server_process.join(timeout=3)
-
-        # 如果进程仍然存活，强制杀死 / Force kill if still alive
-        if server_process.is_alive():
-            server_process.kill()
-            server_process.join(timeout=1)
-
-
 @pytest.fixture(scope="session")
-def server_endpoint() -> Iterator[str]:
+def server_endpoint(local_sync_server: tuple[Server, Namespace, WSGIApp]) -> Iterator[str]:
     """
     中文: 提供形如 http://127.0.0.1:PORT 的服务端地址。
     English: Provide server endpoint like http://127.0.0.1:PORT
     """
-    with run_http_server() as (host, port):
+    with run_http_server(local_sync_server[2]) as (host, port):
         yield f"http://{host}:{port}"
 
 
@@ -201,31 +92,53 @@ def computer_client(server_endpoint: str) -> Iterator[socketio.Client]:
 # ============================================================================
 
 
-def create_local_async_server() -> tuple[socketio.AsyncServer, socketio.AsyncNamespace, Any]:
-    """
-    中文: 创建本地异步 SMCP 服务器，用于测试。
-    English: Create local async SMCP server for testing.
-    """
-    from a2c_smcp.server import SMCPNamespace
-    from a2c_smcp.server.auth import AuthenticationProvider
+class _PassAsyncAuth(AuthenticationProvider):
+    """中文: 测试用的放行认证提供者 / English: Permissive auth provider for testing"""
+
+    async def authenticate(self, sio: socketio.AsyncServer, environ: dict, auth: dict | None, headers: list) -> bool:  # type: ignore[override]
+        return True
 
-    class _PassAsyncAuth(AuthenticationProvider):
-        """中文: 测试用的放行认证提供者 / English: Permissive auth provider for testing"""
 
-        async def authenticate(self, sio: socketio.AsyncServer, environ: dict, auth: dict | None, headers: list) -> bool:  # type: ignore[override]
-            return True
+class LocalAsyncSMCPNamespace(SMCPNamespace):
+    """中文: 异步命名空间，继承自正式实现，仅替换认证 / English: Async namespace with test auth"""
 
-    class LocalAsyncSMCPNamespace(SMCPNamespace):
-        """中文: 异步命名空间，继承自正式实现，仅替换认证 / English: Async namespace with test auth"""
+    def __init__(self) -> None:
+        super().__init__(auth_provider=_PassAsyncAuth())
+        # 按 sid 记录断开事件，供夹具拆卸时等待服务端完成清理 / Per-sid disconnect events for fixture teardown to await
+        self._disconnected: dict[str, asyncio.Event] = {}
+
+    async def on_disconnect(self, sid: str) -> None:
+        try:
+            await super().on_disconnect(sid)
+        finally:
+            self._disconnected.setdefault(sid, asyncio.Event()).set()
+
+    async def wait_disconnected(self, sid: str, timeout: float) -> bool:
+        """
+        中文: 等待服务端处理完 sid 的断开（或超时），返回是否已断开。
+        English: Wait until the server has handled sid's disconnect (or time out); return whether it has.
+        """
+        event = self._disconnected.setdefault(sid, asyncio.Event())
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(event.wait(), timeout)
+        del self._disconnected[sid]
+        return event.is_set()
 
-        def __init__(self) -> None:
-            super().__init__(auth_provider=_PassAsyncAuth())
 
+def create_local_async_server() -> tuple[socketio.AsyncServer, socketio.AsyncNamespace, Any]:
+    """
+    中文: 创建本地异步 SMCP 服务器，用于测试。
+    English: Create local async SMCP server for testing.
+    """
     sio = socketio.AsyncServer(
         async_mode="asgi",
         cors_allowed_origins="*",
         logger=False,
         engineio_logger=False,
+        # 测试只持续数秒：把心跳间隔拉长到远超测试时长，避免每个连接周期性的 ping/pong 占用事件循环
+        # Tests last seconds: stretch the heartbeat far beyond that so no connection schedules periodic ping/pong
+        ping_interval=3600,
+        ping_timeout=3600,
     )
     # 避免关闭时后台任务异常 / avoid background task issues on shutdown
     sio.eio.start_service_task = False
@@ -235,87 +148,126 @@ def create_local_async_server() -> tuple[socketio.AsyncServer, socketio.AsyncNam
     return sio, ns, app
 
 
-@pytest.fixture
-def async_server_port() -> int:
+@pytest.fixture(scope="module")
+def async_server_socket() -> Iterator[socket.socket]:
     """
-    中文: 查找可用端口用于异步服务器。
-    English: Find an available TCP port for async server.
+    中文: 异步服务器使用的预绑定监听套接字，见 bind_listening_socket。
+    English: Pre-bound listening socket for the async server; see bind_listening_socket.
     """
-    sock = socket.socket()
-    sock.bind(("127.0.0.1", 0))
-    port = sock.getsockname()[1]
-    sock.close()
-    return port
+    sock = bind_listening_socket()
+    try:
+        yield sock
+    finally:
+        sock.close()
 
 
-@pytest.fixture
-async def async_socketio_server(async_server_port: int):
+@pytest.fixture(scope="module")
+def async_server_port(async_server_socket: socket.socket) -> int:
     """
-    中文: 启动基于 SMCPNamespace 的异步测试服务器，返回命名空间。
-    English: Start async test server based on SMCPNamespace and return the namespace.
+    中文: 异步服务器监听的端口。
+    English: Port the async server listens on.
     """
-    from tests.integration_tests.computer.socketio.mock_uv_server import UvicornTestServer
+    return async_server_socket.getsockname()[1]
+
 
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def async_socketio_server(async_server_socket: socket.socket):
+    """
+    中文: 启动基于 SMCPNamespace 的异步测试服务器，返回命名空间。模块内共享一个 Uvicorn 实例，
+          启动与监听开销只付一次；会话与房间状态按 sid 存放，客户端断开即清理，无需逐测试重置。
+          服务运行在模块级事件循环上，使用它的测试与客户端夹具须使用 loop_scope="module"。
+    English: Start async test server based on SMCPNamespace and return the namespace. One Uvicorn instance is shared
+          per module so startup and listener setup are paid once; session and room state is keyed by sid and dropped
+          when clients disconnect, so no per-test reset is needed. The server runs on the module-scoped event loop,
+          so tests and client fixtures using it must use loop_scope="module".
+    """
     sio, ns, asgi_app = create_local_async_server()
 
-    server = UvicornTestServer(asgi_app, port=async_server_port)
-    await server.up()
-    try:
+    async with serve_asgi(asgi_app, async_server_socket):
         yield ns
-    finally:
-        # 强制快速关闭，不等待连接清理 / Force fast shutdown without waiting for connection cleanup
-        await server.down(force=True)
 
 
-@pytest.fixture()
-async def async_agent_client(async_socketio_server, async_server_port: int):
+@contextlib.asynccontextmanager
+async def _async_socketio_client(port: int, ns: Any) -> AsyncIterator[socketio.AsyncClient]:
     """
-    中文: 已连接到异步 Server 的 Agent 客户端。
-    English: Connected Agent client (async).
+    中文: 创建并连接一个真实 socketio.AsyncClient；退出时断开，并等待服务端命名空间 `ns` 处理完该断开。
+    English: Create and connect a real socketio.AsyncClient; on exit disconnect it and wait for the server namespace
+        `ns` to finish handling the disconnect.
     """
-    import asyncio
-
     client = socketio.AsyncClient()
     await client.connect(
-        f"http://127.0.0.1:{async_server_port}",
+        f"http://127.0.0.1:{port}",
         socketio_path="/socket.io",
         namespaces=[SMCP_NAMESPACE],
-        transports=["polling"],
+        # 直连 websocket，原因见 serve_asgi / connect over websocket directly; see serve_asgi for why
+        transports=["websocket"],
         wait=True,
-        wait_timeout=10,
+        wait_timeout=5,
     )
+    sid = client.get_sid(SMCP_NAMESPACE)
     try:
         yield client
     finally:
-        # 中文: 等待一小段时间确保所有事件处理完成 / English: Wait briefly to ensure all events are processed
-        await asyncio.sleep(0.05)
         with contextlib.suppress(Exception):
             # 中文: 使用超时避免长时间等待 / English: Use timeout to avoid long wait
             await asyncio.wait_for(client.disconnect(), timeout=0.5)
+        # 中文: 以服务端断开回调为准结束拆卸，而非固定等待 / English: End teardown on the server's disconnect handler, not a fixed sleep
+        await ns.wait_disconnected(sid, timeout=0.5)
 
 
-@pytest.fixture()
+@pytest_asyncio.fixture(loop_scope="module")
+async def async_agent_client(async_socketio_server, async_server_port: int):
+    """
+    中文: 已连接到异步 Server 的 Agent 客户端。
+    English: Connected Agent client (async).
+    """
+    async with _async_socketio_client(async_server_port, async_socketio_server) as client:
+        yield client
+
+
+@pytest_asyncio.fixture(loop_scope="module")
 async def async_computer_client(async_socketio_server, async_server_port: int):
     """
     中文: 已连接到异步 Server 的 Computer 客户端。
     English: Connected Computer client (async).
     """
-    import asyncio
+    async with _async_socketio_client(async_server_port, async_socketio_server) as client:
+        yield client
 
-    client = socketio.AsyncClient()
-    await client.connect(
-        f"http://127.0.0.1:{async_server_port}",
-        socketio_path="/socket.io",
-        namespaces=[SMCP_NAMESPACE],
-        transports=["polling"],
-        wait=True,
-        wait_timeout=10,
-    )
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def _async_client_pair(async_socketio_server, async_server_port: int):
+    """
+    中文: 模块内共享的 (Agent, Computer) 已连接客户端对，握手只做一次；两个客户端相互独立，并发建立连接。
+    English: Module-shared pair of connected (Agent, Computer) clients, so the handshake happens once; the two clients
+        are independent and connect concurrently.
+    """
+    async with contextlib.AsyncExitStack() as stack:
+        # return_exceptions：等两个连接都结束后再抛错，已连上的一方已登记到 stack，随之断开
+        # return_exceptions: raise only after both attempts finish, so a client that did connect is already on the
+        # stack and gets disconnected
+        pair = await asyncio.gather(
+            stack.enter_async_context(_async_socketio_client(async_server_port, async_socketio_server)),
+            stack.enter_async_context(_async_socketio_client(async_server_port, async_socketio_server)),
+            return_exceptions=True,
+        )
+        for result in pair:
+            if isinstance(result, BaseException):
+                raise result
+        agent, computer = pair
+        yield agent, computer
+
+
+@pytest.fixture()
+def async_client_pair_shared(_async_client_pair):
+    """
+    中文: 取模块共享的客户端对；测试结束后清除测试经 `.on(...)` 注册的 SMCP 命名空间处理器，避免泄漏到下一个测试。
+          房间状态由测试自行离开房间来复原。
+    English: Hand out the module-shared client pair; after the test, drop the SMCP namespace handlers it registered via
+          `.on(...)` so they do not leak into the next test. Tests restore room state by leaving their office.
+    """
     try:
-        yield client
+        yield _async_client_pair
     finally:
-        # 中文: 等待一小段时间确保所有事件处理完成 / English: Wait briefly to ensure all events are processed
-        await asyncio.sleep(0.05)
-        with contextlib.suppress(Exception):
-            # 中文: 使用超时避免长时间等待 / English: Use timeout to avoid long wait
-            await asyncio.wait_for(client.disconnect(), timeout=0.5)
+        for client in _async_client_pair:
+            client.handlers.pop(SMCP_NAMESPACE, None)
@@ -11,7 +11,7 @@ English: End-to-end tests for the Server module: real HTTP service and real sock
 
 from __future__ import annotations
 
-import time
+import threading
 from typing import Any
 
 import pytest
@@ -25,7 +25,6 @@ from a2c_smcp.smcp import (
     JOIN_OFFICE_EVENT,
     LEAVE_OFFICE_EVENT,
     LEAVE_OFFICE_NOTIFICATION,
-    SMCP_NAMESPACE,
     TOOL_CALL_EVENT,
     UPDATE_CONFIG_EVENT,
     UPDATE_CONFIG_NOTIFICATION,
@@ -34,41 +33,50 @@ from a2c_smcp.smcp import (
     UPDATE_TOOL_LIST_EVENT,
     UPDATE_TOOL_LIST_NOTIFICATION,
 )
+from tests.e2e.server.utils import NOTIFICATIONS, NSClient
 
 pytestmark = pytest.mark.e2e
 
 
-def _wait_until(cond, timeout: float = 2.0, step: float = 0.01) -> bool:
+class _EventList(list):
     """
-    中文: 简易等待辅助函数，直到条件满足或超时。
-    English: Simple wait helper until condition met or timeout.
+    中文: 通知捕获列表，append 时置位 threading.Event，等待方被立即唤醒而无需定时轮询。
+    English: Notification capture list that sets a threading.Event on append, so waiters wake immediately without polling.
     """
-    end = time.time() + timeout
-    while time.time() < end:
-        if cond():
-            return True
-        time.sleep(step)
-    return cond()
 
+    def __init__(self) -> None:
+        super().__init__()
+        self.event = threading.Event()
 
-def _join_office(client, role: str, name: str, office_id: str) -> None:
+    def append(self, item: Any) -> None:
+        super().append(item)
+        self.event.set()
+
+
+def _wait_for(store: _EventList, timeout: float = 2.0) -> bool:
+    """
+    中文: 等待 store 收到至少一条通知或超时。
+    English: Wait until store has received at least one notification, or time out.
+    """
+    return store.event.wait(timeout) or len(store) >= 1
+
+
+def _join_office(client: NSClient, role: str, name: str, office_id: str) -> None:
     """中文: 加入房间 / English: Join office"""
     ok, err = client.call(
         JOIN_OFFICE_EVENT,
         {"role": role, "name": name, "office_id": office_id},
-        namespace=SMCP_NAMESPACE,
         timeout=5,
     )
     if not (ok and err is None):
         raise RuntimeError(f"加入房间失败 / Failed to join office: ok={ok}, err={err}")
 
 
-def _leave_office(client, office_id: str) -> None:
+def _leave_office(client: NSClient, office_id: str) -> None:
     """中文: 离开房间 / English: Leave office"""
     ok, err = client.call(
         LEAVE_OFFICE_EVENT,
         {"office_id": office_id},
-        namespace=SMCP_NAMESPACE,
         timeout=5,
     )
     if not (ok and err is None):
@@ -91,31 +99,20 @@ def test_server_end_to_end_flow(agent_client, computer_client):
       - Verify notifications on leave
     """
 
+    # 绑定 SMCP 命名空间 / Bind the SMCP namespace
+    agent, computer = NSClient(agent_client), NSClient(computer_client)
+
     room = "office-1"
     comp_name = "cmp-1"
     agent_name = "age-1"
 
     # 准备通知捕获容器 / Prepare notification captures
-    agent_events: dict[str, list[Any]] = {
-        ENTER_OFFICE_NOTIFICATION: [],
-        UPDATE_CONFIG_NOTIFICATION: [],
-        UPDATE_TOOL_LIST_NOTIFICATION: [],
-        UPDATE_DESKTOP_NOTIFICATION: [],
-        CANCEL_TOOL_CALL_NOTIFICATION: [],
-        LEAVE_OFFICE_NOTIFICATION: [],
-    }
-
-    computer_events: dict[str, list[Any]] = {
-        ENTER_OFFICE_NOTIFICATION: [],
-        UPDATE_CONFIG_NOTIFICATION: [],
-        UPDATE_TOOL_LIST_NOTIFICATION: [],
-        UPDATE_DESKTOP_NOTIFICATION: [],
-        CANCEL_TOOL_CALL_NOTIFICATION: [],
-        LEAVE_OFFICE_NOTIFICATION: [],
-    }
+    agent_events: dict[str, _EventList] = {evt: _EventList() for evt in NOTIFICATIONS}
+    computer_events: dict[str, _EventList] = {evt: _EventList() for evt in NOTIFICATIONS}
 
     # 在 Computer 客户端上实现请求处理：get_tools / get_desktop / tool_call
     # Implement request handlers on computer side (MUST register BEFORE joining)
+    # `.on(...)` 只写入客户端本地的处理器表，注册后立即生效 / `.on(...)` only fills the client-local handler table and takes effect at once
     def _on_get_tools(data):
         # 返回最简工具列表 / minimal tool list
         return {
@@ -137,78 +134,55 @@ def test_server_end_to_end_flow(agent_client, computer_client):
         # 回显实现 / echo implementation
         return {"ok": True, "echo": data}
 
-    computer_client.on(GET_TOOLS_EVENT, _on_get_tools, namespace=SMCP_NAMESPACE)
-    computer_client.on(GET_DESKTOP_EVENT, _on_get_desktop, namespace=SMCP_NAMESPACE)
-    computer_client.on(TOOL_CALL_EVENT, _on_tool_call, namespace=SMCP_NAMESPACE)
+    computer.on(GET_TOOLS_EVENT, _on_get_tools)
+    computer.on(GET_DESKTOP_EVENT, _on_get_desktop)
+    computer.on(TOOL_CALL_EVENT, _on_tool_call)
 
-    # 注册通知监听 / subscribe notifications
+    # 注册通知监听：直接以各 store 的 append 作为处理器 / subscribe notifications with each store's append as the handler
     for evt, store in agent_events.items():
-
-        def make_handler(s, e=evt):
-            def handler(data):
-                s.append(data)
-
-            return handler
-
-        agent_client.on(evt, make_handler(store), namespace=SMCP_NAMESPACE)
+        agent.on(evt, store.append)
 
     for evt, store in computer_events.items():
-
-        def make_handler(s, e=evt):
-            def handler(data):
-                s.append(data)
-
-            return handler
-
-        computer_client.on(evt, make_handler(store), namespace=SMCP_NAMESPACE)
-
-    # 等待确保事件处理器注册完成 / Wait to ensure event handlers are registered
-    time.sleep(0.1)
+        computer.on(evt, store.append)
 
     # 计算机先加入，Agent 后加入，Computer 应收到 Agent 加入的通知 / computer joins first, then agent joins
-    _join_office(computer_client, role="computer", name=comp_name, office_id=room)
-
-    # 等待一下以确保 session 建立 / small wait to ensure session saved
-    time.sleep(0.1)
+    _join_office(computer, role="computer", name=comp_name, office_id=room)
 
-    _join_office(agent_client, role="agent", name=agent_name, office_id=room)
+    # join 的 ack 返回即说明服务端已保存 session，无需额外等待 / The join ack means the server has saved the session
+    _join_office(agent, role="agent", name=agent_name, office_id=room)
 
     # Computer 应该收到 Agent 加入的通知 / Computer should receive agent join notification
-    assert _wait_until(lambda: len(computer_events[ENTER_OFFICE_NOTIFICATION]) >= 1)
-    assert computer_events[ENTER_OFFICE_NOTIFICATION][0]["office_id"] == room
-    assert "agent" in computer_events[ENTER_OFFICE_NOTIFICATION][0]
+    assert _wait_for(computer_events[ENTER_OFFICE_NOTIFICATION])
+    assert (enter_notif := computer_events[ENTER_OFFICE_NOTIFICATION][0])["office_id"] == room
+    assert "agent" in enter_notif
 
     # Agent 拉取工具列表 / Agent get tools
-    agent_ret_tools = agent_client.call(
+    agent_ret_tools = agent.call(
         GET_TOOLS_EVENT,
         {"computer": comp_name, "robot_id": agent_name, "req_id": "req-tools"},
-        namespace=SMCP_NAMESPACE,
         timeout=2,
     )
     assert isinstance(agent_ret_tools, dict)
     assert agent_ret_tools.get("tools") and agent_ret_tools.get("req_id") == "req-tools"
 
     # Agent 拉取桌面 / Agent get desktop
-    agent_ret_desktop = agent_client.call(
+    agent_ret_desktop = agent.call(
         GET_DESKTOP_EVENT,
         {"computer": comp_name, "robot_id": agent_name, "req_id": "req-desk"},
-        namespace=SMCP_NAMESPACE,
         timeout=2,
     )
     assert agent_ret_desktop.get("desktops") == ["win://1"]
     assert agent_ret_desktop.get("req_id") == "req-desk"
 
     # Computer 广播配置更新、工具列表更新、桌面更新 / updates broadcasting
-    computer_client.emit(UPDATE_CONFIG_EVENT, {"computer": comp_name}, namespace=SMCP_NAMESPACE)
-    computer_client.emit(UPDATE_TOOL_LIST_EVENT, {"computer": comp_name}, namespace=SMCP_NAMESPACE)
-    computer_client.emit(UPDATE_DESKTOP_EVENT, {"computer": comp_name}, namespace=SMCP_NAMESPACE)
+    computer.emit_many((UPDATE_CONFIG_EVENT, UPDATE_TOOL_LIST_EVENT, UPDATE_DESKTOP_EVENT), {"computer": comp_name})
 
-    assert _wait_until(lambda: len(agent_events[UPDATE_CONFIG_NOTIFICATION]) >= 1)
-    assert _wait_until(lambda: len(agent_events[UPDATE_TOOL_LIST_NOTIFICATION]) >= 1)
-    assert _wait_until(lambda: len(agent_events[UPDATE_DESKTOP_NOTIFICATION]) >= 1)
+    assert _wait_for(agent_events[UPDATE_CONFIG_NOTIFICATION])
+    assert _wait_for(agent_events[UPDATE_TOOL_LIST_NOTIFICATION])
+    assert _wait_for(agent_events[UPDATE_DESKTOP_NOTIFICATION])
 
     # Agent 发起工具调用 / Agent tool call
-    tool_call_ret = agent_client.call(
+    tool_call_ret = agent.call(
         TOOL_CALL_EVENT,
         {
             "computer": comp_name,
@@ -218,7 +192,6 @@ def test_server_end_to_end_flow(agent_client, computer_client):
             "agent": agent_name,
             "req_id": "req-tc",
         },
-        namespace=SMCP_NAMESPACE,
         timeout=3,
     )
     # 验证返回结果 / Verify return result
@@ -226,19 +199,18 @@ def test_server_end_to_end_flow(agent_client, computer_client):
     assert tool_call_ret.get("echo", {}).get("tool_name") == "echo"
 
     # Agent 取消工具调用（广播通知给 Computer） / cancel tool call
-    agent_client.emit(
+    agent.emit(
         CANCEL_TOOL_CALL_EVENT,
         {"agent": agent_name, "req_id": "req-tc"},
-        namespace=SMCP_NAMESPACE,
     )
-    assert _wait_until(lambda: len(computer_events[CANCEL_TOOL_CALL_NOTIFICATION]) >= 1)
+    assert _wait_for(computer_events[CANCEL_TOOL_CALL_NOTIFICATION])
 
     # 离开办公室 / leave
     # Computer 先离开，Agent 应该收到通知 / Computer leaves first, Agent should receive notification
-    _leave_office(computer_client, office_id=room)
-    assert _wait_until(lambda: len(agent_events[LEAVE_OFFICE_NOTIFICATION]) >= 1)
-    assert agent_events[LEAVE_OFFICE_NOTIFICATION][0]["office_id"] == room
-    assert "computer" in agent_events[LEAVE_OFFICE_NOTIFICATION][0]
+    _leave_office(computer, office_id=room)
+    assert _wait_for(agent_events[LEAVE_OFFICE_NOTIFICATION])
+    assert (leave_notif := agent_events[LEAVE_OFFICE_NOTIFICATION][0])["office_id"] == room
+    assert "computer" in leave_notif
 
     # Agent 后离开，此时房间里已经没有其他人了 / Agent leaves last, no one else in the room
-    _leave_office(agent_client, office_id=room)
+    _leave_office(agent, office_id=room)
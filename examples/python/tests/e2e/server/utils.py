@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# filename: utils.py
+# @Time    : 2026/10/16 11:05
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+中文: Server e2e 测试共享的辅助工具。
+English: Helpers shared by the Server e2e tests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+from typing import Any
+
+from a2c_smcp.smcp import (
+    CANCEL_TOOL_CALL_NOTIFICATION,
+    ENTER_OFFICE_NOTIFICATION,
+    LEAVE_OFFICE_NOTIFICATION,
+    SMCP_NAMESPACE,
+    UPDATE_CONFIG_NOTIFICATION,
+    UPDATE_DESKTOP_NOTIFICATION,
+    UPDATE_TOOL_LIST_NOTIFICATION,
+)
+
+# 中文: 测试捕获的通知事件名 / English: Notification event names captured by the tests
+NOTIFICATIONS = (
+    ENTER_OFFICE_NOTIFICATION,
+    UPDATE_CONFIG_NOTIFICATION,
+    UPDATE_TOOL_LIST_NOTIFICATION,
+    UPDATE_DESKTOP_NOTIFICATION,
+    CANCEL_TOOL_CALL_NOTIFICATION,
+    LEAVE_OFFICE_NOTIFICATION,
+)
+
+
+class NSClient:
+    """
+    中文: 绑定 SMCP 命名空间的客户端包装，调用处不再逐次传入 namespace 关键字参数；同步与异步客户端均适用，
+          包装异步客户端时各方法返回可等待对象。
+    English: Client wrapper bound to the SMCP namespace so call sites stop passing the namespace kwarg each time;
+        works for both sync and async clients, returning awaitables when wrapping an async one.
+    """
+
+    __slots__ = ("_client",)
+
+    def __init__(self, client: Any) -> None:
+        self._client = client
+
+    def call(self, event: str, data: Any, timeout: float = 5) -> Any:
+        return self._client.call(event, data, namespace=SMCP_NAMESPACE, timeout=timeout)
+
+    def emit(self, event: str, data: Any) -> Any:
+        return self._client.emit(event, data, namespace=SMCP_NAMESPACE)
+
+    def emit_many(self, events: tuple[str, ...], data: Any) -> Any:
+        """
+        中文: 发出携带同一负载的多个事件，无需逐个等待。同步客户端的 emit 只入队，轮询传输会把排队的包合并到同一个 POST
+              中发送；异步客户端返回并发发出各帧的可等待对象，各帧在同一连接上背靠背写出。
+        English: Emit several events with the same payload without waiting on each. A sync client's emit only
+            enqueues, and the polling transport sends the queued packets together in one POST; for an async client an
+            awaitable is returned that writes the frames back to back on the one connection.
+        """
+        results = [self.emit(event, data) for event in events]
+        if results and inspect.isawaitable(results[0]):
+            return asyncio.gather(*results)
+        return None
+
+    def on(self, event: str, handler: Any) -> None:
+        self._client.on(event, handler, namespace=SMCP_NAMESPACE)
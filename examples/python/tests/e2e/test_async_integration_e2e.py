@@ -7,19 +7,25 @@
 """
 中文: Computer-Agent-Server 三者联动的异步端到端测试。
       验证完整的工作流：Computer 加入 -> Agent 获取工具列表 -> Agent 调用工具 -> 验证桌面同步。
+      各测试互不依赖，可用 `pytest -n <N>` 并行；xdist 的每个 worker 在各自的临时端口上拥有独立的 Server，
+      模块级的 Computer 与 Agent 池也按 worker 各建一份，办公室 ID 因而不会跨 worker 冲突。
 English: Asynchronous end-to-end tests for Computer-Agent-Server integration.
          Validates complete workflow: Computer joins -> Agent gets tools -> Agent calls tools -> Verify desktop sync.
+         Tests are independent and can run in parallel with `pytest -n <N>`; each xdist worker owns its own Server on
+         its own ephemeral port, and builds its own module-level Computer and Agent pool, so office IDs never clash
+         across workers.
 """
 
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import sys
 import time
 from pathlib import Path
-from typing import Any
 
 import pytest
+import pytest_asyncio
 
 from a2c_smcp.agent import AsyncSMCPAgentClient, DefaultAgentAuthProvider
 from a2c_smcp.agent.types import AsyncAgentEventHandler
@@ -28,33 +34,74 @@ from a2c_smcp.computer.mcp_clients.model import StdioServerConfig
 from a2c_smcp.computer.socketio.client import SMCPComputerClient
 from a2c_smcp.smcp import (
     JOIN_OFFICE_EVENT,
+    LEAVE_OFFICE_EVENT,
     SMCP_NAMESPACE,
     EnterOfficeNotification,
     LeaveOfficeNotification,
+    LeaveOfficeReq,
     SMCPTool,
     UpdateMCPConfigNotification,
 )
 
 pytestmark = pytest.mark.e2e
 
+# 中文: 模块内预先连接的 Agent 客户端数量 / English: Number of pre-connected Agent clients per module
+_AGENT_POOL_SIZE = 2
+
+# 中文: 各类操作的超时按本地实测耗时（均在百毫秒内）留足余量设定；它们只是失败时的上限，收紧后 CI 中的失败能更快暴露。
+#       工具调用的超时会随请求发给 Server，由 Server 据此等待 Computer 响应，两端保持一致。
+# English: Per-operation timeouts sized from observed runtimes (all well under a second) with ample headroom; they only
+#          bound failures, so tighter values surface CI failures sooner. The tool call timeout travels with the request
+#          and the Server waits on the Computer with it, keeping both sides in step.
+_TOOL_CALL_TIMEOUT = 3
+_JOIN_TIMEOUT = 2
+_DESKTOP_TIMEOUT = 3
+
+# 中文: 项目根目录与 MCP Server 脚本的绝对路径，导入时解析一次，无论工作目录如何都能找到脚本
+# English: Absolute project root and MCP Server script path, resolved once at import so the script is found from any
+#          working directory
+_PROJECT_ROOT = Path(__file__).parent.parent.parent.resolve()  # 从 tests/e2e/ 回到项目根目录 / Up from tests/e2e/
+_MCP_SCRIPT = (
+    _PROJECT_ROOT / "tests/integration_tests/computer/mcp_servers/resources_subscribe_stdio_server.py"
+).resolve()
+
+# 中文: 所有 Computer 共用的 MCP Server 配置，导入时构建并校验一次；各 Computer 复用同一实例，各自拉起子进程
+# English: MCP Server config shared by every Computer, built and validated once at import; each Computer reuses the
+#          instance and spawns its own subprocess from it
+_STDIO_CONFIG = StdioServerConfig(
+    name="e2e-async-integration-server",
+    type="stdio",
+    disabled=False,
+    forbidden_tools=[],
+    tool_meta={},
+    default_tool_meta={"auto_apply": True},
+    server_parameters={
+        "command": sys.executable,  # 使用当前 Python 解释器 / Use current Python interpreter
+        "args": [str(_MCP_SCRIPT)],
+        "env": None,
+        "cwd": None,
+        "encoding": "utf-8",
+        "encoding_error_handler": "strict",
+    },
+)
+
 
-async def _wait_until(cond, timeout: float = 3.0, step: float = 0.01) -> bool:
+async def _wait_event(event: asyncio.Event, timeout: float = 3.0) -> bool:
     """
-    中文: 简易异步等待辅助函数，直到条件满足或超时。
-    English: Simple async wait helper until condition met or timeout.
+    中文: 等待 asyncio.Event 置位或超时，返回是否已置位；由事件生产方直接唤醒，无轮询开销。
+    English: Wait until an asyncio.Event is set or the timeout expires and return whether it is set; the producer wakes
+             the waiter directly, with no polling.
     """
-    end = asyncio.get_event_loop().time() + timeout
-    while asyncio.get_event_loop().time() < end:
-        if cond():
-            return True
-        await asyncio.sleep(step)
-    return cond()
+    with contextlib.suppress(asyncio.TimeoutError):
+        await asyncio.wait_for(event.wait(), timeout)
+    return event.is_set()
 
 
 class MockAsyncEventHandler(AsyncAgentEventHandler):
     """
-    中文: 测试用的异步事件处理器，记录所有事件
-    English: Test async event handler that records all events
+    中文: 测试用的异步事件处理器，记录所有事件；每类回调另置一个 asyncio.Event，测试可直接等待事件到达而无需固定延时。
+    English: Test async event handler that records all events; each callback also sets an asyncio.Event so tests can
+             await the event's arrival instead of sleeping a fixed delay.
     """
 
     def __init__(self):
@@ -62,187 +109,255 @@ class MockAsyncEventHandler(AsyncAgentEventHandler):
         self.leave_office_events: list[LeaveOfficeNotification] = []
         self.update_config_events: list[UpdateMCPConfigNotification] = []
         self.tools_received_events: list[tuple[str, list[SMCPTool]]] = []
+        self.enter_office_evt = asyncio.Event()
+        self.leave_office_evt = asyncio.Event()
+        self.update_config_evt = asyncio.Event()
+        self.tools_received_evt = asyncio.Event()
 
     async def on_computer_enter_office(self, data: EnterOfficeNotification, sio: AsyncSMCPAgentClient) -> None:
         self.enter_office_events.append(data)
+        self.enter_office_evt.set()
 
     async def on_computer_leave_office(self, data: LeaveOfficeNotification, sio: AsyncSMCPAgentClient) -> None:
         self.leave_office_events.append(data)
+        self.leave_office_evt.set()
 
     async def on_computer_update_config(self, data: UpdateMCPConfigNotification, sio: AsyncSMCPAgentClient) -> None:
         self.update_config_events.append(data)
+        self.update_config_evt.set()
 
     async def on_tools_received(self, computer: str, tools: list[SMCPTool], sio: AsyncSMCPAgentClient) -> None:
         self.tools_received_events.append((computer, tools))
-
-
-def _create_mcp_config(name: str, script_path: str) -> dict[str, Any]:
+        self.tools_received_evt.set()
+
+    async def wait_for_enter(self, timeout: float) -> bool:
+        """
+        中文: 等待收到 Computer 加入办公室通知，返回是否在超时前收到。
+        English: Wait for a Computer enter office notification; return whether it arrived before the timeout.
+        """
+        return await _wait_event(self.enter_office_evt, timeout)
+
+    async def wait_for_leave(self, timeout: float) -> bool:
+        """
+        中文: 等待收到 Computer 离开办公室通知，返回是否在超时前收到。
+        English: Wait for a Computer leave office notification; return whether it arrived before the timeout.
+        """
+        return await _wait_event(self.leave_office_evt, timeout)
+
+    async def wait_for_update(self, timeout: float) -> bool:
+        """
+        中文: 等待收到 Computer 配置更新通知，返回是否在超时前收到。
+        English: Wait for a Computer config update notification; return whether it arrived before the timeout.
+        """
+        return await _wait_event(self.update_config_evt, timeout)
+
+    async def wait_for_tools(self, timeout: float) -> bool:
+        """
+        中文: 等待 Agent 拉取到 Computer 的工具列表，返回是否在超时前收到。
+        English: Wait until the Agent has fetched the Computer's tools list; return whether it arrived in time.
+        """
+        return await _wait_event(self.tools_received_evt, timeout)
+
+
+async def _boot_and_connect(computer: Computer, computer_client: SMCPComputerClient, server_url: str) -> None:
     """
-    中文: 创建 MCP Server 配置
-    English: Create MCP Server config
+    中文: 并发执行 Computer.boot_up（拉起 MCP 子进程）与 Socket.IO 连接：二者互不依赖，耗时取两者较大值而非之和。
+          两者都结束后才抛出首个异常，调用方的清理不会与仍在进行的另一半竞争。
+    English: Run Computer.boot_up (spawning the MCP subprocess) and the Socket.IO connect concurrently: they are
+          independent, so setup takes the longer of the two instead of their sum. The first error is raised only after
+          both finish, so the caller's cleanup never races the other half.
     """
-    # 将相对路径转换为绝对路径，确保在不同工作目录下都能正确找到文件
-    # Convert relative path to absolute path to ensure file can be found in different working directories
-    project_root = Path(__file__).parent.parent.parent  # 从 tests/e2e/ 回到项目根目录 / Go back to project root from tests/e2e/
-    absolute_script_path = (project_root / script_path).resolve()
-
-    return {
-        "name": name,
-        "type": "stdio",
-        "disabled": False,
-        "forbidden_tools": [],
-        "tool_meta": {},
-        "default_tool_meta": {"auto_apply": True},
-        "server_parameters": {
-            "command": sys.executable,  # 使用当前 Python 解释器 / Use current Python interpreter
-            "args": [str(absolute_script_path)],
-            "env": None,
-            "cwd": None,
-            "encoding": "utf-8",
-            "encoding_error_handler": "strict",
-        },
-    }
-
-
-@pytest.mark.asyncio
-async def test_async_integration_computer_agent_server_basic_flow(
-    async_integration_socketio_server,
-    async_integration_server_port: int,
-    tmp_path: Path,
-):
+    results = await asyncio.gather(
+        computer.boot_up(),
+        computer_client.connect(
+            server_url,
+            socketio_path="/socket.io",
+            namespaces=[SMCP_NAMESPACE],
+            # 直连 websocket，原因见 serve_asgi / connect over websocket directly; see serve_asgi for why
+            transports=["websocket"],
+        ),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+
+async def _disconnect_quietly(client: SMCPComputerClient | AsyncSMCPAgentClient) -> None:
     """
-    中文:
-      - 验证 Computer 连接到 Server 并加入办公室
-      - 验证 Agent 连接到 Server 并加入同一办公室
-      - 验证 Agent 收到 Computer 加入通知
-      - 验证 Agent 自动获取 Computer 的工具列表
-      - 验证工具列表包含预期的工具
-    English:
-      - Verify Computer connects to Server and joins office
-      - Verify Agent connects to Server and joins same office
-      - Verify Agent receives Computer join notification
-      - Verify Agent automatically fetches Computer's tool list
-      - Verify tool list contains expected tools
+    中文: 清理阶段断开 Socket.IO 客户端，忽略错误；使用超时避免长时间等待。
+    English: Disconnect a Socket.IO client during cleanup, ignoring errors; use a timeout to avoid long waits.
     """
-    # 在 SMCP 协议中，agent_id 和 office_id 必须保持一致 / In SMCP protocol, agent_id and office_id must be consistent
-    agent_id = "async-integration-office-1"
-    office_id = agent_id
-    server_url = f"http://127.0.0.1:{async_integration_server_port}"
+    with contextlib.suppress(Exception):
+        await asyncio.wait_for(client.disconnect(), timeout=0.5)
 
-    # 创建 MCP Server 配置 / Create MCP Server config
-    mcp_config = _create_mcp_config(
-        "e2e-async-integration-server",
-        "tests/integration_tests/computer/mcp_servers/resources_subscribe_stdio_server.py",
-    )
-    stdio_config = StdioServerConfig(**mcp_config)
 
-    # 创建 Computer 实例 / Create Computer instance
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def shared_computer(async_integration_socketio_server, async_integration_server_port: int):
+    """
+    中文: 模块内共享的 Computer 及其 Socket.IO 客户端：MCP 子进程只启动一次、连接只握手一次，已连接但未加入任何办公室。
+          各测试只负责 join_office / leave_office；验证离开通知的测试需要完整断开，仍使用独立的 Computer。
+    English: Module-shared Computer and its Socket.IO client: the MCP subprocess is spawned once and the connection is
+          handshaken once; it is connected but not in any office. Tests only join_office / leave_office; the leave
+          notification test needs a full disconnect and keeps its own Computer.
+    """
     computer = Computer(
         name="test",
-        mcp_servers={stdio_config},
+        mcp_servers={_STDIO_CONFIG},
         auto_connect=True,
     )
     computer_client = SMCPComputerClient(computer=computer)
 
-    # 创建 Agent 客户端 / Create Agent client
-    auth_provider = DefaultAgentAuthProvider(
-        agent_id=agent_id,
-        office_id=office_id,
-    )
-    event_handler = MockAsyncEventHandler()
-    agent_client = AsyncSMCPAgentClient(
-        auth_provider=auth_provider,
-        event_handler=event_handler,
-    )
+    try:
+        t = time.time()
+        await _boot_and_connect(computer, computer_client, f"http://127.0.0.1:{async_integration_server_port}")
+        print(f"[E2E Fixture] Computer boot_up + connect took {time.time() - t:.2f}s")
+        yield computer, computer_client
+    finally:
+        # 断开 Socket.IO 与关闭 MCP Server 进程互不依赖，并发执行 / Disconnecting Socket.IO and shutting down the MCP
+        # Server processes are independent, so run them concurrently
+        await asyncio.gather(_disconnect_quietly(computer_client), computer.shutdown())
 
+
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def agent_client_pool(async_integration_socketio_server, async_integration_server_port: int):
+    """
+    中文: 模块内共享的已连接 Agent 客户端池（asyncio.Queue），每个测试取用一个，省去逐测试的 Socket.IO 握手与认证；
+          模块结束时统一断开。在 SMCP 协议中 agent_id 与 office_id 必须一致，因此每个客户端固定使用自己的办公室。
+    English: Module-shared pool (asyncio.Queue) of connected Agent clients; each test checks one out, saving a Socket.IO
+          handshake and auth per test; all are disconnected at module teardown. SMCP requires agent_id and office_id
+          to match, so each client always uses its own office.
+    """
+    server_url = f"http://127.0.0.1:{async_integration_server_port}"
+    pool: asyncio.Queue[AsyncSMCPAgentClient] = asyncio.Queue()
+    clients = [
+        AsyncSMCPAgentClient(auth_provider=DefaultAgentAuthProvider(agent_id=office_id, office_id=office_id))
+        for office_id in (f"async-integration-office-{i}" for i in range(1, _AGENT_POOL_SIZE + 1))
+    ]
     try:
-        start_time = time.time()
+        # 各客户端的握手互不依赖，并发建立连接 / The clients' handshakes are independent, so connect them concurrently
+        results = await asyncio.gather(
+            *(c.connect_to_server(server_url, transports=["websocket"]) for c in clients), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        for agent_client in clients:
+            pool.put_nowait(agent_client)
+        yield pool
+    finally:
+        # 各客户端使用独立连接，并发断开 / Each client has its own connection, so disconnect them concurrently
+        await asyncio.gather(*(_disconnect_quietly(c) for c in clients))
 
-        # 1. Agent 先连接并加入办公室 / Agent connects and joins office first
-        t1 = time.time()
-        await agent_client.connect_to_server(server_url)
-        print(f"[E2E] Agent connect took {time.time() - t1:.2f}s")
-        await asyncio.sleep(0.2)
 
-        t2 = time.time()
+@pytest_asyncio.fixture(loop_scope="session")
+async def pooled_agent(agent_client_pool: asyncio.Queue[AsyncSMCPAgentClient]):
+    """
+    中文: 从池中取出一个 Agent，挂上新的 MockAsyncEventHandler 并加入其办公室，返回 (agent_client, event_handler, office_id)；
+          测试结束后离开办公室、摘除处理器并归还池中，不断开连接。
+    English: Check an Agent out of the pool, attach a fresh MockAsyncEventHandler and join its office, yielding
+          (agent_client, event_handler, office_id); afterwards leave the office, detach the handler and return the
+          client to the pool without disconnecting.
+    """
+    agent_client = await agent_client_pool.get()
+    office_id = agent_client.auth_provider.get_agent_config()["office_id"]
+    event_handler = MockAsyncEventHandler()
+    agent_client.event_handler = event_handler
+    try:
         ok, err = await agent_client.call(
             JOIN_OFFICE_EVENT,
-            {"role": "agent", "name": "test-agent-async-1", "office_id": office_id},
+            {"role": "agent", "name": f"test-agent-{office_id}", "office_id": office_id},
             namespace=SMCP_NAMESPACE,
-            timeout=5,
+            timeout=_JOIN_TIMEOUT,
         )
-        print(f"[E2E] Agent join office took {time.time() - t2:.2f}s")
         assert ok is True, f"Agent join office failed: {err}"
-        await asyncio.sleep(0.3)
-
-        # 2. Computer 启动并连接到 Server / Computer boots up and connects to Server
-        t3 = time.time()
-        await computer.boot_up()
-        print(f"[E2E] Computer boot_up took {time.time() - t3:.2f}s")
+        yield agent_client, event_handler, office_id
+    finally:
+        with contextlib.suppress(Exception):
+            await agent_client.call(
+                LEAVE_OFFICE_EVENT,
+                LeaveOfficeReq(office_id=office_id),
+                namespace=SMCP_NAMESPACE,
+                timeout=_JOIN_TIMEOUT,
+            )
+        agent_client.event_handler = None
+        agent_client_pool.put_nowait(agent_client)
 
-        t4 = time.time()
-        await computer_client.connect(
-            server_url,
-            socketio_path="/socket.io",
-            namespaces=[SMCP_NAMESPACE],
-            transports=["polling"],
-        )
-        print(f"[E2E] Computer connect took {time.time() - t4:.2f}s")
 
-        t5 = time.time()
+@pytest_asyncio.fixture(loop_scope="session")
+async def joined_office(
+    shared_computer: tuple[Computer, SMCPComputerClient],
+    pooled_agent: tuple[AsyncSMCPAgentClient, MockAsyncEventHandler, str],
+):
+    """
+    中文: 共享 Computer 加入池中 Agent 所在的办公室，等待 Agent 收到加入通知并自动拉取到工具列表后，
+          返回 (agent_client, event_handler, office_id, computer, tools)；测试结束后 Computer 离开办公室，连接留给后续测试。
+    English: Have the shared Computer join the pooled Agent's office and wait until the Agent got the enter notification
+          and auto-fetched the tool list, yielding (agent_client, event_handler, office_id, computer, tools); afterwards
+          the Computer leaves the office and keeps its connection for later tests.
+    """
+    _, computer_client = shared_computer
+    agent_client, event_handler, office_id = pooled_agent
+    try:
         await computer_client.join_office(office_id)
-        print(f"[E2E] Computer join office took {time.time() - t5:.2f}s")
 
-        # 3. 等待事件传播 / Wait for event propagation
-        await asyncio.sleep(1.0)
-        print(f"[E2E] Setup phase took {time.time() - start_time:.2f}s")
-
-        # 4. 验证 Agent 收到 Computer 加入通知 / Verify Agent received Computer join notification
-        assert await _wait_until(lambda: len(event_handler.enter_office_events) >= 1, timeout=5), (
+        # 等待 Agent 收到加入通知（不再固定延时）/ Await the enter notification (no fixed delay)
+        assert await event_handler.wait_for_enter(timeout=_JOIN_TIMEOUT), (
             "Agent did not receive Computer enter office notification"
         )
 
-        enter_event = event_handler.enter_office_events[0]
-        assert enter_event["office_id"] == office_id
-        assert "computer" in enter_event
-
-        # 5. 验证 Agent 自动获取了工具列表 / Verify Agent automatically fetched tool list
-        assert await _wait_until(lambda: len(event_handler.tools_received_events) >= 1, timeout=5), "Agent did not receive tools list"
-
-        computer_sid, tools = event_handler.tools_received_events[0]
-        assert len(tools) >= 1, f"Expected at least 1 tool, got {len(tools)}"
-
-        # 验证工具列表包含 mark_a 工具 / Verify tool list contains mark_a tool
-        tool_names = [t["name"] for t in tools]
-        assert "mark_a" in tool_names, f"Expected 'mark_a' in tools, got {tool_names}"
-
-        print(f"[E2E] Test assertions completed in {time.time() - start_time:.2f}s")
-
+        # 等待 Agent 收到工具列表 / Wait for Agent to receive tool list
+        assert await event_handler.wait_for_tools(timeout=_TOOL_CALL_TIMEOUT), "Agent did not receive tools list"
+        computer, tools = event_handler.tools_received_events[0]
+        yield agent_client, event_handler, office_id, computer, tools
     finally:
-        # 清理资源 / Cleanup resources
-        cleanup_start = time.time()
-
-        t_agent = time.time()
-        await agent_client.disconnect()
-        print(f"[E2E] Agent disconnect took {time.time() - t_agent:.2f}s")
-
-        # 显式调用 Computer.shutdown() 清理 MCP Server 进程
-        # 注意：跳过 computer_client.disconnect()，因为它会等待30秒超时
-        # Explicitly call Computer.shutdown() to cleanup MCP Server processes
-        # Note: Skip computer_client.disconnect() as it waits for 30s timeout
-        t_shutdown = time.time()
-        await computer.shutdown()
-        print(f"[E2E] Computer shutdown took {time.time() - t_shutdown:.2f}s")
-
-        print(f"[E2E] Cleanup phase took {time.time() - cleanup_start:.2f}s")
+        # 共享 Computer 只离开办公室，MCP 进程与连接由模块夹具回收；Agent 由 pooled_agent 夹具归还池中。
+        # leave_office 只是发送事件，以 Agent 收到离开通知作为完成信号，而非固定延时
+        # The shared Computer only leaves the office; the module fixture reclaims the MCP process and connection, and
+        # pooled_agent returns the Agent to the pool. leave_office only emits, so the Agent's leave notification marks
+        # completion instead of a fixed delay
+        if computer_client.connected:
+            await computer_client.leave_office(office_id)
+            await event_handler.wait_for_leave(timeout=_JOIN_TIMEOUT)
 
 
-@pytest.mark.asyncio
-async def test_async_integration_agent_call_computer_tool(
-    async_integration_socketio_server,
-    async_integration_server_port: int,
-    tmp_path: Path,
-):
+async def _scenario_basic_flow(
+    agent_client: AsyncSMCPAgentClient,
+    event_handler: MockAsyncEventHandler,
+    office_id: str,
+    computer: str,
+    tools: list[SMCPTool],
+) -> None:
+    """
+    中文:
+      - 验证 Agent 收到 Computer 加入通知
+      - 验证 Agent 自动获取 Computer 的工具列表
+      - 验证工具列表包含预期的工具
+    English:
+      - Verify Agent receives Computer join notification
+      - Verify Agent automatically fetches Computer's tool list
+      - Verify tool list contains expected tools
+    """
+    # 验证 Agent 收到 Computer 加入通知 / Verify Agent received Computer join notification
+    enter_event = event_handler.enter_office_events[0]
+    assert enter_event["office_id"] == office_id
+    assert "computer" in enter_event
+
+    # 验证 Agent 自动获取了工具列表 / Verify Agent automatically fetched tool list
+    assert len(tools) >= 1, f"Expected at least 1 tool, got {len(tools)}"
+
+    # 验证工具列表包含 mark_a 工具 / Verify tool list contains mark_a tool
+    tool_names = [t["name"] for t in tools]
+    assert "mark_a" in tool_names, f"Expected 'mark_a' in tools, got {tool_names}"
+
+
+async def _scenario_tool_call(
+    agent_client: AsyncSMCPAgentClient,
+    event_handler: MockAsyncEventHandler,
+    office_id: str,
+    computer: str,
+    tools: list[SMCPTool],
+) -> None:
     """
     中文:
       - 验证 Agent 可以调用 Computer 上的工具
@@ -253,124 +368,138 @@ async def test_async_integration_agent_call_computer_tool(
       - Verify tool call returns correct results
       - Verify desktop info can be retrieved after tool call
     """
-    # 在 SMCP 协议中，agent_id 和 office_id 必须保持一致 / In SMCP protocol, agent_id and office_id must be consistent
-    agent_id = "async-integration-office-2"
-    office_id = agent_id
-    server_url = f"http://127.0.0.1:{async_integration_server_port}"
-
-    # 创建 MCP Server 配置 / Create MCP Server config
-    mcp_config = _create_mcp_config(
-        "e2e-async-integration-server-2",
-        "tests/integration_tests/computer/mcp_servers/resources_subscribe_stdio_server.py",
+    # 1. Agent 调用 mark_a 工具 / Agent calls mark_a tool
+    result = await agent_client.emit_tool_call(
+        computer=computer,
+        tool_name="mark_a",
+        params={},
+        timeout=_TOOL_CALL_TIMEOUT,
     )
-    stdio_config = StdioServerConfig(**mcp_config)
 
-    # 创建 Computer 实例 / Create Computer instance
-    computer = Computer(
-        name="test",
-        mcp_servers={stdio_config},
-        auto_connect=True,
-    )
-    computer_client = SMCPComputerClient(computer=computer)
-
-    # 创建 Agent 客户端 / Create Agent client
-    auth_provider = DefaultAgentAuthProvider(
-        agent_id=agent_id,
-        office_id=office_id,
-    )
-    event_handler = MockAsyncEventHandler()
-    agent_client = AsyncSMCPAgentClient(
-        auth_provider=auth_provider,
-        event_handler=event_handler,
-    )
-
-    try:
-        # 1. Agent 先连接并加入办公室 / Agent connects and joins office first
-        await agent_client.connect_to_server(server_url)
-        await asyncio.sleep(0.2)
-
-        await agent_client.call(
-            JOIN_OFFICE_EVENT,
-            {"role": "agent", "name": "test-agent-async-2", "office_id": office_id},
-            namespace=SMCP_NAMESPACE,
-            timeout=5,
-        )
-        await asyncio.sleep(0.3)
-
-        # 2. Computer 启动并连接到 Server / Computer boots up and connects to Server
-        await computer.boot_up()
-        await computer_client.connect(
-            server_url,
-            socketio_path="/socket.io",
-            namespaces=[SMCP_NAMESPACE],
-            transports=["polling"],
-        )
-        await computer_client.join_office(office_id)
-
-        # 3. 等待事件传播 / Wait for event propagation
-        await asyncio.sleep(1.0)
-
-        # 等待 Agent 收到工具列表 / Wait for Agent to receive tool list
-        assert await _wait_until(lambda: len(event_handler.tools_received_events) >= 1, timeout=5)
-        computer_sid, tools = event_handler.tools_received_events[0]
-
-        # 2. Agent 调用 mark_a 工具 / Agent calls mark_a tool
-        result = await agent_client.emit_tool_call(
-            computer=computer_sid,
-            tool_name="mark_a",
-            params={},
-            timeout=15,  # 增加超时时间 / Increase timeout
+    # 2. 验证工具调用结果 / Verify tool call result
+    assert result.isError is False, f"Tool call failed: {result}"
+    assert len(result.content) >= 1
+    # 工具应该返回 "ok:mark_a" / Tool should return "ok:mark_a"
+    assert "ok:mark_a" in result.content[0].text
+
+    # 3. 获取桌面信息 / Get desktop info
+    desktop_response = await agent_client.get_desktop_from_computer(computer, timeout=_DESKTOP_TIMEOUT)
+    assert "desktops" in desktop_response
+    desktops = desktop_response["desktops"]
+
+    # 验证桌面包含 window:// 资源 / Verify desktop contains window:// resources
+    assert len(desktops) >= 1, f"Expected at least 1 desktop window, got {len(desktops)}"
+    assert any("window://" in d for d in desktops), f"Expected window:// in desktops, got {desktops}"
+
+
+async def _scenario_multi_tool(
+    agent_client: AsyncSMCPAgentClient,
+    event_handler: MockAsyncEventHandler,
+    office_id: str,
+    computer: str,
+    tools: list[SMCPTool],
+) -> None:
+    """
+    中文:
+      - 验证 Agent 可以对同一 Computer 并发发起多次工具调用
+      - 验证每次调用都能正确返回结果
+    English:
+      - Verify Agent can issue multiple concurrent tool calls to the same Computer
+      - Verify each call returns correct results
+    """
+    # 1. 并发调用工具多次 / Call tool multiple times concurrently
+    results = await asyncio.gather(
+        *(
+            agent_client.emit_tool_call(
+                computer=computer,
+                tool_name="mark_a",
+                params={},
+                timeout=_TOOL_CALL_TIMEOUT,
+            )
+            for _ in range(6)
         )
+    )
 
-        # 3. 验证工具调用结果 / Verify tool call result
-        assert result.isError is False, f"Tool call failed: {result}"
+    # 2. 验证所有调用都成功 / Verify all calls succeeded
+    assert len(results) == 6
+    for i, result in enumerate(results):
+        assert result.isError is False, f"Tool call {i} failed: {result}"
         assert len(result.content) >= 1
-        # 工具应该返回 "ok:mark_a" / Tool should return "ok:mark_a"
         assert "ok:mark_a" in result.content[0].text
 
-        # 4. 获取桌面信息 / Get desktop info
-        desktop_response = await agent_client.get_desktop_from_computer(computer_sid, timeout=10)
-        assert "desktops" in desktop_response
-        desktops = desktop_response["desktops"]
-
-        # 验证桌面包含 window:// 资源 / Verify desktop contains window:// resources
-        assert len(desktops) >= 1, f"Expected at least 1 desktop window, got {len(desktops)}"
-        assert any("window://" in d for d in desktops), f"Expected window:// in desktops, got {desktops}"
-
-    finally:
-        # 清理资源 / Cleanup resources
-        cleanup_start = time.time()
-        print("[E2E Test2] Starting cleanup...")
-
-        # 先断开 Agent，避免在 Computer 断开时收到错误通知
-        # Disconnect Agent first to avoid error notifications when Computer disconnects
-        t1 = time.time()
-        await agent_client.disconnect()
-        print(f"[E2E Test2] Agent disconnect took {time.time() - t1:.2f}s")
-        await asyncio.sleep(0.2)  # 等待断开完成 / Wait for disconnect to complete
-
-        # 然后断开 Computer
-        # Then disconnect Computer
-        if computer_client.connected:
-            t2 = time.time()
-            await computer_client.leave_office(office_id)
-            print(f"[E2E Test2] Computer leave_office took {time.time() - t2:.2f}s")
-
-        # 显式调用 Computer.shutdown() 清理 MCP Server 进程
-        # 注意：不调用 computer_client.disconnect()，因为它会等待30秒超时
-        # Explicitly call Computer.shutdown() to cleanup MCP Server processes
-        # Note: Skip computer_client.disconnect() as it waits for 30s timeout
-        t3 = time.time()
-        await computer.shutdown()
-        print(f"[E2E Test2] Computer shutdown took {time.time() - t3:.2f}s")
 
-        print(f"[E2E Test2] Total cleanup took {time.time() - cleanup_start:.2f}s")
+async def _scenario_desktop_sync(
+    agent_client: AsyncSMCPAgentClient,
+    event_handler: MockAsyncEventHandler,
+    office_id: str,
+    computer: str,
+    tools: list[SMCPTool],
+) -> None:
+    """
+    中文:
+      - 验证调用工具后桌面信息保持同步
+      - 验证 Agent 可以获取最新的桌面状态
+    English:
+      - Verify desktop info stays synced after tool calls
+      - Verify Agent can retrieve latest desktop state
+    """
+    # 1. 获取初始桌面状态 / Get initial desktop state
+    desktop_before = await agent_client.get_desktop_from_computer(computer, timeout=_DESKTOP_TIMEOUT)
+    assert "desktops" in desktop_before
+
+    # 2. 调用工具 / Call tool
+    result = await agent_client.emit_tool_call(
+        computer=computer,
+        tool_name="mark_a",
+        params={},
+        timeout=_TOOL_CALL_TIMEOUT,
+    )
+    assert result.isError is False
+
+    # 3. 再次获取桌面状态 / Get desktop state again
+    # 工具调用的 await 已保证其执行完毕，无需再等待 / Awaiting the tool call already orders it before this fetch
+    desktop_after = await agent_client.get_desktop_from_computer(computer, timeout=_DESKTOP_TIMEOUT)
+    assert "desktops" in desktop_after
+    desktops_after = desktop_after["desktops"]
+
+    # 4. 验证桌面信息一致性 / Verify desktop info consistency
+    # 桌面窗口应该保持一致（因为我们的测试 MCP Server 返回固定的窗口列表）
+    # Desktop windows should be consistent (our test MCP Server returns fixed window list)
+    assert len(desktops_after) >= 1
+    assert any("window://" in d for d in desktops_after)
+
+
+# 中文: 共享同一套前置步骤（Computer 加入办公室、Agent 拿到工具列表）的场景，按名称分派
+# English: Scenarios sharing the same setup (Computer joins the office, Agent gets the tool list), dispatched by name
+_SCENARIOS = {
+    "basic_flow": _scenario_basic_flow,
+    "tool_call": _scenario_tool_call,
+    "multi_tool": _scenario_multi_tool,
+    "desktop_sync": _scenario_desktop_sync,
+}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("scenario", list(_SCENARIOS))
+async def test_async_integration_scenario(
+    scenario: str,
+    joined_office: tuple[AsyncSMCPAgentClient, MockAsyncEventHandler, str, str, list[SMCPTool]],
+) -> None:
+    """
+    中文: 在共享的 Computer / Agent 上依次运行各场景，前置步骤由 joined_office 夹具完成，场景只做各自的断言。
+          离开通知会完整断开 Computer，单独放在下方的测试中并使用独立的 Computer。
+    English: Run each scenario on the shared Computer / Agent; the joined_office fixture does the common setup and each
+          scenario only runs its own assertions. The leave notification disconnects the Computer fully, so it lives in
+          the separate test below with its own Computer.
+    """
+    await _SCENARIOS[scenario](*joined_office)
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_async_integration_computer_leave_notification(
     async_integration_socketio_server,
     async_integration_server_port: int,
+    pooled_agent: tuple[AsyncSMCPAgentClient, MockAsyncEventHandler, str],
     tmp_path: Path,
 ):
     """
@@ -381,66 +510,31 @@ async def test_async_integration_computer_leave_notification(
       - Verify Agent receives notification when Computer leaves office
       - Verify notification contains correct office ID and Computer info
     """
-    # 在 SMCP 协议中，agent_id 和 office_id 必须保持一致 / In SMCP protocol, agent_id and office_id must be consistent
-    agent_id = "async-integration-office-3"
-    office_id = agent_id
+    # 池中取出的 Agent 已连接并加入其自身的办公室 / The pooled Agent is connected and already in its own office
+    agent_client, event_handler, office_id = pooled_agent
     server_url = f"http://127.0.0.1:{async_integration_server_port}"
 
-    # 创建 MCP Server 配置 / Create MCP Server config
-    mcp_config = _create_mcp_config(
-        "e2e-async-integration-server-3",
-        "tests/integration_tests/computer/mcp_servers/resources_subscribe_stdio_server.py",
-    )
-    stdio_config = StdioServerConfig(**mcp_config)
-
-    # 创建 Computer 实例 / Create Computer instance
+    # 创建独立的 Computer 实例：本测试要完整断开，不能用共享 Computer；名称须与其 "test" 区分
+    # Create a dedicated Computer: this test disconnects fully, so not the shared one; its name must differ from "test"
     computer = Computer(
-        name="test",
-        mcp_servers={stdio_config},
+        name="test-leave",
+        mcp_servers={_STDIO_CONFIG},
         auto_connect=True,
     )
     computer_client = SMCPComputerClient(computer=computer)
 
-    # 创建 Agent 客户端 / Create Agent client
-    auth_provider = DefaultAgentAuthProvider(
-        agent_id=agent_id,
-        office_id=office_id,
-    )
-    event_handler = MockAsyncEventHandler()
-    agent_client = AsyncSMCPAgentClient(
-        auth_provider=auth_provider,
-        event_handler=event_handler,
-    )
-
     try:
-        # 1. Agent 先连接并加入办公室 / Agent connects and joins office first
-        await agent_client.connect_to_server(server_url)
-        await asyncio.sleep(0.2)
-
-        await agent_client.call(
-            JOIN_OFFICE_EVENT,
-            {"role": "agent", "name": "test-agent-async-3", "office_id": office_id},
-            namespace=SMCP_NAMESPACE,
-            timeout=5,
-        )
-        await asyncio.sleep(0.3)
-
         # 2. Computer 启动并连接到 Server / Computer boots up and connects to Server
-        await computer.boot_up()
-        await computer_client.connect(
-            server_url,
-            socketio_path="/socket.io",
-            namespaces=[SMCP_NAMESPACE],
-            transports=["polling"],
-        )
+        await _boot_and_connect(computer, computer_client, server_url)
         await computer_client.join_office(office_id)
 
-        # 3. 等待事件传播 / Wait for event propagation
-        await asyncio.sleep(1.0)
+        # 3. 等待 Agent 收到加入通知（不再固定延时）/ Await the enter notification (no fixed delay)
+        assert await event_handler.wait_for_enter(timeout=_JOIN_TIMEOUT), (
+            "Agent did not receive Computer enter office notification"
+        )
 
-        # 等待 Agent 收到加入通知并完成工具获取 / Wait for Agent to receive join notification and complete tool fetching
-        assert await _wait_until(lambda: len(event_handler.enter_office_events) >= 1, timeout=5)
-        assert await _wait_until(lambda: len(event_handler.tools_received_events) >= 1, timeout=5), (
+        # 等待 Agent 完成工具获取 / Wait for Agent to complete tool fetching
+        assert await event_handler.wait_for_tools(timeout=_TOOL_CALL_TIMEOUT), (
             "Agent did not receive tools from Computer"
         )
 
@@ -451,7 +545,7 @@ async def test_async_integration_computer_leave_notification(
         print(f"[E2E Test2] Computer Client disconnect took {time.time() - t:.2f}s")
 
         # 3. 验证 Agent 收到离开通知 / Verify Agent received leave notification
-        assert await _wait_until(lambda: len(event_handler.leave_office_events) >= 1, timeout=5), (
+        assert await event_handler.wait_for_leave(timeout=_JOIN_TIMEOUT), (
             "Agent did not receive Computer leave office notification"
         )
 
@@ -462,256 +556,9 @@ async def test_async_integration_computer_leave_notification(
         print(f"测试未通过 : {e}")
         pytest.fail(f"Error: {e}")
     finally:
-        # 清理资源 / Cleanup resources
-        await agent_client.disconnect()
-
+        # 清理资源（Agent 由 pooled_agent 夹具归还池中）/ Cleanup resources (pooled_agent returns the Agent to the pool)
         # 显式调用 Computer.shutdown() 清理 MCP Server 进程
         # 注意：跳过 computer_client.disconnect()，因为它会等待30秒超时
         # Explicitly call Computer.shutdown() to cleanup MCP Server processes
         # Note: Skip computer_client.disconnect() as it waits for 30s timeout
         await computer.shutdown()
-
-
-@pytest.mark.asyncio
-async def test_async_integration_multiple_tool_calls(
-    async_integration_socketio_server,
-    async_integration_server_port: int,
-    tmp_path: Path,
-):
-    """
-    中文:
-      - 验证 Agent 可以连续调用多个工具
-      - 验证每次调用都能正确返回结果
-      - 验证并发调用的正确性
-    English:
-      - Verify Agent can call multiple tools consecutively
-      - Verify each call returns correct results
-      - Verify correctness of concurrent calls
-    """
-    # 在 SMCP 协议中，agent_id 和 office_id 必须保持一致 / In SMCP protocol, agent_id and office_id must be consistent
-    agent_id = "async-integration-office-4"
-    office_id = agent_id
-    server_url = f"http://127.0.0.1:{async_integration_server_port}"
-
-    # 创建 MCP Server 配置 / Create MCP Server config
-    mcp_config = _create_mcp_config(
-        "e2e-async-integration-server-4",
-        "tests/integration_tests/computer/mcp_servers/resources_subscribe_stdio_server.py",
-    )
-    stdio_config = StdioServerConfig(**mcp_config)
-
-    # 创建 Computer 实例 / Create Computer instance
-    computer = Computer(
-        name="test",
-        mcp_servers={stdio_config},
-        auto_connect=True,
-    )
-    computer_client = SMCPComputerClient(computer=computer)
-
-    # 创建 Agent 客户端 / Create Agent client
-    auth_provider = DefaultAgentAuthProvider(
-        agent_id=agent_id,
-        office_id=office_id,
-    )
-    event_handler = MockAsyncEventHandler()
-    agent_client = AsyncSMCPAgentClient(
-        auth_provider=auth_provider,
-        event_handler=event_handler,
-    )
-
-    try:
-        # 1. Agent 先连接并加入办公室 / Agent connects and joins office first
-        await agent_client.connect_to_server(server_url)
-        await asyncio.sleep(0.2)
-
-        await agent_client.call(
-            JOIN_OFFICE_EVENT,
-            {"role": "agent", "name": "test-agent-async-4", "office_id": office_id},
-            namespace=SMCP_NAMESPACE,
-            timeout=5,
-        )
-        await asyncio.sleep(0.3)
-
-        # 2. Computer 启动并连接到 Server / Computer boots up and connects to Server
-        await computer.boot_up()
-        await computer_client.connect(
-            server_url,
-            socketio_path="/socket.io",
-            namespaces=[SMCP_NAMESPACE],
-            transports=["polling"],
-        )
-        await computer_client.join_office(office_id)
-
-        # 3. 等待事件传播 / Wait for event propagation
-        await asyncio.sleep(1.0)
-
-        # 等待 Agent 收到工具列表 / Wait for Agent to receive tool list
-        assert await _wait_until(lambda: len(event_handler.tools_received_events) >= 1, timeout=5)
-        computer_sid, tools = event_handler.tools_received_events[0]
-
-        # 2. 连续调用工具多次 / Call tool multiple times
-        results = []
-        for _ in range(3):
-            result = await agent_client.emit_tool_call(
-                computer=computer_sid,
-                tool_name="mark_a",
-                params={},
-                timeout=15,  # 增加超时时间 / Increase timeout
-            )
-            results.append(result)
-            await asyncio.sleep(0.3)  # 增加延迟避免过快调用 / Increase delay to avoid rapid calls
-
-        # 3. 验证所有调用都成功 / Verify all calls succeeded
-        assert len(results) == 3
-        for i, result in enumerate(results):
-            assert result.isError is False, f"Tool call {i} failed: {result}"
-            assert len(result.content) >= 1
-            assert "ok:mark_a" in result.content[0].text
-
-        # 4. 测试并发调用 / Test concurrent calls
-        concurrent_tasks = [
-            agent_client.emit_tool_call(
-                computer=computer_sid,
-                tool_name="mark_a",
-                params={},
-                timeout=15,  # 增加超时时间 / Increase timeout
-            )
-            for _ in range(3)
-        ]
-        concurrent_results = await asyncio.gather(*concurrent_tasks)
-
-        # 验证并发调用都成功 / Verify concurrent calls succeeded
-        assert len(concurrent_results) == 3
-        for i, result in enumerate(concurrent_results):
-            assert result.isError is False, f"Concurrent tool call {i} failed: {result}"
-            assert len(result.content) >= 1
-            assert "ok:mark_a" in result.content[0].text
-    except Exception as e:
-        print(f"测试未通过 : {e}")
-        pytest.fail(f"Error: {e}")
-    finally:
-        # 清理资源 / Cleanup resources
-        # 先断开 Agent / Disconnect Agent first
-        await agent_client.disconnect()
-        await asyncio.sleep(0.2)
-
-        # 然后断开 Computer / Then disconnect Computer
-        if computer_client.connected:
-            await computer_client.leave_office(office_id)
-            await asyncio.sleep(0.1)
-            await computer_client.disconnect()
-        await asyncio.sleep(0.2)
-
-
-@pytest.mark.asyncio
-async def test_async_integration_desktop_sync_after_tool_call(
-    async_integration_socketio_server,
-    async_integration_server_port: int,
-    tmp_path: Path,
-):
-    """
-    中文:
-      - 验证调用工具后桌面信息保持同步
-      - 验证 Agent 可以获取最新的桌面状态
-    English:
-      - Verify desktop info stays synced after tool calls
-      - Verify Agent can retrieve latest desktop state
-    """
-    # 在 SMCP 协议中，agent_id 和 office_id 必须保持一致 / In SMCP protocol, agent_id and office_id must be consistent
-    agent_id = "async-integration-office-5"
-    office_id = agent_id
-    server_url = f"http://127.0.0.1:{async_integration_server_port}"
-
-    # 创建 MCP Server 配置 / Create MCP Server config
-    mcp_config = _create_mcp_config(
-        "e2e-async-integration-server-5",
-        "tests/integration_tests/computer/mcp_servers/resources_subscribe_stdio_server.py",
-    )
-    stdio_config = StdioServerConfig(**mcp_config)
-
-    # 创建 Computer 实例 / Create Computer instance
-    computer = Computer(
-        name="test",
-        mcp_servers={stdio_config},
-        auto_connect=True,
-    )
-    computer_client = SMCPComputerClient(computer=computer)
-
-    # 创建 Agent 客户端 / Create Agent client
-    auth_provider = DefaultAgentAuthProvider(
-        agent_id=agent_id,
-        office_id=office_id,
-    )
-    event_handler = MockAsyncEventHandler()
-    agent_client = AsyncSMCPAgentClient(
-        auth_provider=auth_provider,
-        event_handler=event_handler,
-    )
-
-    try:
-        # 1. Agent 先连接并加入办公室 / Agent connects and joins office first
-        await agent_client.connect_to_server(server_url)
-        await asyncio.sleep(0.2)
-
-        await agent_client.call(
-            JOIN_OFFICE_EVENT,
-            {"role": "agent", "name": "test-agent-async-5", "office_id": office_id},
-            namespace=SMCP_NAMESPACE,
-            timeout=5,
-        )
-        await asyncio.sleep(0.3)
-
-        # 2. Computer 启动并连接到 Server / Computer boots up and connects to Server
-        await computer.boot_up()
-        await computer_client.connect(
-            server_url,
-            socketio_path="/socket.io",
-            namespaces=[SMCP_NAMESPACE],
-            transports=["polling"],
-        )
-        await computer_client.join_office(office_id)
-
-        # 3. 等待事件传播 / Wait for event propagation
-        await asyncio.sleep(1.0)
-
-        # 等待 Agent 收到工具列表 / Wait for Agent to receive tool list
-        assert await _wait_until(lambda: len(event_handler.tools_received_events) >= 1, timeout=5)
-        computer_sid, tools = event_handler.tools_received_events[0]
-
-        # 2. 获取初始桌面状态 / Get initial desktop state
-        desktop_before = await agent_client.get_desktop_from_computer(computer_sid, timeout=10)
-        assert "desktops" in desktop_before
-
-        # 3. 调用工具 / Call tool
-        result = await agent_client.emit_tool_call(
-            computer=computer_sid,
-            tool_name="mark_a",
-            params={},
-            timeout=15,  # 增加超时时间 / Increase timeout
-        )
-        assert result.isError is False
-
-        # 4. 再次获取桌面状态 / Get desktop state again
-        await asyncio.sleep(0.5)  # 增加等待时间 / Increase wait time
-        desktop_after = await agent_client.get_desktop_from_computer(computer_sid, timeout=10)
-        assert "desktops" in desktop_after
-        desktops_after = desktop_after["desktops"]
-
-        # 5. 验证桌面信息一致性 / Verify desktop info consistency
-        # 桌面窗口应该保持一致（因为我们的测试 MCP Server 返回固定的窗口列表）
-        # Desktop windows should be consistent (our test MCP Server returns fixed window list)
-        assert len(desktops_after) >= 1
-        assert any("window://" in d for d in desktops_after)
-
-    finally:
-        # 清理资源 / Cleanup resources
-        # 先断开 Agent / Disconnect Agent first
-        await agent_client.disconnect()
-        await asyncio.sleep(0.2)
-
-        # 然后断开 Computer / Then disconnect Computer
-        if computer_client.connected:
-            await computer_client.leave_office(office_id)
-            await asyncio.sleep(0.1)
-            await computer_client.disconnect()
-        await asyncio.sleep(0.2)
@@ -20,13 +20,17 @@ English: Asynchronous end-to-end tests for VRL functionality in Computer-Agent-S
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import functools
 import json
 import sys
-import time
+from collections.abc import AsyncIterator, Callable
 from pathlib import Path
 from typing import Any
 
 import pytest
+import pytest_asyncio
+from mcp.types import CallToolResult
 
 from a2c_smcp.agent import AsyncSMCPAgentClient, DefaultAgentAuthProvider
 from a2c_smcp.agent.types import AsyncAgentEventHandler
@@ -44,24 +48,27 @@ from a2c_smcp.smcp import (
 
 pytestmark = pytest.mark.e2e
 
+# 中文: 项目根目录，导入时解析一次 / English: Project root, resolved once at import
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 
-async def _wait_until(cond, timeout: float = 3.0, step: float = 0.01) -> bool:
-    """
-    中文: 简易异步等待辅助函数，直到条件满足或超时。
-    English: Simple async wait helper until condition met or timeout.
-    """
-    end = asyncio.get_event_loop().time() + timeout
-    while asyncio.get_event_loop().time() < end:
-        if cond():
-            return True
-        await asyncio.sleep(step)
-    return cond()
+# 中文: 优先使用 orjson 解析 VRL 结果（直接处理 UTF-8，解析更快）；未安装时回退到标准库 json
+# English: Prefer orjson for parsing VRL results (works on UTF-8 directly, faster); fall back to stdlib json when absent
+try:
+    import orjson
+
+    _loads_json: Callable[[str | bytes], Any] = orjson.loads
+except ImportError:
+    _loads_json = json.loads
 
 
 class MockAsyncEventHandler(AsyncAgentEventHandler):
     """
-    中文: 测试用的异步事件处理器，记录所有事件
-    English: Test async event handler that records all events
+    中文: 测试用的异步事件处理器，记录所有事件；每类回调另置一个 asyncio.Event，测试可直接等待事件到达而无需固定延时。
+          工具列表由 asyncio.Condition 保护，测试可等待“至少收到 N 次”这类条件，状态变化时即被唤醒。
+    English: Test async event handler that records all events; each callback also sets an asyncio.Event so tests can
+             await the event's arrival instead of sleeping a fixed delay. The tool lists are guarded by an
+             asyncio.Condition so tests can wait for predicates such as "received at least N times" and wake on the
+             state change itself.
     """
 
     def __init__(self):
@@ -69,18 +76,50 @@ class MockAsyncEventHandler(AsyncAgentEventHandler):
         self.leave_office_events: list[LeaveOfficeNotification] = []
         self.update_config_events: list[UpdateMCPConfigNotification] = []
         self.tools_received_events: list[tuple[str, list[SMCPTool]]] = []
+        self.enter_office_evt = asyncio.Event()
+        self.leave_office_evt = asyncio.Event()
+        self.update_config_evt = asyncio.Event()
+        self._tools_cond = asyncio.Condition()
 
     async def on_computer_enter_office(self, data: EnterOfficeNotification, sio: AsyncSMCPAgentClient) -> None:
         self.enter_office_events.append(data)
+        self.enter_office_evt.set()
 
     async def on_computer_leave_office(self, data: LeaveOfficeNotification, sio: AsyncSMCPAgentClient) -> None:
         self.leave_office_events.append(data)
+        self.leave_office_evt.set()
 
     async def on_computer_update_config(self, data: UpdateMCPConfigNotification, sio: AsyncSMCPAgentClient) -> None:
         self.update_config_events.append(data)
+        self.update_config_evt.set()
 
     async def on_tools_received(self, computer: str, tools: list[SMCPTool], sio: AsyncSMCPAgentClient) -> None:
-        self.tools_received_events.append((computer, tools))
+        async with self._tools_cond:
+            self.tools_received_events.append((computer, tools))
+            self._tools_cond.notify_all()
+
+    async def wait_for_tools(self, count: int = 1, timeout: float = 5) -> bool:
+        """
+        中文: 等待至少收到 count 次工具列表，返回是否在超时前满足。
+        English: Wait until at least `count` tool lists have been received; return whether that happened in time.
+        """
+        # asyncio.timeout 直接在当前任务上设置截止时间，不像 wait_for 那样另建包装任务
+        # asyncio.timeout sets a deadline on the current task instead of wrapping the wait in a new task like wait_for
+        async with self._tools_cond:
+            with contextlib.suppress(TimeoutError):
+                async with asyncio.timeout(timeout):
+                    await self._tools_cond.wait_for(lambda: len(self.tools_received_events) >= count)
+            return len(self.tools_received_events) >= count
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_script(script_path: str) -> str:
+    """
+    中文: 将相对项目根目录的脚本路径解析为绝对路径并缓存，确保在不同工作目录下都能找到文件，且每个路径只访问一次文件系统
+    English: Resolve a script path relative to the project root to an absolute path and cache it, so the file is found
+             from any working directory and each path hits the filesystem only once
+    """
+    return str((_PROJECT_ROOT / script_path).resolve())
 
 
 def _create_mcp_config_with_vrl(name: str, script_path: str, vrl_script: str | None = None) -> dict[str, Any]:
@@ -88,9 +127,6 @@ def _create_mcp_config_with_vrl(name: str, script_path: str, vrl_script: str | N
     中文: 创建带 VRL 配置的 MCP Server 配置
     English: Create MCP Server config with VRL script
     """
-    project_root = Path(__file__).parent.parent.parent
-    absolute_script_path = (project_root / script_path).resolve()
-
     config = {
         "name": name,
         "type": "stdio",
@@ -100,7 +136,7 @@ def _create_mcp_config_with_vrl(name: str, script_path: str, vrl_script: str | N
         "default_tool_meta": {"auto_apply": True},
         "server_parameters": {
             "command": sys.executable,
-            "args": [str(absolute_script_path)],
+            "args": [_resolve_script(script_path)],
             "env": None,
             "cwd": None,
             "encoding": "utf-8",
@@ -115,197 +151,169 @@ def _create_mcp_config_with_vrl(name: str, script_path: str, vrl_script: str | N
     return config
 
 
-@pytest.mark.asyncio
-async def test_async_integration_agent_receives_vrl_transformed_result(
-    async_integration_socketio_server,
-    async_integration_server_port: int,
-    tmp_path: Path,
-):
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def vrl_harness(async_integration_socketio_server, async_integration_server_port: int):
     """
-    中文:
-      - 验证 Computer 配置了 VRL 脚本
-      - 验证 Agent 调用工具后收到的结果包含 VRL 转换数据
-      - 验证 VRL 转换结果存储在 meta[a2c_vrl_transformed] 中
-      - 验证转换后的数据结构符合 VRL 脚本定义
-    English:
-      - Verify Computer is configured with VRL script
-      - Verify Agent receives VRL transformed result after tool call
-      - Verify VRL transformation is stored in meta[a2c_vrl_transformed]
-      - Verify transformed data structure matches VRL script definition
+    中文: 模块内共享的 Agent 与 Computer：Agent 连接并加入办公室，Computer（不带 MCP Server）启动、连接并加入同一办公室，
+          三个 VRL 测试只各自挂载带不同 VRL 脚本的 MCP Server，返回 (agent_client, computer, computer_client, event_handler)。
+    English: Module-shared Agent and Computer: the Agent connects and joins the office, the Computer (without MCP
+          servers) boots, connects and joins the same office; the three VRL tests only mount an MCP server with their
+          own VRL script, yielding (agent_client, computer, computer_client, event_handler).
     """
-    agent_id = "async-vrl-integration-office-1"
-    office_id = agent_id
+    # 在 SMCP 协议中 agent_id 与 office_id 必须一致 / SMCP requires agent_id and office_id to match
+    office_id = "async-vrl-integration-office"
     server_url = f"http://127.0.0.1:{async_integration_server_port}"
 
-    # 配置 VRL 脚本：添加转换标记和额外字段
-    # Configure VRL script: add transformation marker and extra fields
-    vrl_script = """
-.vrl_transformed = true
-.transformation_timestamp = now()
-.status = "processed"
-.original_tool_name = .content[0].text
-"""
-
-    # 创建带 VRL 配置的 MCP Server
-    # Create MCP Server config with VRL
-    mcp_config = _create_mcp_config_with_vrl(
-        "e2e-vrl-integration-server-1",
-        "tests/integration_tests/computer/mcp_servers/resources_subscribe_stdio_server.py",
-        vrl_script=vrl_script,
-    )
-    stdio_config = StdioServerConfig(**mcp_config)
-
-    # 创建 Computer 实例
-    # Create Computer instance
-    computer = Computer(
-        name="test",
-        mcp_servers={stdio_config},
-        auto_connect=True,
-    )
+    # 整个会话共享同一服务端，Computer 名称需在命名空间内唯一 / The server is shared per session, so Computer names must be unique
+    computer = Computer(name="test-vrl", auto_connect=True)
     computer_client = SMCPComputerClient(computer=computer)
 
-    # 创建 Agent 客户端
-    # Create Agent client
-    auth_provider = DefaultAgentAuthProvider(
-        agent_id=agent_id,
-        office_id=office_id,
-    )
     event_handler = MockAsyncEventHandler()
     agent_client = AsyncSMCPAgentClient(
-        auth_provider=auth_provider,
+        auth_provider=DefaultAgentAuthProvider(agent_id=office_id, office_id=office_id),
         event_handler=event_handler,
     )
 
     try:
-        start_time = time.time()
-
         # 1. Agent 先连接并加入办公室
         # Agent connects and joins office first
-        await agent_client.connect_to_server(server_url)
-        await asyncio.sleep(0.2)
-
+        # 直连 websocket，原因见 serve_asgi / connect over websocket directly; see serve_asgi for why
+        await agent_client.connect_to_server(server_url, transports=["websocket"])
         ok, err = await agent_client.call(
             JOIN_OFFICE_EVENT,
-            {"role": "agent", "name": "test-agent-vrl-1", "office_id": office_id},
+            {"role": "agent", "name": "test-agent-vrl", "office_id": office_id},
             namespace=SMCP_NAMESPACE,
             timeout=5,
         )
         assert ok is True, f"Agent join office failed: {err}"
-        await asyncio.sleep(0.3)
 
-        # 2. Computer 启动并连接到 Server
-        # Computer boots up and connects to Server
+        # 2. Computer 启动并连接到 Server，加入同一办公室
+        # Computer boots up, connects to Server and joins the same office
         await computer.boot_up()
         await computer_client.connect(
             server_url,
             socketio_path="/socket.io",
             namespaces=[SMCP_NAMESPACE],
-            transports=["polling"],
+            transports=["websocket"],
         )
         await computer_client.join_office(office_id)
+        await asyncio.wait_for(event_handler.enter_office_evt.wait(), timeout=5)
 
-        # 3. 等待事件传播
-        # Wait for event propagation
-        await asyncio.sleep(1.0)
-
-        # 4. 验证 Agent 收到工具列表
-        # Verify Agent received tool list
-        assert await _wait_until(lambda: len(event_handler.tools_received_events) >= 1, timeout=5)
-        computer_name, tools = event_handler.tools_received_events[0]
-        assert computer_name == "test", "回调工具列表时，使用的是computer name"
+        yield agent_client, computer, computer_client, event_handler
+    finally:
+        # 清理资源
+        # Cleanup resources
+        # 中文: Agent 断开与 Computer 关闭互不依赖，并发执行；收集异常以免一方失败阻断另一方清理
+        # English: Agent disconnect and Computer shutdown are independent, so run them concurrently; collect
+        # exceptions so one failing does not block the other's cleanup
+        await asyncio.gather(agent_client.disconnect(), computer.shutdown(), return_exceptions=True)
+
+
+@contextlib.asynccontextmanager
+async def _mounted_vrl_server(
+    vrl_harness: tuple[AsyncSMCPAgentClient, Computer, SMCPComputerClient, MockAsyncEventHandler],
+    name: str,
+    vrl_script: str,
+) -> AsyncIterator[str]:
+    """
+    中文: 在共享 Computer 上挂载带 VRL 脚本的 MCP Server 并通知 Agent 配置更新，等待 Agent 重新拉取到工具列表后
+          返回回调中的 computer name；退出时移除该 Server，供下一个测试挂载自己的脚本。
+    English: Mount an MCP server with the VRL script on the shared Computer and notify the Agent of the config update;
+          once the Agent has re-fetched the tool list, yield the computer name from the callback. The server is
+          removed on exit so the next test can mount its own script.
+    """
+    _, computer, computer_client, event_handler = vrl_harness
+    mcp_config = _create_mcp_config_with_vrl(
+        name,
+        "tests/integration_tests/computer/mcp_servers/resources_subscribe_stdio_server.py",
+        vrl_script=vrl_script,
+    )
+    seen = len(event_handler.tools_received_events)
+    await computer.aadd_or_aupdate_server(StdioServerConfig(**mcp_config))
+    try:
+        await computer_client.emit_update_config()
 
-        # 5. Agent 调用工具
-        # Agent calls tool
-        result = await agent_client.emit_tool_call(
-            computer=computer_name,
-            tool_name="mark_a",
-            params={},
-            timeout=15,
-        )
+        # 等待 Agent 收到新的工具列表 / Await the Agent receiving the new tool list
+        assert await event_handler.wait_for_tools(count=seen + 1, timeout=5), "Agent did not receive tools list"
+        computer_name, _ = event_handler.tools_received_events[-1]
+        yield computer_name
+    finally:
+        await computer.aremove_server(name)
 
-        # 6. 验证工具调用成功
-        # Verify tool call succeeded
-        assert result.isError is False, f"Tool call failed: {result}"
-        assert len(result.content) >= 1
-        assert "ok:mark_a" in result.content[0].text
-
-        # 7. 验证 VRL 转换结果存在于 meta 中
-        # Verify VRL transformation result exists in meta
-        # 注意：由于Pydantic模型的序列化问题，meta可能在model_extra中
-        # Note: Due to Pydantic model serialization, meta might be in model_extra
-        result_dict = result.model_dump()
-        print(f"[E2E VRL] Full result dict keys: {result_dict.keys()}")
-        print(f"[E2E VRL] Result meta field: {result.meta}")
-
-        # 尝试从多个位置获取meta数据
-        # Try to get meta data from multiple locations
-        meta_data = result.meta or result_dict.get("meta") or {}
-
-        assert meta_data, f"Tool result meta is empty. Result dict: {result_dict}"
-        assert A2C_VRL_TRANSFORMED in meta_data, (
-            f"VRL transformation key '{A2C_VRL_TRANSFORMED}' not found in meta. Available keys: {list(meta_data.keys())}"
-        )
 
-        # 8. 解析 VRL 转换结果
-        # Parse VRL transformation result
-        vrl_result_json = meta_data[A2C_VRL_TRANSFORMED]
-        assert isinstance(vrl_result_json, str), f"VRL result should be JSON string, got {type(vrl_result_json)}"
+def _extract_meta(result: CallToolResult) -> dict[str, Any]:
+    """
+    中文: 取出工具结果的 meta：优先读 result.meta，缺失时再读 pydantic 额外字段中的 "meta"，全程不调用 model_dump()。
+    English: Get the tool result's meta: read result.meta first and fall back to "meta" among the pydantic extra fields,
+        without ever calling model_dump().
+    """
+    if result.meta:
+        return result.meta
+    extra = getattr(result, "__pydantic_extra__", None) or {}
+    return extra.get("meta") or {}
 
-        vrl_result = json.loads(vrl_result_json)
-        print(f"[E2E VRL] VRL transformation result: {vrl_result}")
 
-        # 9. 验证 VRL 转换后的字段
-        # Verify VRL transformed fields
-        assert "vrl_transformed" in vrl_result, f"'vrl_transformed' field not found in VRL result: {vrl_result}"
-        assert vrl_result["vrl_transformed"] is True, f"'vrl_transformed' should be True, got {vrl_result['vrl_transformed']}"
+# 配置 VRL 脚本：添加转换标记和额外字段
+# Configure VRL script: add transformation marker and extra fields
+_VRL_TRANSFORMED_SCRIPT = """
+.vrl_transformed = true
+.transformation_timestamp = now()
+.status = "processed"
+.original_tool_name = .content[0].text
+"""
 
-        assert "status" in vrl_result, f"'status' field not found in VRL result: {vrl_result}"
-        assert vrl_result["status"] == "processed", f"'status' should be 'processed', got {vrl_result['status']}"
 
-        assert "transformation_timestamp" in vrl_result, f"'transformation_timestamp' field not found in VRL result: {vrl_result}"
+def _assert_vrl_transformed_result(result: CallToolResult) -> None:
+    """
+    中文:
+      - 验证 Agent 调用工具后收到的结果包含 VRL 转换数据
+      - 验证 VRL 转换结果存储在 meta[a2c_vrl_transformed] 中
+      - 验证转换后的数据结构符合 VRL 脚本定义
+    English:
+      - Verify Agent receives VRL transformed result after tool call
+      - Verify VRL transformation is stored in meta[a2c_vrl_transformed]
+      - Verify transformed data structure matches VRL script definition
+    """
+    assert len(result.content) >= 1, "Tool result content is empty"
+    assert "ok:mark_a" in result.content[0].text, f"Unexpected tool output: {result.content[0].text}"
+
+    # 1. 验证 VRL 转换结果存在于 meta 中
+    # Verify VRL transformation result exists in meta
+    meta_data = _extract_meta(result)
+
+    # 完整的 model_dump() 只在断言失败时作为诊断信息生成
+    # The full model_dump() is only built as a diagnostic when the assertion fails
+    assert meta_data, f"Tool result meta is empty. Result dict: {result.model_dump()}"
+    assert A2C_VRL_TRANSFORMED in meta_data, (
+        f"VRL transformation key '{A2C_VRL_TRANSFORMED}' not found in meta. Available keys: {list(meta_data.keys())}"
+    )
 
-        assert "original_tool_name" in vrl_result, f"'original_tool_name' field not found in VRL result: {vrl_result}"
-        assert "ok:mark_a" in vrl_result["original_tool_name"], (
-            f"'original_tool_name' should contain 'ok:mark_a', got {vrl_result['original_tool_name']}"
-        )
+    # 2. 解析 VRL 转换结果
+    # Parse VRL transformation result
+    vrl_result_json = meta_data[A2C_VRL_TRANSFORMED]
+    assert isinstance(vrl_result_json, str), f"VRL result should be JSON string, got {type(vrl_result_json)}"
 
-        print(f"[E2E VRL] Test completed successfully in {time.time() - start_time:.2f}s")
+    vrl_result = _loads_json(vrl_result_json)
 
-    finally:
-        # 清理资源
-        # Cleanup resources
-        cleanup_start = time.time()
+    # 3. 验证 VRL 转换后的字段
+    # Verify VRL transformed fields
+    assert "vrl_transformed" in vrl_result, f"'vrl_transformed' field not found in VRL result: {vrl_result}"
+    assert vrl_result["vrl_transformed"] is True, f"'vrl_transformed' should be True, got {vrl_result['vrl_transformed']}"
 
-        await agent_client.disconnect()
-        print(f"[E2E VRL] Agent disconnect took {time.time() - cleanup_start:.2f}s")
+    assert "status" in vrl_result, f"'status' field not found in VRL result: {vrl_result}"
+    assert vrl_result["status"] == "processed", f"'status' should be 'processed', got {vrl_result['status']}"
 
-        await computer.shutdown()
-        print(f"[E2E VRL] Computer shutdown took {time.time() - cleanup_start:.2f}s")
+    assert "transformation_timestamp" in vrl_result, f"'transformation_timestamp' field not found in VRL result: {vrl_result}"
 
+    assert "original_tool_name" in vrl_result, f"'original_tool_name' field not found in VRL result: {vrl_result}"
+    assert "ok:mark_a" in vrl_result["original_tool_name"], (
+        f"'original_tool_name' should contain 'ok:mark_a', got {vrl_result['original_tool_name']}"
+    )
 
-@pytest.mark.asyncio
-async def test_async_integration_vrl_field_mapping_and_extraction(
-    async_integration_socketio_server,
-    async_integration_server_port: int,
-    tmp_path: Path,
-):
-    """
-    中文:
-      - 验证 VRL 可以提取和重组工具返回的数据结构
-      - 验证 Agent 可以获取经过 VRL 处理后的结构化数据
-      - 验证复杂的 VRL 转换逻辑（字段提取、嵌套对象等）
-    English:
-      - Verify VRL can extract and reorganize tool return data structure
-      - Verify Agent can receive VRL-processed structured data
-      - Verify complex VRL transformation logic (field extraction, nested objects, etc.)
-    """
-    agent_id = "async-vrl-integration-office-2"
-    office_id = agent_id
-    server_url = f"http://127.0.0.1:{async_integration_server_port}"
 
-    # 配置复杂的 VRL 脚本：提取内容并重组为新结构
-    # Configure complex VRL script: extract content and reorganize into new structure
-    vrl_script = """
+# 配置复杂的 VRL 脚本：提取内容并重组为新结构
+# Configure complex VRL script: extract content and reorganize into new structure
+_VRL_FIELD_MAPPING_SCRIPT = """
 .result = {
     "success": true,
     "data": {
@@ -321,127 +329,57 @@ async def test_async_integration_vrl_field_mapping_and_extraction(
 .summary = "Tool executed successfully"
 """
 
-    # 创建带 VRL 配置的 MCP Server
-    # Create MCP Server config with VRL
-    mcp_config = _create_mcp_config_with_vrl(
-        "e2e-vrl-integration-server-2",
-        "tests/integration_tests/computer/mcp_servers/resources_subscribe_stdio_server.py",
-        vrl_script=vrl_script,
-    )
-    stdio_config = StdioServerConfig(**mcp_config)
-
-    # 创建 Computer 实例
-    # Create Computer instance
-    computer = Computer(
-        name="test",
-        mcp_servers={stdio_config},
-        auto_connect=True,
-    )
-    computer_client = SMCPComputerClient(computer=computer)
 
-    # 创建 Agent 客户端
-    # Create Agent client
-    auth_provider = DefaultAgentAuthProvider(
-        agent_id=agent_id,
-        office_id=office_id,
-    )
-    event_handler = MockAsyncEventHandler()
-    agent_client = AsyncSMCPAgentClient(
-        auth_provider=auth_provider,
-        event_handler=event_handler,
-    )
-
-    try:
-        # 1. Agent 先连接并加入办公室
-        # Agent connects and joins office first
-        await agent_client.connect_to_server(server_url)
-        await asyncio.sleep(0.2)
-
-        await agent_client.call(
-            JOIN_OFFICE_EVENT,
-            {"role": "agent", "name": "test-agent-vrl-2", "office_id": office_id},
-            namespace=SMCP_NAMESPACE,
-            timeout=5,
-        )
-        await asyncio.sleep(0.3)
-
-        # 2. Computer 启动并连接到 Server
-        # Computer boots up and connects to Server
-        await computer.boot_up()
-        await computer_client.connect(
-            server_url,
-            socketio_path="/socket.io",
-            namespaces=[SMCP_NAMESPACE],
-            transports=["polling"],
-        )
-        await computer_client.join_office(office_id)
-
-        # 3. 等待事件传播
-        # Wait for event propagation
-        await asyncio.sleep(1.0)
-
-        # 4. 验证 Agent 收到工具列表
-        # Verify Agent received tool list
-        assert await _wait_until(lambda: len(event_handler.tools_received_events) >= 1, timeout=5)
-        computer_name, tools = event_handler.tools_received_events[0]
-        assert computer_name == "test", "回调工具列表时使用的是computer name"
-
-        # 5. Agent 调用工具
-        # Agent calls tool
-        result = await agent_client.emit_tool_call(
-            computer=computer_name,
-            tool_name="mark_a",
-            params={},
-            timeout=15,
-        )
-
-        # 6. 验证工具调用成功
-        # Verify tool call succeeded
-        assert result.isError is False, f"Tool call failed: {result}"
-
-        # 7. 验证 VRL 转换结果
-        # Verify VRL transformation result
-        result_dict = result.model_dump()
-        meta_data = result.meta or result_dict.get("meta") or {}
+def _assert_vrl_field_mapping_and_extraction(result: CallToolResult) -> None:
+    """
+    中文:
+      - 验证 VRL 可以提取和重组工具返回的数据结构
+      - 验证 Agent 可以获取经过 VRL 处理后的结构化数据
+      - 验证复杂的 VRL 转换逻辑（字段提取、嵌套对象等）
+    English:
+      - Verify VRL can extract and reorganize tool return data structure
+      - Verify Agent can receive VRL-processed structured data
+      - Verify complex VRL transformation logic (field extraction, nested objects, etc.)
+    """
+    # 1. 验证 VRL 转换结果
+    # Verify VRL transformation result
+    meta_data = _extract_meta(result)
 
-        assert meta_data, f"Tool result meta is empty. Result dict: {result_dict}"
-        assert A2C_VRL_TRANSFORMED in meta_data
+    assert meta_data, f"Tool result meta is empty. Result dict: {result.model_dump()}"
+    assert A2C_VRL_TRANSFORMED in meta_data, (
+        f"VRL transformation key '{A2C_VRL_TRANSFORMED}' not found in meta. Available keys: {list(meta_data.keys())}"
+    )
 
-        vrl_result = json.loads(meta_data[A2C_VRL_TRANSFORMED])
-        print(f"[E2E VRL] Complex VRL transformation result: {json.dumps(vrl_result, indent=2)}")
+    vrl_result = _loads_json(meta_data[A2C_VRL_TRANSFORMED])
 
-        # 8. 验证重组后的数据结构
-        # Verify reorganized data structure
-        assert "result" in vrl_result, f"'result' field not found in VRL result: {vrl_result}"
-        assert "success" in vrl_result["result"], "'result.success' not found"
-        assert vrl_result["result"]["success"] is True
+    # 2. 验证重组后的数据结构
+    # Verify reorganized data structure
+    assert "result" in vrl_result, f"'result' field not found in VRL result: {vrl_result}"
+    assert "success" in vrl_result["result"], "'result.success' not found"
+    assert vrl_result["result"]["success"] is True, f"'result.success' should be True: {vrl_result}"
 
-        assert "data" in vrl_result["result"], "'result.data' not found"
-        assert "tool_output" in vrl_result["result"]["data"], "'result.data.tool_output' not found"
-        assert "ok:mark_a" in vrl_result["result"]["data"]["tool_output"]
+    assert "data" in vrl_result["result"], "'result.data' not found"
+    assert "tool_output" in vrl_result["result"]["data"], "'result.data.tool_output' not found"
+    assert "ok:mark_a" in vrl_result["result"]["data"]["tool_output"], (
+        f"Unexpected 'result.data.tool_output': {vrl_result}"
+    )
 
-        assert "metadata" in vrl_result["result"], "'result.metadata' not found"
-        assert "is_error" in vrl_result["result"]["metadata"], "'result.metadata.is_error' not found"
-        assert vrl_result["result"]["metadata"]["is_error"] is False
+    assert "metadata" in vrl_result["result"], "'result.metadata' not found"
+    assert "is_error" in vrl_result["result"]["metadata"], "'result.metadata.is_error' not found"
+    assert vrl_result["result"]["metadata"]["is_error"] is False, (
+        f"'result.metadata.is_error' should be False: {vrl_result}"
+    )
 
-        assert "summary" in vrl_result, f"'summary' field not found in VRL result: {vrl_result}"
-        assert "successfully" in vrl_result["summary"].lower()
+    assert "summary" in vrl_result, f"'summary' field not found in VRL result: {vrl_result}"
+    assert "successfully" in vrl_result["summary"].lower(), f"Unexpected 'summary': {vrl_result['summary']}"
 
-        print("[E2E VRL] Complex VRL transformation test completed successfully")
 
-    finally:
-        # 清理资源
-        # Cleanup resources
-        await agent_client.disconnect()
-        await computer.shutdown()
+# 配置 VRL 脚本
+# Configure VRL script
+_VRL_PRESERVE_SCRIPT = '.vrl_marker = "this_is_vrl_transformed_data"\n.extra_info = {"key": "value"}'
 
 
-@pytest.mark.asyncio
-async def test_async_integration_vrl_preserves_original_result(
-    async_integration_socketio_server,
-    async_integration_server_port: int,
-    tmp_path: Path,
-):
+def _assert_vrl_preserves_original_result(result: CallToolResult) -> None:
     """
     中文:
       - 验证 VRL 转换不影响原始工具返回内容
@@ -452,80 +390,67 @@ async def test_async_integration_vrl_preserves_original_result(
       - Verify original content field remains unchanged
       - Verify VRL transformation result is only stored in meta
     """
-    agent_id = "async-vrl-integration-office-3"
-    office_id = agent_id
-    server_url = f"http://127.0.0.1:{async_integration_server_port}"
+    # 1. 验证原始内容保持不变
+    # Verify original content remains unchanged
+    assert len(result.content) >= 1, "Tool result content is empty"
+    assert "ok:mark_a" in result.content[0].text, f"Original content should contain 'ok:mark_a', got {result.content[0].text}"
+
+    # 2. 验证 VRL 转换结果存在于 meta 中，但不影响 content
+    # Verify VRL transformation exists in meta but doesn't affect content
+    meta_data = _extract_meta(result)
+
+    assert meta_data, f"Tool result meta is empty. Result dict: {result.model_dump()}"
+    assert A2C_VRL_TRANSFORMED in meta_data, (
+        f"VRL transformation key '{A2C_VRL_TRANSFORMED}' not found in meta. Available keys: {list(meta_data.keys())}"
+    )
 
-    # 配置 VRL 脚本
-    # Configure VRL script
-    vrl_script = '.vrl_marker = "this_is_vrl_transformed_data"\n.extra_info = {"key": "value"}'
+    vrl_result = _loads_json(meta_data[A2C_VRL_TRANSFORMED])
 
-    # 创建带 VRL 配置的 MCP Server
-    # Create MCP Server config with VRL
-    mcp_config = _create_mcp_config_with_vrl(
-        "e2e-vrl-integration-server-3",
-        "tests/integration_tests/computer/mcp_servers/resources_subscribe_stdio_server.py",
-        vrl_script=vrl_script,
-    )
-    stdio_config = StdioServerConfig(**mcp_config)
-
-    # 创建 Computer 实例
-    # Create Computer instance
-    computer = Computer(
-        name="test",
-        mcp_servers={stdio_config},
-        auto_connect=True,
-    )
-    computer_client = SMCPComputerClient(computer=computer)
+    # 3. 验证 VRL 转换的字段
+    # Verify VRL transformed fields
+    assert "vrl_marker" in vrl_result, f"'vrl_marker' field not found in VRL result: {vrl_result}"
+    assert vrl_result["vrl_marker"] == "this_is_vrl_transformed_data", f"Unexpected 'vrl_marker': {vrl_result}"
+    assert "extra_info" in vrl_result, f"'extra_info' field not found in VRL result: {vrl_result}"
+    assert vrl_result["extra_info"]["key"] == "value", f"Unexpected 'extra_info': {vrl_result}"
 
-    # 创建 Agent 客户端
-    # Create Agent client
-    auth_provider = DefaultAgentAuthProvider(
-        agent_id=agent_id,
-        office_id=office_id,
-    )
-    event_handler = MockAsyncEventHandler()
-    agent_client = AsyncSMCPAgentClient(
-        auth_provider=auth_provider,
-        event_handler=event_handler,
-    )
+    # 4. 确认原始 content 中不包含 VRL 转换的字段
+    # Confirm original content doesn't contain VRL transformed fields
+    content_text = result.content[0].text
+    assert "vrl_marker" not in content_text, "VRL transformed field should not appear in original content"
+    assert "this_is_vrl_transformed_data" not in content_text, "VRL transformed value should not appear in original content"
 
-    try:
-        # 1. Agent 先连接并加入办公室
-        # Agent connects and joins office first
-        await agent_client.connect_to_server(server_url)
-        await asyncio.sleep(0.2)
 
-        await agent_client.call(
-            JOIN_OFFICE_EVENT,
-            {"role": "agent", "name": "test-agent-vrl-3", "office_id": office_id},
-            namespace=SMCP_NAMESPACE,
-            timeout=5,
-        )
-        await asyncio.sleep(0.3)
+# 中文: 各 VRL 用例的脚本与断言，共享挂载 Server、调用工具的流程，按名称分派
+# English: Script and assertions per VRL case; they share the mount-server / call-tool flow and are dispatched by name
+_VRL_CASES: dict[str, tuple[str, Callable[[CallToolResult], None]]] = {
+    "transformed_result": (_VRL_TRANSFORMED_SCRIPT, _assert_vrl_transformed_result),
+    "field_mapping_and_extraction": (_VRL_FIELD_MAPPING_SCRIPT, _assert_vrl_field_mapping_and_extraction),
+    "preserves_original_result": (_VRL_PRESERVE_SCRIPT, _assert_vrl_preserves_original_result),
+}
 
-        # 2. Computer 启动并连接到 Server
-        # Computer boots up and connects to Server
-        await computer.boot_up()
-        await computer_client.connect(
-            server_url,
-            socketio_path="/socket.io",
-            namespaces=[SMCP_NAMESPACE],
-            transports=["polling"],
-        )
-        await computer_client.join_office(office_id)
 
-        # 3. 等待事件传播
-        # Wait for event propagation
-        await asyncio.sleep(1.0)
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("case", list(_VRL_CASES))
+async def test_async_integration_vrl(
+    case: str,
+    vrl_harness: tuple[AsyncSMCPAgentClient, Computer, SMCPComputerClient, MockAsyncEventHandler],
+) -> None:
+    """
+    中文: 在共享 Computer 上挂载带该用例 VRL 脚本的 MCP Server，Agent 调用工具后运行该用例的断言。
+    English: Mount an MCP Server with the case's VRL script on the shared Computer, have the Agent call the tool and
+          run the case's assertions.
+    """
+    agent_client = vrl_harness[0]
+    vrl_script, assert_result = _VRL_CASES[case]
 
-        # 4. 验证 Agent 收到工具列表
-        # Verify Agent received tool list
-        assert await _wait_until(lambda: len(event_handler.tools_received_events) >= 1, timeout=5)
-        computer_name, tools = event_handler.tools_received_events[0]
-        assert computer_name == "test", "回调获取工具列表时使用的是 computer name"
+    # 1. 在共享 Computer 上挂载带 VRL 配置的 MCP Server，Agent 随即重新拉取工具列表
+    # Mount an MCP Server with VRL on the shared Computer; the Agent then re-fetches the tool list
+    async with _mounted_vrl_server(vrl_harness, f"e2e-vrl-integration-server-{case}", vrl_script) as computer_name:
+        # 2. 验证 Agent 收到工具列表（回调使用共享 Computer 的 name）
+        # Verify Agent received tool list (the callback uses the shared Computer's name)
+        assert computer_name == "test-vrl", "回调工具列表时，使用的是computer name"
 
-        # 5. Agent 调用工具
+        # 3. Agent 调用工具
         # Agent calls tool
         result = await agent_client.emit_tool_call(
             computer=computer_name,
@@ -534,43 +459,7 @@ async def test_async_integration_vrl_preserves_original_result(
             timeout=15,
         )
 
-        # 6. 验证工具调用成功
-        # Verify tool call succeeded
+        # 4. 验证工具调用成功，再运行该用例的断言
+        # Verify tool call succeeded, then run the case's assertions
         assert result.isError is False, f"Tool call failed: {result}"
-
-        # 7. 验证原始内容保持不变
-        # Verify original content remains unchanged
-        assert len(result.content) >= 1, "Tool result content is empty"
-        assert "ok:mark_a" in result.content[0].text, f"Original content should contain 'ok:mark_a', got {result.content[0].text}"
-
-        # 8. 验证 VRL 转换结果存在于 meta 中，但不影响 content
-        # Verify VRL transformation exists in meta but doesn't affect content
-        result_dict = result.model_dump()
-        meta_data = result.meta or result_dict.get("meta") or {}
-
-        assert meta_data, f"Tool result meta is empty. Result dict: {result_dict}"
-        assert A2C_VRL_TRANSFORMED in meta_data
-
-        vrl_result = json.loads(meta_data[A2C_VRL_TRANSFORMED])
-        print(f"[E2E VRL] VRL result in meta: {vrl_result}")
-
-        # 9. 验证 VRL 转换的字段
-        # Verify VRL transformed fields
-        assert "vrl_marker" in vrl_result
-        assert vrl_result["vrl_marker"] == "this_is_vrl_transformed_data"
-        assert "extra_info" in vrl_result
-        assert vrl_result["extra_info"]["key"] == "value"
-
-        # 10. 确认原始 content 中不包含 VRL 转换的字段
-        # Confirm original content doesn't contain VRL transformed fields
-        content_text = result.content[0].text
-        assert "vrl_marker" not in content_text, "VRL transformed field should not appear in original content"
-        assert "this_is_vrl_transformed_data" not in content_text, "VRL transformed value should not appear in original content"
-
-        print("[E2E VRL] VRL preservation test completed successfully")
-
-    finally:
-        # 清理资源
-        # Cleanup resources
-        await agent_client.disconnect()
-        await computer.shutdown()
+        assert_result(result)
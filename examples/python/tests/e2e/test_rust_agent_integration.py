@@ -15,7 +15,8 @@ import json
 import os
 import subprocess
 import sys
-import time
+import threading
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
@@ -24,47 +25,55 @@ import socketio
 
 from a2c_smcp.smcp import (
     ENTER_OFFICE_NOTIFICATION,
+    JOIN_OFFICE_EVENT,
     LEAVE_OFFICE_NOTIFICATION,
     SMCP_NAMESPACE,
 )
 
 pytestmark = pytest.mark.e2e
 
+# 中文: Rust SDK 仓库根目录（tests/e2e -> tests -> python -> examples -> 根目录）
+# English: Rust SDK repository root (tests/e2e -> tests -> python -> examples -> root)
+_RUST_SDK_ROOT = Path(__file__).resolve().parents[4]
+
+# 中文: Rust Agent 加入、监听客户端预先进入的办公室 / English: Office the Rust Agent joins and the listener enters first
+_OFFICE_ID = "test-office"
+
 
 class RustAgentFixture:
     """中文: Rust Agent 进程管理器 / English: Rust Agent process manager"""
     
-    def __init__(self, server_url: str, agent_id: str = "rust-test-agent", 
+    def __init__(self, server_url: str, agent_binary: Path, agent_id: str = "rust-test-agent",
                  office_id: str = "test-office", api_key: str | None = None):
         self.server_url = server_url
+        self.agent_binary = agent_binary
         self.agent_id = agent_id
         self.office_id = office_id
         self.api_key = api_key
         self.process: subprocess.Popen | None = None
+        # 中文: 后台线程逐行收集的 stdout，由 Condition 保护
+        # English: stdout lines collected by a reader thread, guarded by a Condition
+        self._stdout_lines: list[str] = []
+        self._stdout_closed = False
+        self._stdout_cond = threading.Condition()
+        self._stdout_reader: threading.Thread | None = None
         
     def start(self, test_mode: str | None = None) -> None:
         """中文: 启动 Rust Agent 进程 / English: Start Rust Agent process"""
-        # 构建 Rust Agent 二进制路径
-        rust_sdk_root = Path(__file__).parent.parent.parent.parent
-        agent_binary = rust_sdk_root / "target" / "debug" / "e2e_test_agent"
-        
-        if not agent_binary.exists():
-            # 尝试构建二进制
-            print("Building Rust Agent binary...")
-            result = subprocess.run(
-                ["cargo", "build", "--example", "e2e_test_agent"],
-                cwd=rust_sdk_root,
-                capture_output=True,
-                text=True
-            )
-            if result.returncode != 0:
-                raise RuntimeError(f"Failed to build Rust Agent: {result.stderr}")
-        
         # 设置环境变量
-        env = os.environ.copy()
-        env["SMCP_SERVER_URL"] = self.server_url
-        env["SMCP_AGENT_ID"] = self.agent_id
-        env["SMCP_OFFICE_ID"] = self.office_id
+        # 中文: 只传递必需变量，不复制整个 os.environ；RUST_LOG/RUST_BACKTRACE 设置时透传。tracing 启用了 env-filter，
+        #       未设置 RUST_LOG 时只输出 ERROR，因此默认设为 info，保证 wait_for_log 等待的 info 日志行一定会输出
+        # English: Pass only the required vars instead of copying os.environ; forward RUST_LOG/RUST_BACKTRACE when set.
+        # tracing uses env-filter, which only prints ERROR without RUST_LOG, so default it to info so the info lines
+        # wait_for_log waits for are always emitted
+        env = {
+            "PATH": os.environ.get("PATH", ""),
+            "SMCP_SERVER_URL": self.server_url,
+            "SMCP_AGENT_ID": self.agent_id,
+            "SMCP_OFFICE_ID": self.office_id,
+        }
+        env.update({k: os.environ[k] for k in ("RUST_LOG", "RUST_BACKTRACE") if k in os.environ})
+        env.setdefault("RUST_LOG", "info")
         if self.api_key:
             env["SMCP_API_KEY"] = self.api_key
         if test_mode:
@@ -72,82 +81,171 @@ class RustAgentFixture:
             
         # 启动进程
         self.process = subprocess.Popen(
-            [str(agent_binary)],
+            [str(self.agent_binary)],
             env=env,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True
         )
+        # 后台线程持续读取 stdout，使 wait_for_log 能按日志行判断进程状态，而不是固定等待
+        self._stdout_lines = []
+        self._stdout_closed = False
+        self._stdout_reader = threading.Thread(target=self._read_stdout, daemon=True)
+        self._stdout_reader.start()
+
+    def _read_stdout(self) -> None:
+        """中文: 逐行读取进程 stdout 并唤醒等待者 / English: Read process stdout line by line and wake waiters"""
+        assert self.process is not None and self.process.stdout is not None
+        for line in self.process.stdout:
+            with self._stdout_cond:
+                self._stdout_lines.append(line)
+                self._stdout_cond.notify_all()
+        with self._stdout_cond:
+            self._stdout_closed = True
+            self._stdout_cond.notify_all()
+
+    def wait_for_log(self, marker: str, timeout: float = 10) -> bool:
+        """
+        中文: 等待 stdout 中出现包含 marker 的日志行；进程退出或超时则返回 False
+        English: Wait for a stdout line containing marker; return False if the process exits or the timeout expires
+        """
+        def found() -> bool:
+            return any(marker in line for line in self._stdout_lines)
+
+        with self._stdout_cond:
+            self._stdout_cond.wait_for(lambda: found() or self._stdout_closed, timeout)
+            return found()
         
     def stop(self) -> None:
         """中文: 停止 Rust Agent 进程 / English: Stop Rust Agent process"""
         if self.process:
             self.process.terminate()
+            # 中文: 测试进程无需优雅退出，SIGTERM 1 秒内未退出即直接 SIGKILL
+            # English: The test process needs no graceful exit; escalate to SIGKILL if SIGTERM is not honoured within 1s
             try:
-                self.process.wait(timeout=5)
+                self.process.wait(timeout=1.0)
             except subprocess.TimeoutExpired:
                 self.process.kill()
-                self.process.wait()
+                self.process.wait(timeout=2.0)
+            if self._stdout_reader:
+                self._stdout_reader.join(timeout=1)
+                self._stdout_reader = None
+            # 中文: 显式关闭管道，避免长时间运行时泄漏文件描述符 / English: Close the pipes explicitly to avoid leaking FDs in long runs
+            for pipe in (self.process.stdout, self.process.stderr):
+                if pipe:
+                    pipe.close()
             self.process = None
             
     def get_logs(self) -> tuple[str, str]:
         """中文: 获取进程日志 / English: Get process logs"""
         if not self.process:
             return "", ""
-        stdout, stderr = self.process.communicate()
+        # stdout 由后台线程读取，这里只读 stderr / stdout is consumed by the reader thread; only read stderr here
+        stderr = self.process.stderr.read() if self.process.stderr else ""
+        if self._stdout_reader:
+            self._stdout_reader.join()
+        with self._stdout_cond:
+            stdout = "".join(self._stdout_lines)
         return stdout, stderr
 
 
-@pytest.fixture
-def rust_agent(integration_server_endpoint: str):
-    """中文: 提供 Rust Agent fixture / English: Provide Rust Agent fixture"""
-    agent = RustAgentFixture(integration_server_endpoint)
-    try:
-        agent.start()
-        # 等待 Agent 启动和连接
-        time.sleep(2)
-        yield agent
-    finally:
-        agent.stop()
+@pytest.fixture(scope="session")
+def rust_agent_binary() -> Path:
+    """
+    中文: 整个会话只检查/构建一次 Rust Agent 示例二进制，各测试只负责启动进程
+    English: Check/build the Rust Agent example binary once per session; tests only spawn the process
+    """
+    agent_binary = _RUST_SDK_ROOT / "target" / "debug" / "examples" / "e2e_test_agent"
+    if not agent_binary.exists():
+        # 尝试构建二进制
+        print("Building Rust Agent binary...")
+        result = subprocess.run(
+            ["cargo", "build", "-p", "smcp-agent", "--example", "e2e_test_agent"],
+            cwd=_RUST_SDK_ROOT,
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Failed to build Rust Agent: {result.stderr}")
+    return agent_binary
 
 
-def test_rust_agent_connection_and_events(rust_agent: RustAgentFixture):
+@pytest.fixture
+def office_listener(integration_server_endpoint: str) -> Iterator[tuple[list[tuple[str, Any]], threading.Event]]:
     """
-    中文: 测试 Rust Agent 连接和事件处理
-    English: Test Rust Agent connection and event handling
+    中文: 以 Computer 身份先加入 Rust Agent 将要加入的办公室，在 SMCP 命名空间上监听进出通知；
+          通知只广播给房间内的成员，因此必须在 Agent 启动前就位。返回 (收到的事件列表, Agent 进入办公室时置位的 Event)。
+    English: Join the office the Rust Agent will join, as a Computer, and listen for enter/leave notifications on the
+        SMCP namespace; notifications only reach room members, so it must be in place before the Agent starts.
+        Yields (received events, Event set when the Agent enters the office).
     """
-    # 创建一个客户端来监听事件
     client = socketio.Client()
-    events_received = []
-    
-    @client.on(ENTER_OFFICE_NOTIFICATION)
+    events_received: list[tuple[str, Any]] = []
+    enter_evt = threading.Event()
+
+    @client.on(ENTER_OFFICE_NOTIFICATION, namespace=SMCP_NAMESPACE)
     def on_enter_office(data):
         events_received.append(('enter', data))
-        
-    @client.on(LEAVE_OFFICE_NOTIFICATION)
+        if data.get("agent"):
+            enter_evt.set()
+
+    @client.on(LEAVE_OFFICE_NOTIFICATION, namespace=SMCP_NAMESPACE)
     def on_leave_office(data):
         events_received.append(('leave', data))
-    
-    # 连接到服务器
+
     client.connect(integration_server_endpoint, namespaces=[SMCP_NAMESPACE])
-    
     try:
-        # 等待一段时间让 Rust Agent 完成连接和加入办公室
-        time.sleep(3)
-        
-        # 验证收到了进入办公室事件
-        enter_events = [e for e, _ in events_received if e == 'enter']
-        assert len(enter_events) > 0, "Should receive enter office notification"
-        
-        # 验证事件数据
-        _, enter_data = enter_events[0]
-        assert enter_data['role'] == 'agent'
-        assert enter_data['name'] == rust_agent.agent_id
-        
+        ok, err = client.call(
+            JOIN_OFFICE_EVENT,
+            {"role": "computer", "office_id": _OFFICE_ID, "name": "rust-e2e-listener"},
+            namespace=SMCP_NAMESPACE,
+            timeout=5,
+        )
+        assert ok, f"Listener failed to join office: {err}"
+        yield events_received, enter_evt
     finally:
         client.disconnect()
 
 
+@pytest.fixture
+def rust_agent(integration_server_endpoint: str, rust_agent_binary: Path, office_listener):
+    """
+    中文: 提供 Rust Agent fixture；依赖 office_listener，保证监听客户端先进入办公室再启动 Agent
+    English: Provide Rust Agent fixture; depends on office_listener so the listener is in the office before the Agent
+        starts
+    """
+    agent = RustAgentFixture(integration_server_endpoint, rust_agent_binary, office_id=_OFFICE_ID)
+    try:
+        agent.start()
+        # 等待 Agent 输出连接成功的日志行，而不是固定等待
+        # Wait for the Agent's connected log line instead of a fixed delay
+        assert agent.wait_for_log("Connected successfully", timeout=10), "Rust Agent did not connect to server"
+        yield agent
+    finally:
+        agent.stop()
+
+
+def test_rust_agent_connection_and_events(office_listener, rust_agent: RustAgentFixture):
+    """
+    中文: 测试 Rust Agent 连接和事件处理
+    English: Test Rust Agent connection and event handling
+    """
+    events_received, enter_evt = office_listener
+
+    # 等待 Rust Agent 加入办公室的通知到达
+    # Wait for the Rust Agent's enter office notification to arrive
+    assert enter_evt.wait(timeout=5), "Should receive enter office notification"
+
+    # 验证收到了 Agent 进入办公室事件
+    enter_events = [data for kind, data in events_received if kind == 'enter' and data.get("agent")]
+    assert len(enter_events) > 0, "Should receive enter office notification"
+
+    # 验证事件数据
+    enter_data = enter_events[0]
+    assert enter_data['office_id'] == rust_agent.office_id
+    assert enter_data['agent'] == rust_agent.agent_id
+
+
 def test_rust_agent_with_authentication():
     """
     中文: 测试 Rust Agent 认证功能
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+# filename: utils.py
+# @Time    : 2026/10/16 11:30
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+中文: e2e 测试共享的同步服务器启动工具；异步（ASGI）服务器见 mock_uv_server.bind_listening_socket / serve_asgi。
+English: Sync server bootstrap shared by the e2e tests; for the async (ASGI) server see
+    mock_uv_server.bind_listening_socket / serve_asgi.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import threading
+from collections.abc import Iterator
+
+from socketio import WSGIApp
+from werkzeug.serving import make_server
+
+
+@contextlib.contextmanager
+def run_http_server(wsgi_app: WSGIApp) -> Iterator[tuple[str, int]]:
+    """
+    中文: 在后台线程中以给定的 WSGIApp 启动同步 Socket.IO Server（真实 HTTP 服务），返回 (host, port)。
+          服务器仅用于测试握手、CPU 开销很小，无需为其单独拉起解释器进程。
+    English: Serve the given WSGIApp as a sync Socket.IO server over real HTTP in a background thread and return
+          (host, port). The server only serves test handshakes and is CPU-light, so it does not need its own
+          interpreter process.
+    """
+    # make_server 直接绑定端口 0 并在返回前开始监听，与 bind_listening_socket 同理不存在端口竞态，线程启动后即可连接
+    # make_server binds port 0 and listens before returning, so, as with bind_listening_socket, there is no port race
+    # and clients can connect as soon as the thread starts
+    server = make_server("127.0.0.1", 0, wsgi_app, threaded=True)
+    host, port = server.server_address[:2]
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+
+    try:
+        yield host, port
+    finally:
+        # 停止 serve_forever 循环并释放端口 / Stop the serve_forever loop and release the port
+        server.shutdown()
+        server.server_close()
+        server_thread.join(timeout=3)
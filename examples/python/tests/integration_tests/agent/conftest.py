@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# filename: conftest.py
+# @Time    : 2026/10/16 10:20
+# @Author  : JQQ
+# @Email   : jqq1716@gmail.com
+# @Software: PyCharm
+"""
+中文：Agent 集成测试 fixtures。覆盖上级的 socketio_server / basic_server_port 为会话级，整个会话只启动一次服务器，
+      并提供跨测试复用的 Computer 客户端池；各测试通过互不相同的 office_id 隔离。
+English: Fixtures for Agent integration tests. Override the parent socketio_server / basic_server_port at session
+         scope so the server starts once per session, and provide a pool of Computer clients reused across tests;
+         tests are isolated by distinct office_ids.
+"""
+
+import asyncio
+import socket
+from collections.abc import AsyncGenerator, Iterator
+
+import pytest
+import pytest_asyncio
+from socketio import ASGIApp, AsyncClient
+
+from a2c_smcp.smcp import LEAVE_OFFICE_EVENT, SMCP_NAMESPACE
+from tests.integration_tests.computer.socketio.mock_uv_server import bind_listening_socket, serve_asgi
+from tests.integration_tests.mock_socketio_server import MockComputerServerNamespace, create_computer_test_socketio
+
+# 中文：单个测试同时使用的 Computer 客户端上限 / English: Max Computer clients a single test uses at once
+_COMPUTER_POOL_SIZE = 2
+
+
+@pytest.fixture(scope="session")
+def server_socket() -> Iterator[socket.socket]:
+    """
+    中文：会话级的预绑定监听套接字，见 bind_listening_socket。
+    English: Session-scoped pre-bound listening socket; see bind_listening_socket.
+    """
+    sock = bind_listening_socket()
+    try:
+        yield sock
+    finally:
+        sock.close()
+
+
+@pytest.fixture(scope="session")
+def basic_server_port(server_socket: socket.socket) -> int:
+    """
+    中文：测试服务器监听的端口（会话级）。
+    English: Port the test server listens on (session scope).
+    """
+    return server_socket.getsockname()[1]
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def socketio_server(server_socket: socket.socket) -> AsyncGenerator[MockComputerServerNamespace, None]:
+    """
+    中文：会话级测试服务器，所有 Agent 集成测试共享；使用它的测试须使用 loop_scope="session"。
+    English: Session-scoped test server shared by all Agent integration tests; tests using it must use
+        loop_scope="session".
+    """
+    sio = create_computer_test_socketio()
+    # 避免关闭时后台任务异常 / avoid background task issues on shutdown
+    sio.eio.start_service_task = False
+    asgi_app = ASGIApp(sio, socketio_path="/socket.io")
+
+    async with serve_asgi(asgi_app, server_socket):
+        yield sio.namespace_handlers[SMCP_NAMESPACE]  # type: ignore[index]
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def computer_pool(socketio_server, basic_server_port: int) -> AsyncGenerator[list[AsyncClient], None]:
+    """
+    中文：会话级、已连接的 Computer 客户端池，握手只做一次；会话结束时统一断开。
+    English: Session-scoped pool of connected Computer clients, so the handshake happens once; all are disconnected
+        together at session end.
+    """
+    pool = [AsyncClient() for _ in range(_COMPUTER_POOL_SIZE)]
+    await asyncio.gather(
+        *(
+            c.connect(f"http://localhost:{basic_server_port}", namespaces=[SMCP_NAMESPACE], socketio_path="/socket.io")
+            for c in pool
+        ),
+    )
+    try:
+        yield pool
+    finally:
+        await asyncio.gather(*(c.disconnect() for c in pool), return_exceptions=True)
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def pooled_computers(
+    socketio_server: MockComputerServerNamespace,
+    computer_pool: list[AsyncClient],
+) -> AsyncGenerator[list[AsyncClient], None]:
+    """
+    中文：向测试提供池中的 Computer 客户端；测试结束后让仍在办公室内的客户端 leave_office（而非断开连接），
+          并清除测试经 `.on(...)` 注册的 SMCP 命名空间处理器，避免泄漏到后续测试。
+    English: Hand the pooled Computer clients to a test; afterwards, clients still in an office leave it via
+        leave_office instead of disconnecting, and the SMCP namespace handlers the test registered via `.on(...)`
+        are dropped so they do not leak into later tests.
+    """
+
+    async def _leave(client: AsyncClient) -> None:
+        session = await socketio_server.get_session(client.get_sid(SMCP_NAMESPACE))
+        if office_id := session.get("office_id"):
+            await client.call(LEAVE_OFFICE_EVENT, {"office_id": office_id}, namespace=SMCP_NAMESPACE)
+
+    try:
+        yield computer_pool
+    finally:
+        try:
+            await asyncio.gather(*(_leave(c) for c in computer_pool))
+        finally:
+            for client in computer_pool:
+                client.handlers.pop(SMCP_NAMESPACE, None)
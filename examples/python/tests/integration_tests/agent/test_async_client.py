@@ -10,9 +10,11 @@ English: Integration tests for AsyncSMCPAgentClient.
 """
 
 import asyncio
+from collections.abc import AsyncGenerator, Awaitable, Callable
 from typing import Literal
 
 import pytest
+import pytest_asyncio
 from mcp.types import CallToolResult, TextContent
 from socketio import AsyncClient
 
@@ -36,18 +38,25 @@ from a2c_smcp.smcp import (
 
 class _EH(AsyncAgentEventHandler):
     """
-    中文：异步事件处理器，记录回调到事件数据。
-    English: Async event handler recording callbacks.
+    中文：异步事件处理器，记录回调到事件数据；进入办公室与工具回调达到预期次数时置位对应 asyncio.Event，测试据此等待而非固定 sleep。
+    English: Async event handler recording callbacks; once the enter-office / tools callbacks reach the expected count
+        the matching asyncio.Event is set, so tests wait on it instead of a fixed sleep.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, expected_enters: int = 1, expected_tools: int = 1) -> None:
         self.enter_events: list[EnterOfficeNotification] = []
         self.leave_events: list[LeaveOfficeNotification] = []
         self.update_events: list[UpdateMCPConfigNotification] = []
         self.tools_received: list[tuple[str, list[SMCPTool]]] = []
+        self.expected_enters = expected_enters
+        self.expected_tools = expected_tools
+        self.enters_done = asyncio.Event()
+        self.tools_registered = asyncio.Event()
 
     async def on_computer_enter_office(self, data: EnterOfficeNotification, sio: AsyncSMCPAgentClient) -> None:
         self.enter_events.append(data)
+        if len(self.enter_events) >= self.expected_enters:
+            self.enters_done.set()
 
     async def on_computer_leave_office(self, data: LeaveOfficeNotification, sio: AsyncSMCPAgentClient) -> None:
         self.leave_events.append(data)
@@ -57,6 +66,8 @@ class _EH(AsyncAgentEventHandler):
 
     async def on_tools_received(self, computer: str, tools: list[SMCPTool], sio: AsyncSMCPAgentClient) -> None:
         self.tools_received.append((computer, tools))
+        if len(self.tools_received) >= self.expected_tools:
+            self.tools_registered.set()
 
 
 async def _join_office(client: AsyncClient, role: Literal["computer", "agent"], office_id: str, name: str) -> None:
@@ -69,14 +80,50 @@ async def _join_office(client: AsyncClient, role: Literal["computer", "agent"],
     assert ok and err is None
 
 
-@pytest.mark.asyncio
-async def test_agent_receives_enter_and_tools(socketio_server, basic_server_port: int):
+# 中文：各测试所用的 Agent 认证提供者，模块加载时按 office_id 预先构造一次
+# English: Agent auth providers used by the tests, built once per office_id at module load
+_AUTH_PROVIDERS: dict[str, DefaultAgentAuthProvider] = {
+    f"office-{n}": DefaultAgentAuthProvider(agent_id=f"robot-{n}", office_id=f"office-{n}") for n in range(1, 6)
+}
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def connect_agent(
+    socketio_server,
+    basic_server_port: int,
+) -> AsyncGenerator[Callable[..., Awaitable[tuple[AsyncSMCPAgentClient, _EH]]], None]:
+    """
+    中文：返回一个工厂：按 office_id 取预建的认证提供者，构造 Agent 与 _EH（关键字参数透传给 _EH）并连接服务器；
+          测试结束时统一断开，测试体内不再重复构造与清理。
+    English: Return a factory that looks up the pre-built auth provider by office_id, builds the Agent and its _EH
+        (keyword arguments go to _EH) and connects it; all agents are disconnected together after the test, so
+        test bodies no longer build or clean them up.
+    """
+    agents: list[AsyncSMCPAgentClient] = []
+
+    async def _connect(office_id: str, **handler_kwargs: int) -> tuple[AsyncSMCPAgentClient, _EH]:
+        handler = _EH(**handler_kwargs)
+        agent = AsyncSMCPAgentClient(auth_provider=_AUTH_PROVIDERS[office_id], event_handler=handler)
+        agents.append(agent)
+        await agent.connect_to_server(
+            f"http://localhost:{basic_server_port}",
+            namespace=SMCP_NAMESPACE,
+            socketio_path="/socket.io",
+        )
+        return agent, handler
+
+    yield _connect
+    await asyncio.gather(*(agent.disconnect() for agent in agents), return_exceptions=True)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_agent_receives_enter_and_tools(pooled_computers: list[AsyncClient], connect_agent):
     """
     中文：验证Agent收到Computer进入办公室事件，并自动拉取工具列表。
     English: Verify Agent receives enter event and auto fetches tools.
     """
-    # 启动一个模拟的Computer（纯 AsyncClient）/ Start a fake Computer
-    computer = AsyncClient()
+    # 使用池中已连接的模拟Computer（纯 AsyncClient）/ Use a pooled, already connected fake Computer
+    computer = pooled_computers[0]
 
     tools_resp_event = asyncio.Event()
 
@@ -95,51 +142,32 @@ async def test_agent_receives_enter_and_tools(socketio_server, basic_server_port
         return {"tools": tools, "req_id": data["req_id"]}
 
     # 启动Agent客户端 / Start Agent client
-    handler = _EH()
     office_id = "office-1"
-    auth = DefaultAgentAuthProvider(agent_id="robot-1", office_id=office_id)
-    agent = AsyncSMCPAgentClient(auth_provider=auth, event_handler=handler)
-
-    await agent.connect_to_server(
-        f"http://localhost:{basic_server_port}",
-        namespace=SMCP_NAMESPACE,
-        socketio_path="/socket.io",
-    )
+    agent, handler = await connect_agent(office_id)
 
-    # Agent 加入办公室 / Agent join office
-    await agent.emit(
-        JOIN_OFFICE_EVENT,
-        {"role": "agent", "office_id": office_id, "name": "robot-1"},
-        namespace=SMCP_NAMESPACE,
-    )
+    # Agent 加入办公室并等待确认，确保其先于Computer进入房间 / Agent joins and awaits the ack so it is in the room first
+    await _join_office(agent, role="agent", office_id=office_id, name="robot-1")
 
-    # 再启动计算机并加入，确保Agent能收到enter广播 / start computer afterwards so agent receives enter
-    await computer.connect(
-        f"http://localhost:{basic_server_port}",
-        namespaces=[SMCP_NAMESPACE],
-        socketio_path="/socket.io",
-    )
+    # 计算机随后加入，确保Agent能收到enter广播 / computer joins afterwards so agent receives enter
     await _join_office(computer, role="computer", office_id=office_id, name="comp-01")
 
     # 计算机加入后服务器广播，Agent应自动拉取工具 / after computer joins, agent auto fetches tools
     await asyncio.wait_for(tools_resp_event.wait(), timeout=3)
-    await asyncio.sleep(0.3)  # 等待工具注册完成
+    # 等待工具注册完成 / Wait until the tools callback has run
+    await asyncio.wait_for(handler.tools_registered.wait(), timeout=2)
 
     # 校验事件与工具列表回调 / Validate callbacks
     assert handler.enter_events, "应收到进入办公室事件 / Enter event expected"
     assert handler.tools_received and handler.tools_received[0][1][0]["name"] == "echo"
 
-    await agent.disconnect()
-    await computer.disconnect()
 
-
-@pytest.mark.asyncio
-async def test_agent_tool_call_roundtrip(socketio_server, basic_server_port: int):
+@pytest.mark.asyncio(loop_scope="session")
+async def test_agent_tool_call_roundtrip(pooled_computers: list[AsyncClient], connect_agent):
     """
     中文：验证Agent发起工具调用，Computer返回CallToolResult。
     English: Verify Agent tool-call roundtrip.
     """
-    computer = AsyncClient()
+    computer = pooled_computers[0]
 
     @computer.on(TOOL_CALL_EVENT, namespace=SMCP_NAMESPACE)
     async def _on_tool_call(data: dict):
@@ -149,25 +177,12 @@ async def test_agent_tool_call_roundtrip(socketio_server, basic_server_port: int
             content=[TextContent(type="text", text="ok")],
         ).model_dump(mode="json")
 
-    handler = _EH()
     office_id = "office-2"
-    auth = DefaultAgentAuthProvider(agent_id="robot-2", office_id=office_id)
-    agent = AsyncSMCPAgentClient(auth_provider=auth, event_handler=handler)
-
-    await agent.connect_to_server(
-        f"http://localhost:{basic_server_port}",
-        namespace=SMCP_NAMESPACE,
-        socketio_path="/socket.io",
-    )
+    agent, handler = await connect_agent(office_id)
 
-    await agent.join_office(office_id=office_id, agent_name="robot-2", namespace=SMCP_NAMESPACE)
+    await _join_office(agent, role="agent", office_id=office_id, name="robot-2")
 
     # 让Computer随后加入，确保Agent在场并能接收到enter通知
-    await computer.connect(
-        f"http://localhost:{basic_server_port}",
-        namespaces=[SMCP_NAMESPACE],
-        socketio_path="/socket.io",
-    )
     await _join_office(computer, role="computer", office_id=office_id, name="comp-02")
 
     # 发起工具调用 / Emit tool call
@@ -182,17 +197,14 @@ async def test_agent_tool_call_roundtrip(socketio_server, basic_server_port: int
     assert not res.isError
     assert any(isinstance(c, TextContent) and c.text == "ok" for c in res.content)
 
-    await agent.disconnect()
-    await computer.disconnect()
-
 
-@pytest.mark.asyncio
-async def test_agent_receives_update_config(socketio_server, basic_server_port: int):
+@pytest.mark.asyncio(loop_scope="session")
+async def test_agent_receives_update_config(pooled_computers: list[AsyncClient], connect_agent):
     """
     中文：验证当Computer发出更新配置，Agent收到并再次拉取工具列表。
     English: Verify Agent receives update-config and re-fetches tools.
     """
-    computer = AsyncClient()
+    computer = pooled_computers[0]
 
     tools_req_count = 0
     tools_event = asyncio.Event()
@@ -204,25 +216,12 @@ async def test_agent_receives_update_config(socketio_server, basic_server_port:
         tools_event.set()
         return {"tools": [{"name": f"tool-{tools_req_count}"}], "req_id": data["req_id"]}
 
-    handler = _EH()
     office_id = "office-3"
-    auth = DefaultAgentAuthProvider(agent_id="robot-3", office_id=office_id)
-    agent = AsyncSMCPAgentClient(auth_provider=auth, event_handler=handler)
-
-    await agent.connect_to_server(
-        f"http://localhost:{basic_server_port}",
-        namespace=SMCP_NAMESPACE,
-        socketio_path="/socket.io",
-    )
+    agent, handler = await connect_agent(office_id)
 
-    await agent.join_office(office_id=office_id, agent_name="robot-3", namespace=SMCP_NAMESPACE)
+    await _join_office(agent, role="agent", office_id=office_id, name="robot-3")
 
     # 让Computer随后加入，触发初次工具拉取 / Computer joins afterwards to trigger initial fetch
-    await computer.connect(
-        f"http://localhost:{basic_server_port}",
-        namespaces=[SMCP_NAMESPACE],
-        socketio_path="/socket.io",
-    )
     await _join_office(computer, role="computer", office_id=office_id, name="comp-03")
 
     # 初次工具拉取 / initial tools fetch
@@ -243,52 +242,30 @@ async def test_agent_receives_update_config(socketio_server, basic_server_port:
     # Handler 应至少记录一次 update 回调 / handler should record update
     assert handler.update_events or handler.tools_received
 
-    await agent.disconnect()
-    await computer.disconnect()
-
 
-@pytest.mark.asyncio
-async def test_get_computers_in_office(socketio_server, basic_server_port: int):
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_computers_in_office(pooled_computers: list[AsyncClient], connect_agent):
     """
     中文：验证Agent可以获取房间内所有Computer的信息。
     English: Verify Agent can get all computers info in the office.
     """
-    # 创建多个Computer客户端 / Create multiple Computer clients
-    computer1 = AsyncClient()
-    computer2 = AsyncClient()
+    # 使用池中的多个Computer客户端 / Use multiple pooled Computer clients
+    computer1, computer2 = pooled_computers
 
     # 创建Agent客户端 / Create Agent client
-    handler = _EH()
     office_id = "office-4"
-    auth = DefaultAgentAuthProvider(agent_id="robot-4", office_id=office_id)
-    agent = AsyncSMCPAgentClient(auth_provider=auth, event_handler=handler)
-
     # Agent连接并加入办公室 / Agent connects and joins office
-    await agent.connect_to_server(
-        f"http://localhost:{basic_server_port}",
-        namespace=SMCP_NAMESPACE,
-        socketio_path="/socket.io",
-    )
-    await agent.join_office(office_id=office_id, agent_name="robot-4", namespace=SMCP_NAMESPACE)
-
-    # Computer1加入办公室 / Computer1 joins office
-    await computer1.connect(
-        f"http://localhost:{basic_server_port}",
-        namespaces=[SMCP_NAMESPACE],
-        socketio_path="/socket.io",
-    )
-    await _join_office(computer1, role="computer", office_id=office_id, name="comp-04-1")
+    agent, handler = await connect_agent(office_id, expected_enters=2)
+    await _join_office(agent, role="agent", office_id=office_id, name="robot-4")
 
-    # Computer2加入办公室 / Computer2 joins office
-    await computer2.connect(
-        f"http://localhost:{basic_server_port}",
-        namespaces=[SMCP_NAMESPACE],
-        socketio_path="/socket.io",
+    # 两个Computer并发加入办公室，重叠两次往返 / Both Computers join the office concurrently, overlapping the round trips
+    await asyncio.gather(
+        _join_office(computer1, role="computer", office_id=office_id, name="comp-04-1"),
+        _join_office(computer2, role="computer", office_id=office_id, name="comp-04-2"),
     )
-    await _join_office(computer2, role="computer", office_id=office_id, name="comp-04-2")
 
-    # 等待所有客户端加入完成 / Wait for all clients to join
-    await asyncio.sleep(0.5)
+    # 等待Agent收到两次进入办公室通知 / Wait until the Agent has seen both enter-office notifications
+    await asyncio.wait_for(handler.enters_done.wait(), timeout=2)
 
     # 调用get_computers_in_office获取Computer列表 / Call get_computers_in_office to get computers list
     computers = await agent.get_computers_in_office(office_id)
@@ -304,40 +281,21 @@ async def test_get_computers_in_office(socketio_server, basic_server_port: int):
     assert "comp-04-1" in computer_names, "comp-04-1 should be in the list"
     assert "comp-04-2" in computer_names, "comp-04-2 should be in the list"
 
-    # 清理连接 / Cleanup connections
-    await agent.disconnect()
-    await computer1.disconnect()
-    await computer2.disconnect()
 
-
-@pytest.mark.asyncio
-async def test_get_computers_in_office_empty(socketio_server, basic_server_port: int):
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_computers_in_office_empty(connect_agent):
     """
     中文：验证当房间内没有Computer时，返回空列表。
     English: Verify empty list is returned when no computers in office.
     """
     # 创建Agent客户端 / Create Agent client
-    handler = _EH()
     office_id = "office-5"
-    auth = DefaultAgentAuthProvider(agent_id="robot-5", office_id=office_id)
-    agent = AsyncSMCPAgentClient(auth_provider=auth, event_handler=handler)
-
     # Agent连接并加入办公室 / Agent connects and joins office
-    await agent.connect_to_server(
-        f"http://localhost:{basic_server_port}",
-        namespace=SMCP_NAMESPACE,
-        socketio_path="/socket.io",
-    )
-    await agent.join_office(office_id=office_id, agent_name="robot-5", namespace=SMCP_NAMESPACE)
-
-    # 等待连接完成 / Wait for connection to complete
-    await asyncio.sleep(0.3)
+    agent, handler = await connect_agent(office_id)
+    await _join_office(agent, role="agent", office_id=office_id, name="robot-5")
 
     # 调用get_computers_in_office，应该返回空列表 / Call get_computers_in_office, should return empty list
     computers = await agent.get_computers_in_office(office_id)
 
     # 验证返回空列表 / Verify empty list is returned
     assert len(computers) == 0, f"Expected 0 computers, got {len(computers)}"
-
-    # 清理连接 / Cleanup connections
-    await agent.disconnect()
@@ -9,94 +9,94 @@
 English: Integration tests for AgentAuthProvider.
 """
 
+import pytest
+
 from a2c_smcp.agent.auth import DefaultAgentAuthProvider
 from a2c_smcp.agent.types import AgentConfig
 
+# 中文：按用例预先构造的认证提供者，模块加载时建好一次，各测试按键复用而不在测试体内重复构造
+# English: Auth providers pre-built per case once at module load; tests look them up by key instead of rebuilding them
+_PROVIDERS: dict[str, DefaultAgentAuthProvider] = {
+    "basic": DefaultAgentAuthProvider(
+        agent_id="test-agent-123",
+        office_id="test-office-456",
+        api_key="test-api-key",
+    ),
+    "custom_headers": DefaultAgentAuthProvider(
+        agent_id="test-agent-custom",
+        office_id="test-office-custom",
+        api_key="custom-api-key",
+        extra_headers={
+            "X-Custom-Header": "custom-value",
+            "Authorization": "Bearer token123",
+        },
+    ),
+    "custom_api_key_header": DefaultAgentAuthProvider(
+        agent_id="test-agent-header",
+        office_id="test-office-header",
+        api_key="header-api-key",
+        api_key_header="X-API-TOKEN",
+    ),
+    "auth_data": DefaultAgentAuthProvider(
+        agent_id="test-agent-auth",
+        office_id="test-office-auth",
+        auth_data={
+            "username": "testuser",
+            "password": "testpass",
+            "token": "auth-token-123",
+        },
+    ),
+    # 不提供 api_key
+    "no_api_key": DefaultAgentAuthProvider(
+        agent_id="test-agent-no-key",
+        office_id="test-office-no-key",
+    ),
+}
+
 
 def test_default_agent_auth_provider_basic():
     """
     中文：验证默认认证提供者的基本功能。
     English: Verify basic functionality of DefaultAgentAuthProvider.
     """
-    agent_id = "test-agent-123"
-    office_id = "test-office-456"
-    api_key = "test-api-key"
-
-    auth = DefaultAgentAuthProvider(
-        agent_id=agent_id,
-        office_id=office_id,
-        api_key=api_key,
-    )
+    auth = _PROVIDERS["basic"]
 
     # 验证 agent_id
-    assert auth.get_agent_id() == agent_id
+    assert auth.get_agent_id() == "test-agent-123"
 
     # 验证连接认证信息
     auth_data = auth.get_connection_auth()
     assert auth_data is None  # 默认无额外认证数据
 
-    # 验证连接请求头
-    headers = auth.get_connection_headers()
-    assert headers["x-api-key"] == api_key
-
     # 验证 Agent 配置
     config = auth.get_agent_config()
-    assert config["agent"] == agent_id
-    assert config["office_id"] == office_id
-
-
-def test_default_agent_auth_provider_with_custom_headers():
+    assert config["agent"] == "test-agent-123"
+    assert config["office_id"] == "test-office-456"
+
+
+@pytest.mark.parametrize(
+    ("case", "expected_headers"),
+    [
+        # 默认 API 密钥头 / default API key header
+        ("basic", {"x-api-key": "test-api-key"}),
+        # API 密钥头与自定义头并存 / API key header alongside custom headers
+        (
+            "custom_headers",
+            {"x-api-key": "custom-api-key", "X-Custom-Header": "custom-value", "Authorization": "Bearer token123"},
+        ),
+        # 自定义 API 密钥头名称，不再出现 x-api-key / custom API key header name, no x-api-key
+        ("custom_api_key_header", {"X-API-TOKEN": "header-api-key"}),
+        # 没有 API 密钥时不带任何请求头 / no headers at all without an API key
+        ("no_api_key", {}),
+    ],
+)
+def test_default_agent_auth_provider_connection_headers(case: str, expected_headers: dict[str, str]):
     """
-    中文：验证默认认证提供者支持自定义请求头。
-    English: Verify DefaultAgentAuthProvider supports custom headers.
+    中文：验证默认认证提供者生成的连接请求头（API 密钥头、自定义头、自定义密钥头名称、无密钥）。
+    English: Verify the connection headers built by DefaultAgentAuthProvider (API key header, custom headers, custom
+        API key header name, no API key).
     """
-    agent_id = "test-agent-custom"
-    office_id = "test-office-custom"
-    api_key = "custom-api-key"
-    extra_headers = {
-        "X-Custom-Header": "custom-value",
-        "Authorization": "Bearer token123",
-    }
-
-    auth = DefaultAgentAuthProvider(
-        agent_id=agent_id,
-        office_id=office_id,
-        api_key=api_key,
-        extra_headers=extra_headers,
-    )
-
-    headers = auth.get_connection_headers()
-
-    # 验证 API 密钥头
-    assert headers["x-api-key"] == api_key
-
-    # 验证自定义头
-    assert headers["X-Custom-Header"] == "custom-value"
-    assert headers["Authorization"] == "Bearer token123"
-
-
-def test_default_agent_auth_provider_with_custom_api_key_header():
-    """
-    中文：验证默认认证提供者支持自定义 API 密钥请求头名称。
-    English: Verify DefaultAgentAuthProvider supports custom API key header name.
-    """
-    agent_id = "test-agent-header"
-    office_id = "test-office-header"
-    api_key = "header-api-key"
-    custom_header_name = "X-API-TOKEN"
-
-    auth = DefaultAgentAuthProvider(
-        agent_id=agent_id,
-        office_id=office_id,
-        api_key=api_key,
-        api_key_header=custom_header_name,
-    )
-
-    headers = auth.get_connection_headers()
-
-    # 验证使用自定义头名称
-    assert headers[custom_header_name] == api_key
-    assert "x-api-key" not in headers
+    assert _PROVIDERS[case].get_connection_headers() == expected_headers
 
 
 def test_default_agent_auth_provider_with_auth_data():
@@ -104,50 +104,15 @@ def test_default_agent_auth_provider_with_auth_data():
     中文：验证默认认证提供者支持额外认证数据。
     English: Verify DefaultAgentAuthProvider supports extra auth data.
     """
-    agent_id = "test-agent-auth"
-    office_id = "test-office-auth"
-    auth_data = {
-        "username": "testuser",
-        "password": "testpass",
-        "token": "auth-token-123",
-    }
-
-    auth = DefaultAgentAuthProvider(
-        agent_id=agent_id,
-        office_id=office_id,
-        auth_data=auth_data,
-    )
-
-    connection_auth = auth.get_connection_auth()
+    connection_auth = _PROVIDERS["auth_data"].get_connection_auth()
 
     # 验证认证数据
-    assert connection_auth == auth_data
+    assert connection_auth == {"username": "testuser", "password": "testpass", "token": "auth-token-123"}
     assert connection_auth["username"] == "testuser"
     assert connection_auth["password"] == "testpass"
     assert connection_auth["token"] == "auth-token-123"
 
 
-def test_default_agent_auth_provider_no_api_key():
-    """
-    中文：验证默认认证提供者在没有 API 密钥时的行为。
-    English: Verify DefaultAgentAuthProvider behavior without API key.
-    """
-    agent_id = "test-agent-no-key"
-    office_id = "test-office-no-key"
-
-    auth = DefaultAgentAuthProvider(
-        agent_id=agent_id,
-        office_id=office_id,
-        # 不提供 api_key
-    )
-
-    headers = auth.get_connection_headers()
-
-    # 验证没有 API 密钥头
-    assert "x-api-key" not in headers
-    assert len(headers) == 0
-
-
 def test_agent_config_type_validation():
     """
     中文：验证 AgentConfig 类型定义的正确性。
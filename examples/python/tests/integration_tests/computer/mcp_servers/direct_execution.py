@@ -13,8 +13,16 @@ cd to the `examples/snippets` directory and run:
 
 注意此进程启动后，如果要关闭，需要使用 Ctrl+D 而不是 Ctrl+C。本质上是通过 Ctrl+D 退出Stdin。从而达到关闭进程的目的
 这个效果是MCP Server封装的默认行为。
+
+传入 `--fd <fd>` 时改为在继承自父进程、已处于监听状态的套接字上以 streamable-http 方式服务（路径 /mcp），便于多个测试共享同一个进程。
+Pass `--fd <fd>` to serve over streamable-http (path /mcp) on an already-listening socket inherited from the parent, so
+tests can share one process.
 """
 
+import argparse
+import socket
+
+import uvicorn
 from mcp.server.fastmcp import FastMCP
 
 mcp = FastMCP("My App")
@@ -28,8 +36,15 @@ def hello(name: str = "World") -> str:
 
 def main():
     """Entry point for the direct execution server."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fd", type=int, default=None, help="serve over streamable-http on this listening socket fd")
+    args = parser.parse_args()
     print("starting...")
-    mcp.run()
+    if args.fd is None:
+        mcp.run()
+        return
+    config = uvicorn.Config(mcp.streamable_http_app(), log_level="warning")
+    uvicorn.Server(config).run(sockets=[socket.socket(fileno=args.fd)])
 
 
 if __name__ == "__main__":
@@ -5,7 +5,12 @@
 # @Email   : jqq1716@gmail.com
 # @Software: PyCharm
 
+from __future__ import annotations
+
 import asyncio
+import contextlib
+import socket
+from collections.abc import AsyncIterator
 
 # 3rd party imports
 import uvicorn
@@ -36,15 +41,24 @@ class UvicornTestServer(uvicorn.Server):
             await server.down()
     """
 
-    def __init__(self, app: ASGIApp = None, host: str = "127.0.0.1", port: int = PORT):
+    def __init__(
+        self,
+        app: ASGIApp = None,
+        host: str = "127.0.0.1",
+        port: int = PORT,
+        sock: socket.socket | None = None,
+    ):
         """Create a Uvicorn test server
 
         Args:
             app (ASGIApp, optional): the ASGIApp app. Defaults to main.asgi_app.
             host (str, optional): the host ip. Defaults to '127.0.0.1'.
             port (int, optional): the port. Defaults to PORT.
+            sock (socket.socket, optional): 中文: 已绑定并监听的套接字，提供时直接在其上服务而不再绑定 host/port
+                / English: an already bound, listening socket; when given, serve on it instead of binding host/port.
         """
         self._startup_done = asyncio.Event()
+        self._sock = sock
         super().__init__(config=uvicorn.Config(app, host=host, port=port))
 
     async def startup(self, sockets: list | None = None) -> None:
@@ -55,7 +69,7 @@ class UvicornTestServer(uvicorn.Server):
 
     async def up(self) -> None:
         """Start up server asynchronously"""
-        self._serve_task = asyncio.create_task(self.serve())
+        self._serve_task = asyncio.create_task(self.serve(sockets=[self._sock] if self._sock is not None else None))
         await self._startup_done.wait()
 
     async def down(self, force: bool = False) -> None:
@@ -78,3 +92,40 @@ class UvicornTestServer(uvicorn.Server):
                     pass
         else:
             await self._serve_task
+
+
+def bind_listening_socket(host: str = "127.0.0.1") -> socket.socket:
+    """
+    中文: 返回绑定到 host 随机端口（端口 0）并已开始监听的套接字，端口通过 getsockname() 回读。
+          测试服务直接在该套接字上服务，而不是“探测空闲端口-关闭-按端口号重新绑定”：后者在关闭与重新绑定之间留有窗口，
+          端口可能被其他进程抢占；且套接字已在监听，服务就绪前到达的连接会在 backlog 中排队而不是被拒绝。
+    English: Return a socket bound to a random port (port 0) on host and already listening; read the port back with
+        getsockname(). Test servers serve on this socket instead of probing a free port, closing it and rebinding by
+        number: that leaves a window between close and rebind in which another process can take the port. Since the
+        socket is already listening, connections arriving before the server is ready queue in the backlog instead of
+        being refused.
+    """
+    sock = socket.socket()
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, 0))
+    sock.listen(128)
+    return sock
+
+
+@contextlib.asynccontextmanager
+async def serve_asgi(app: ASGIApp, sock: socket.socket) -> AsyncIterator[UvicornTestServer]:
+    """
+    中文: 在 bind_listening_socket() 返回的套接字上启动 UvicornTestServer，退出时强制快速关闭、不等待连接清理。
+          Uvicorn 原生支持 WebSocket，连接此服务的客户端应使用 transports=["websocket"] 直连，
+          省去长轮询的逐事件 HTTP 往返与升级过程。
+    English: Start a UvicornTestServer on a socket from bind_listening_socket() and force a fast shutdown on exit,
+        without waiting for connection cleanup. Uvicorn speaks WebSocket natively, so clients of this server should
+        connect with transports=["websocket"], skipping the per-event HTTP round trips of long-polling and the
+        upgrade dance.
+    """
+    server = UvicornTestServer(app, sock=sock)
+    await server.up()
+    try:
+        yield server
+    finally:
+        await server.down(force=True)
@@ -197,3 +197,20 @@ async def test_server_rm_and_start_stop_single_with_errors(monkeypatch: pytest.M
     comp.mcp_manager.__class__ = BadMgr  # type: ignore[attr-defined]
 
     await _interactive_loop(comp)
+
+
+@pytest.mark.asyncio
+async def test_echo_prints_text_verbatim(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+    """
+    - echo <text>: 原样输出文本（不解析 rich markup），供 e2e 同步标记使用
+    - echo 无参数: 输出空行且不报错
+    """
+    commands = ["echo __A2C_MARK_[bold]x[/bold]__", "echo", "exit"]
+    monkeypatch.setattr(cli_main, "PromptSession", lambda: FakePromptSession(commands))
+    monkeypatch.setattr(cli_main, "patch_stdout", lambda raw: no_patch_stdout())
+
+    comp = Computer(name="test_im_echo", inputs=set(), mcp_servers=set(), auto_connect=False, auto_reconnect=False)
+    await _interactive_loop(comp)
+
+    out = capsys.readouterr().out
+    assert "__A2C_MARK_[bold]x[/bold]__" in out
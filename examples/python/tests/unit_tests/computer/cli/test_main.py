@@ -4,6 +4,7 @@
 
 from __future__ import annotations
 
+import io
 import json
 from collections.abc import Callable
 from contextlib import contextmanager
@@ -869,3 +870,50 @@ async def test_socket_and_notify_branches(monkeypatch: pytest.MonkeyPatch) -> No
 
     comp = Computer(name="test_main_c", inputs=set(), mcp_servers=set(), auto_connect=False, auto_reconnect=False)
     await _interactive_loop(comp)
+
+
+@pytest.mark.asyncio
+async def test_batch_session_reads_stdin_and_echoes(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+    """覆盖 --batch 会话：逐行读取 stdin，回写提示符与命令，EOF 时抛出 EOFError。"""
+    monkeypatch.setattr(cli_main.sys, "stdin", io.StringIO("status\r\n"))
+    session = cli_main._BatchSession()
+
+    assert await session.prompt_async("a2c> ") == "status"
+    with pytest.raises(EOFError):
+        await session.prompt_async("a2c> ")
+    assert capsys.readouterr().out == "a2c> status\na2c> "
+
+
+@pytest.mark.asyncio
+async def test_batch_session_does_not_echo_password(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]) -> None:
+    """覆盖 --batch 会话的密码输入：is_password=True 时读入的内容不得回写到 stdout。"""
+    monkeypatch.setattr(cli_main.sys, "stdin", io.StringIO("s3cr3t-key\n"))
+    session = cli_main._BatchSession()
+
+    assert await session.prompt_async("API Key: ", is_password=True) == "s3cr3t-key"
+    out = capsys.readouterr().out
+    assert "s3cr3t-key" not in out
+    assert out == "API Key: \n"
+
+
+def test_run_impl_batch_uses_batch_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    """覆盖 _run_impl 的 batch 分支：应调用 _batch_loop 而非交互循环。"""
+    monkeypatch.setattr(cli_main, "Computer", FakeComputer, raising=True)
+    monkeypatch.setattr(cli_main, "_batch_loop", DummyInteractive.coro, raising=True)
+    DummyInteractive.called = False
+
+    cli_main._run_impl(
+        auto_connect=True,
+        auto_reconnect=True,
+        url=None,
+        namespace=None,
+        auth=None,
+        headers=None,
+        computer_factory=None,
+        config=None,
+        inputs=None,
+        batch=True,
+    )
+
+    assert DummyInteractive.called is True
+    assert isinstance(DummyInteractive.last_comp, FakeComputer)